@@ -2,6 +2,7 @@
 Configuration file for test automation framework
 """
 import os
+import tempfile
 
 # Application URLs
 BASE_URL = os.getenv("BASE_URL", "https://muntasir101.github.io/stylezone")
@@ -13,18 +14,83 @@ CHECKOUT_PAGE_URL = f"{BASE_URL}/checkout.html"
 # Browser Configuration
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
 BROWSER = os.getenv("BROWSER", "chrome")
+# Comma-separated engines to split the suite across, e.g. "chrome,firefox"
+BROWSER_POOL = [b.strip().lower() for b in os.getenv("BROWSER_POOL", "").split(",") if b.strip()]
+# Warm browser pool daemon (python -m utils.browser_pool start); used automatically when running
+WARM_POOL_SOCKET = os.getenv("WARM_POOL_SOCKET", os.path.join(tempfile.gettempdir(), "stylezone_browser_pool.sock"))
+WARM_POOL_SIZE = int(os.getenv("WARM_POOL_SIZE", "2"))
+# Run tests marked read_only in fresh tabs of one reused browser per worker (saves launches only)
+MULTI_TAB = os.getenv("MULTI_TAB", "false").lower() == "true"
 
 # Wait Timeouts
 IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 10
 PAGE_LOAD_TIMEOUT = 30
 
+# Probe BASE_URL before the session and open a circuit breaker after consecutive
+# infrastructure failures (utils/site_health.py); SITE_DOWN_ACTION is "skip" or "abort"
+HEALTH_CHECK = os.getenv("HEALTH_CHECK", "true").lower() == "true"
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "10"))
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "3"))
+SITE_DOWN_ACTION = os.getenv("SITE_DOWN_ACTION", "skip")
+
+# Adaptive wait budgets (utils/wait_budgets.py): per-wait timeouts learned from recorded waits,
+# a percentile of past durations times a margin, capped at EXPLICIT_WAIT
+ADAPTIVE_WAITS = os.getenv("ADAPTIVE_WAITS", "false").lower() == "true"
+WAIT_BUDGETS_FILE = os.getenv("WAIT_BUDGETS_FILE", "wait_budgets.json")
+WAIT_BUDGET_PERCENTILE = float(os.getenv("WAIT_BUDGET_PERCENTILE", "0.95"))
+WAIT_BUDGET_MARGIN = float(os.getenv("WAIT_BUDGET_MARGIN", "1.5"))
+WAIT_BUDGET_MIN_SAMPLES = int(os.getenv("WAIT_BUDGET_MIN_SAMPLES", "5"))
+
+# Event-driven waits (CDP listeners instead of polling; falls back to polling when unavailable)
+EVENT_WAITS = os.getenv("EVENT_WAITS", "false").lower() == "true"
+
 # Test Configuration
 SCREENSHOT_ON_FAILURE = True
 SCREENSHOT_DIR = "screenshots"
+DOM_SNAPSHOT_ON_FAILURE = os.getenv("DOM_SNAPSHOT_ON_FAILURE", "true").lower() == "true"
+DOM_SNAPSHOT_DIR = "dom_snapshots"
+# Record BasePage actions and attach the log to bug reports for replay (opt-in: each
+# state-changing action costs an extra current_url round trip)
+ACTION_LOG = os.getenv("ACTION_LOG", "false").lower() == "true"
+# Visual regression (utils/visual.py)
+VISUAL_BASELINE_DIR = os.getenv("VISUAL_BASELINE_DIR", "visual_baselines")
+VISUAL_DIFF_DIR = "visual_diffs"
+VISUAL_UPDATE_BASELINES = os.getenv("VISUAL_UPDATE_BASELINES", "false").lower() == "true"
+VISUAL_TILE_SIZE = int(os.getenv("VISUAL_TILE_SIZE", "64"))
+# Per-pixel perceptual distance (0..1) and fraction of differing pixels allowed
+VISUAL_THRESHOLD = float(os.getenv("VISUAL_THRESHOLD", "0.1"))
+VISUAL_TOLERANCE = float(os.getenv("VISUAL_TOLERANCE", "0.001"))
 REPORT_DIR = "reports"
+# Failure screenshots in the pytest-html report: "inline" (base64, self-contained) or
+# "linked" (sibling files in reports/assets/ shown as lazy thumbnails)
+REPORT_ASSETS = os.getenv("REPORT_ASSETS", "inline")
+# Pack each run's artifacts into one zip (utils/run_bundle.py); old bundles are pruned
+# by count, age (days) and total size (MB), 0 disabling a limit
+RUN_BUNDLE = os.getenv("RUN_BUNDLE", "false").lower() == "true"
+RUN_BUNDLE_DIR = os.getenv("RUN_BUNDLE_DIR", "bundles")
+RUN_BUNDLE_KEEP = int(os.getenv("RUN_BUNDLE_KEEP", "20"))
+RUN_BUNDLE_MAX_AGE_DAYS = float(os.getenv("RUN_BUNDLE_MAX_AGE_DAYS", "0"))
+RUN_BUNDLE_MAX_SIZE_MB = float(os.getenv("RUN_BUNDLE_MAX_SIZE_MB", "0"))
+# Named storage states (utils/storage_state.py); rebuilt every run unless younger than the max age (seconds)
+STORAGE_STATE_DIR = os.getenv("STORAGE_STATE_DIR", "storage_states")
+STORAGE_STATE_MAX_AGE = int(os.getenv("STORAGE_STATE_MAX_AGE", "0"))
+# Sample CPU/RSS/process count of each test's browser process tree from /proc (Linux)
+RESOURCE_SAMPLING = os.getenv("RESOURCE_SAMPLING", "true").lower() == "true"
+RESOURCE_SAMPLE_INTERVAL = float(os.getenv("RESOURCE_SAMPLE_INTERVAL", "0.5"))
 
 # Application-specific settings
 ITEMS_PER_PAGE = 12
 MAX_SEARCH_QUERY_LENGTH = 100
+# localStorage key of the cart (a JSON list of {id, quantity, ...} entries); carts are only
+# written there on the stand-in shop (utils/cart_seed.py)
+CART_STORAGE_KEY = os.getenv("CART_STORAGE_KEY", "cart")
+
+# Per-worker cache of read-only search result snapshots (ShopPage.search_results)
+RESULT_CACHE = os.getenv("RESULT_CACHE", "false").lower() == "true"
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "64"))
+# Pin the catalog version instead of fingerprinting the site's data files
+CATALOG_VERSION = os.getenv("CATALOG_VERSION")
+# Products in the synthetic catalog served by the local stand-in shop (scale tests)
+STANDIN_CATALOG_SIZE = int(os.getenv("STANDIN_CATALOG_SIZE", "10000"))
 
@@ -2,14 +2,45 @@
 Pytest configuration and fixtures for test automation framework.
 """
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import os
+import shutil
+import time
 from datetime import datetime
 import traceback
-from utils.bug_report import BugReportGenerator
+import uuid
+import config
+from pages.base_page import add_action_listener, remove_action_listener
+from utils.action_log import ActionRecorder
+from utils.action_trie import ActionTrie, get_setup_actions, run_setup_actions, schedule
+from utils.browser_factory import create_driver, select_engine
+from utils.browser_pool import BrowserLease
+from utils.catalog import StandinServer, build_site
+from utils.bug_report import DEDUPE as BUG_REPORT_DEDUPE, BugReportGenerator, find_report
+from utils.dom_snapshot import capture_dom_snapshot
+from utils.engine_timings import EngineTimings, write_summary
+from utils.event_session import attach_event_session, get_event_session
+from utils import resource_usage
+from utils.storage_state import StorageStateStore
+from utils.tab_driver import SharedBrowsers
+from utils.visual import VisualCheck, VisualComparator
+from utils.wait_budgets import wait_budgets
+
+
+pytest_plugins = ["utils.live_results", "utils.sharding", "utils.tracing", "utils.site_health", "utils.run_bundle", "utils.report_assets"]
+
+
+# Per-engine launch, page-load and action timings for this process
+engine_timings = EngineTimings()
+add_action_listener(engine_timings)
+ENGINE_TIMINGS_DIR = os.path.join(config.REPORT_DIR, "engine_timings")
+ENGINE_TIMINGS_REPORT = os.path.join(config.REPORT_DIR, "engine_timings.json")
+
+# Browser resource usage per test (collected on the controller from test reports)
+resource_records = []
+RESOURCE_USAGE_REPORT = os.path.join(config.REPORT_DIR, "resource_usage.json")
+
+# Setup action prefixes shared between tests (see utils/action_trie.py)
+action_trie = ActionTrie()
 
 
 @pytest.fixture(scope="session")
@@ -21,34 +52,92 @@ def base_url():
     return url
 
 
+@pytest.fixture(scope="session")
+def shared_browsers():
+    """Browsers shared by read_only tests in MULTI_TAB mode (one per engine, per worker)"""
+    browsers = SharedBrowsers(lambda engine: create_driver(engine, headless=config.HEADLESS))
+    yield browsers
+    browsers.quit()
+
+
+@pytest.fixture(scope="session")
+def storage_states(request, base_url):
+    """Named storage states, built once per run and shared by xdist workers through STORAGE_STATE_DIR"""
+    workerinput = getattr(request.config, "workerinput", None)
+    run_id = workerinput["testrunuid"] if workerinput else uuid.uuid4().hex
+    return StorageStateStore(config.STORAGE_STATE_DIR, base_url, run_id, config.STORAGE_STATE_MAX_AGE)
+
+
 @pytest.fixture(scope="function")
 def driver(request):
     """Create and configure WebDriver instance"""
-    # Chrome options
-    chrome_options = Options()
+    # Pick the engine for this test (config.BROWSER, or one from BROWSER_POOL)
+    browser = select_engine(request.node.nodeid)
     
-    # Add options based on environment
-    if os.getenv("HEADLESS", "false").lower() == "true":
-        chrome_options.add_argument("--headless")
+    # Initialize driver (attach to a warm browser when the pool daemon is running)
+    launch_start = time.perf_counter()
+    lease = None
+    if config.MULTI_TAB and request.node.get_closest_marker("read_only"):
+        # Read-only tests run in their own tab of a shared per-worker browser
+        driver = request.getfixturevalue("shared_browsers").open_tab(browser)
+        engine_timings.track(driver, browser)
+        engine_timings.record(browser, "tab_open", time.perf_counter() - launch_start)
+    else:
+        lease = BrowserLease.acquire() if browser in ("chrome", "chromium") else None
+        driver = lease.connect() if lease else create_driver(browser, headless=config.HEADLESS)
+        engine_timings.record_launch(driver, browser, time.perf_counter() - launch_start)
     
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--start-maximized")
+    # Set implicit wait (off with adaptive budgets: it would hold every explicit wait's poll for 10s)
+    driver.implicitly_wait(0 if config.ADAPTIVE_WAITS else config.IMPLICIT_WAIT)
     
-    # Initialize driver
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Storage state the test declares (restored on its first navigation, built on first use)
+    state_marker = request.node.get_closest_marker("storage_state")
+    if state_marker:
+        request.getfixturevalue("storage_states").prepare(driver, state_marker.args[0])
     
-    # Set implicit wait
-    driver.implicitly_wait(10)
+    # Sample the browser process tree while the test runs
+    sampler = None
+    if config.RESOURCE_SAMPLING:
+        pid = lease.info.get("pid") if lease else resource_usage.browser_pid(driver)
+        sampler = resource_usage.start_sampling(pid, config.RESOURCE_SAMPLE_INTERVAL)
+    
+    # Attach event-driven waits when enabled
+    if config.EVENT_WAITS:
+        attach_event_session(driver)
+    
+    # Record page object actions for the bug report and replay
+    action_recorder = None
+    if config.ACTION_LOG:
+        action_recorder = ActionRecorder(driver, request.node.name, config.BASE_URL)
+        add_action_listener(action_recorder)
     
     # Yield driver to test
     yield driver
     
-    # Cleanup
-    if request.node.rep_call.failed:
+    if action_recorder:
+        remove_action_listener(action_recorder)
+    
+    if sampler:
+        usage = sampler.stop()
+        if usage:
+            request.node.user_properties.append(("resources", usage))
+    
+    # Cleanup (repeat infrastructure failures are summarized once in reports/site_health.json)
+    rep_call = getattr(request.node, "rep_call", None)
+    site_health = request.config.pluginmanager.get_plugin("site_health")
+    failure_message = str(rep_call.longrepr) if rep_call else "Test failed"
+    if rep_call and rep_call.failed and site_health and site_health.breaker.is_repeat_failure(request.node.nodeid):
+        print("Infrastructure failure; no bug report generated (see reports/site_health.json)")
+    elif rep_call and rep_call.failed and BUG_REPORT_DEDUPE and find_report(failure_message, request.node.name):
+        # Same failure signature as an existing report: add an occurrence, without new artifacts
+        try:
+            report_id, report_data = BugReportGenerator().generate_report(request.node.name, failure_message)
+            request.node.user_properties.append(("artifacts", {"bug_report": f"bug_reports/{report_id}.json"}))
+            print(f"Repeat failure: occurrence {len(report_data['occurrences'])} of {report_id} "
+                  f"(signature {report_data['signature']['id']})")
+        except Exception as e:
+            print(f"Warning: Could not record repeat failure: {e}")
+    elif rep_call and rep_call.failed:
         # Take screenshot on failure
         screenshot_dir = "screenshots"
         os.makedirs(screenshot_dir, exist_ok=True)
@@ -56,6 +145,28 @@ def driver(request):
         screenshot_path = os.path.join(screenshot_dir, f"failure_{timestamp}.png")
         driver.save_screenshot(screenshot_path)
         print(f"Screenshot saved: {screenshot_path}")
+        artifacts = {"screenshot": screenshot_path}
+        request.node.user_properties.append(("artifacts", artifacts))
+        
+        # Capture a compressed, deduplicated DOM snapshot
+        dom_snapshot = None
+        if config.DOM_SNAPSHOT_ON_FAILURE:
+            dom_snapshot = capture_dom_snapshot(driver, config.DOM_SNAPSHOT_DIR)
+            if dom_snapshot:
+                artifacts["dom_snapshot"] = dom_snapshot["path"]
+                print(f"DOM snapshot saved: {dom_snapshot['path']}")
+        
+        # Heatmaps of visual states that differ from their baselines
+        visual_check = getattr(request.node, "visual_check", None)
+        visual_diffs = visual_check.mismatches() if visual_check else []
+        if visual_diffs:
+            artifacts["visual_diffs"] = [d["heatmap"] for d in visual_diffs if d["heatmap"]]
+        
+        # Save the recorded action log
+        action_log = action_recorder.save() if action_recorder else None
+        if action_log:
+            artifacts["action_log"] = action_log
+            print(f"Action log saved: {action_log}")
         
         # Generate bug report
         try:
@@ -63,7 +174,6 @@ def driver(request):
             
             # Extract test information
             test_name = request.node.name
-            failure_message = str(request.node.rep_call.longrepr) if hasattr(request.node, 'rep_call') else "Test failed"
             
             # Extract test steps from docstring or test name
             test_steps = []
@@ -91,6 +201,10 @@ def driver(request):
                 "current_url": driver.current_url
             }
             
+            # Console errors collected by the event session (if attached)
+            events = get_event_session(driver)
+            console_errors = events.get_console_errors() if events else None
+            
             # Generate bug report
             report_id, report_data = bug_reporter.generate_report(
                 test_name=test_name,
@@ -102,24 +216,76 @@ def driver(request):
                 environment_info=environment_info,
                 additional_info={
                     "traceback": traceback.format_exc() if hasattr(request.node, 'rep_call') else None,
-                    "test_file": request.node.fspath if hasattr(request.node, 'fspath') else None
-                }
+                    "test_file": request.node.fspath if hasattr(request.node, 'fspath') else None,
+                    "console_errors": console_errors,
+                    "dom_snapshot": dom_snapshot["path"] if dom_snapshot else None,
+                    "action_log": action_log
+                },
+                markers={marker.name for marker in request.node.iter_markers()},
+                visual_diffs=visual_diffs
             )
             
+            artifacts["bug_report"] = f"bug_reports/{report_id}.json"
+            
             print(f"\n{'='*60}")
             print("BUG REPORT GENERATED")
             print(f"{'='*60}")
             print(f"Report ID: {report_id}")
             print(f"Test: {test_name}")
-            print(f"HTML Report: bug_reports/{report_id}.html")
-            print(f"Markdown Report: bug_reports/{report_id}.md")
+            if "html" in bug_reporter.formats:
+                print(f"HTML Report: bug_reports/{report_id}.html")
+            if "md" in bug_reporter.formats:
+                print(f"Markdown Report: bug_reports/{report_id}.md")
             print(f"JSON Report: bug_reports/{report_id}.json")
+            print("Dashboard: bug_reports/index.html")
             print(f"{'='*60}\n")
             
         except Exception as e:
             print(f"Warning: Could not generate bug report: {e}")
     
     driver.quit()
+    if lease:
+        lease.release()
+
+
+def pytest_sessionstart(session):
+    """Clear stale per-worker timing files (controller/single process only)"""
+    if not hasattr(session.config, "workerinput"):
+        shutil.rmtree(ENGINE_TIMINGS_DIR, ignore_errors=True)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Save this process's engine timings and recorded wait durations"""
+    worker_id = os.getenv("PYTEST_XDIST_WORKER", "main")
+    engine_timings.save(ENGINE_TIMINGS_DIR, worker_id)
+    wait_budgets.save()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report per-engine timings side by side"""
+    if hasattr(config, "workerinput"):
+        return
+    table = write_summary(ENGINE_TIMINGS_DIR, ENGINE_TIMINGS_REPORT)
+    if table:
+        terminalreporter.write_sep("=", "engine timings: mean (p95) x count")
+        terminalreporter.write_line(table)
+    if resource_records:
+        resource_usage.write_summary(resource_records, RESOURCE_USAGE_REPORT)
+        terminalreporter.write_sep("=", "heaviest tests by browser memory")
+        terminalreporter.write_line(resource_usage.format_table(resource_records))
+
+
+def pytest_runtest_logreport(report):
+    """Collect browser resource usage attached by the driver fixture (also from xdist workers)"""
+    if report.when == "teardown":
+        usage = dict(report.user_properties).get("resources")
+        if usage:
+            resource_records.append((report.nodeid, usage))
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """Order tests so those sharing setup_actions prefixes run back to back"""
+    items[:] = schedule(items, action_trie, group_workers=config.pluginmanager.hasplugin("xdist"))
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -149,3 +315,89 @@ def shop_page(driver, base_url):
     page.wait_for_page_load()
     return page
 
+
+@pytest.fixture(scope="function")
+def product_page(driver):
+    """Fixture for the product detail page (open a product with open_product)"""
+    from pages.product_page import ProductPage
+    return ProductPage(driver)
+
+
+@pytest.fixture(scope="function")
+def checkout_page(driver, base_url):
+    """Fixture to navigate to checkout page"""
+    from pages.checkout_page import CheckoutPage
+    page = CheckoutPage(driver)
+    page.open(base_url)
+    return page
+
+
+@pytest.fixture(scope="function")
+def seeded_checkout_page(driver, base_url, request):
+    """
+    Checkout page with products 1..count added through their product pages (@pytest.mark.cart(count))
+    
+    The live app's cart is built through its own UI; writing a cart to localStorage
+    (open_with_cart) is only for the stand-in shop, whose schema it was written against.
+    """
+    from pages.checkout_page import CheckoutPage
+    from pages.product_page import ProductPage
+    marker = request.node.get_closest_marker("cart")
+    count = marker.args[0] if marker and marker.args else 3
+    ProductPage(driver).add_products_to_cart(base_url, range(1, count + 1))
+    page = CheckoutPage(driver)
+    page.open(base_url)
+    page.wait_for_cart_items(count)
+    return page
+
+
+@pytest.fixture(scope="session")
+def standin_base_url():
+    """Local stand-in shop serving a synthetic catalog of STANDIN_CATALOG_SIZE products"""
+    site_dir = build_site(config.STANDIN_CATALOG_SIZE)
+    server = StandinServer(site_dir).start()
+    yield server.base_url
+    server.stop()
+    shutil.rmtree(site_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="function")
+def standin_shop_page(driver, standin_base_url):
+    """Fixture to navigate to the stand-in shop page"""
+    from pages.shop_page import ShopPage
+    page = ShopPage(driver)
+    page.navigate_to(f"{standin_base_url}/shop.html")
+    page.wait_for_page_load()
+    page.find_element(page.locators.PRODUCT_CARD, timeout=30)
+    return page
+
+
+@pytest.fixture(scope="function")
+def standin_checkout_page(driver, standin_base_url):
+    """Fixture for the stand-in checkout page (seed it with open_with_cart)"""
+    from pages.checkout_page import CheckoutPage
+    return CheckoutPage(driver)
+
+
+@pytest.fixture(scope="function")
+def visual(driver, request):
+    """Visual regression checks against baselines (per browser engine)"""
+    comparator = VisualComparator(
+        baseline_dir=config.VISUAL_BASELINE_DIR,
+        diff_dir=config.VISUAL_DIFF_DIR,
+        tile=config.VISUAL_TILE_SIZE,
+        threshold=config.VISUAL_THRESHOLD,
+        tolerance=config.VISUAL_TOLERANCE,
+        update=config.VISUAL_UPDATE_BASELINES
+    )
+    check = VisualCheck(driver, comparator, engine=select_engine(request.node.nodeid))
+    request.node.visual_check = check
+    return check
+
+
+@pytest.fixture(scope="function")
+def prepared_shop_page(shop_page, request):
+    """Shop page with the test's setup_actions applied (shared prefixes are restored, not replayed)"""
+    actions = get_setup_actions(request.node)
+    run_setup_actions(shop_page, actions, action_trie, probe_locator=shop_page.locators.PRODUCT_RESULTS)
+    return shop_page
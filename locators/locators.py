@@ -23,6 +23,10 @@ class HomePageLocators:
     DEALS_GRID = "#dealsGrid"
     BESTSELLERS_GRID = "#bestsellersGrid"
     FAVORITES_GRID = "#favoritesGrid"
+    # Inside a section card (cards are the grid's direct children)
+    SECTION_ITEM_NAME = ".product-name, h3, h4"
+    SECTION_ITEM_PRICE = ".product-price, .deal-price, .price"
+    SECTION_ITEM_IMAGE = "img"
     
     # Newsletter
     NEWSLETTER_FORM = "#newsletterForm"
@@ -92,6 +96,23 @@ class CheckoutPageLocators:
     COUNTRY = "#country"
     PLACE_ORDER_BUTTON = "#placeOrderBtn"
     EMPTY_CART_MESSAGE = "#emptyCartMessage"
+    PAYMENT_METHOD = 'input[name="paymentMethod"]'
+    
+    # Cart and order summary
+    CART_ITEMS = "#cartItems"
+    CART_ITEM = ".cart-item"
+    SUMMARY_ITEMS = "#summaryItems"
+    TOTAL_SUMMARY = "#totalSummary"
+    CART_COUNT = ".cart-count"
+    
+    # Validation messages
+    FULL_NAME_ERROR = "#fullNameError"
+    ADDRESS_ERROR = "#addressError"
+    CITY_ERROR = "#cityError"
+    POSTAL_CODE_ERROR = "#postalCodeError"
+    COUNTRY_ERROR = "#countryError"
+    PAYMENT_ERROR = "#paymentError"
+    TOAST = ".toast"
 
 
 class CommonLocators:
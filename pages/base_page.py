@@ -5,70 +5,234 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.by import By
+from utils.event_session import get_event_session
+from utils.storage_state import navigate_with_pending_state
+from utils.wait_budgets import wait_budgets
+import functools
 import time
 
 
+_action_listeners = []
+_action_depth = [0]
+
+# Serializes URL, web storage and form controls so a page state can be restored
+# without replaying the UI actions that produced it
+_CAPTURE_STATE_SCRIPT = """
+function selectorFor(el) {
+    if (el.id) { return '#' + CSS.escape(el.id); }
+    if (el.name) { return el.tagName.toLowerCase() + '[name="' + el.name + '"]'; }
+    var parts = [];
+    while (el && el.nodeType === 1 && el !== document.documentElement) {
+        var index = 1, sibling = el;
+        while ((sibling = sibling.previousElementSibling)) {
+            if (sibling.tagName === el.tagName) { index++; }
+        }
+        parts.unshift(el.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+        el = el.parentElement;
+    }
+    return parts.join(' > ');
+}
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+var controls = [];
+Array.prototype.forEach.call(document.querySelectorAll('input, select, textarea'), function (el) {
+    var type = (el.type || '').toLowerCase();
+    if (type === 'password' || type === 'file' || type === 'hidden') { return; }
+    controls.push({selector: selectorFor(el), value: el.value, checked: !!el.checked, type: type});
+});
+var probe = arguments[0] ? document.querySelector(arguments[0]) : null;
+return {
+    url: location.href,
+    localStorage: dump(localStorage),
+    sessionStorage: dump(sessionStorage),
+    controls: controls,
+    probe: probe ? probe.innerText : null
+};
+"""
+
+_RESTORE_STORAGE_SCRIPT = """
+var local = arguments[0], session = arguments[1];
+Object.keys(local).forEach(function (key) { localStorage.setItem(key, local[key]); });
+Object.keys(session).forEach(function (key) { sessionStorage.setItem(key, session[key]); });
+"""
+
+_RESTORE_CONTROLS_SCRIPT = """
+arguments[0].forEach(function (control) {
+    var el = document.querySelector(control.selector);
+    if (!el) { return; }
+    if (control.type === 'checkbox' || control.type === 'radio') {
+        if (el.checked === control.checked) { return; }
+        el.checked = control.checked;
+    } else {
+        if (el.value === control.value) { return; }
+        var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+        setter.call(el, control.value);
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+});
+"""
+
+
+class ActionEvent:
+    """A single page object action reported to action listeners"""
+    
+    def __init__(self, page, name, args, kwargs, depth):
+        self.page = page
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.depth = depth
+        self.start_time = time.time()
+        self.duration = None
+        self.error = None
+
+
+class ActionListener:
+    """Base class for objects notified about page object actions"""
+    
+    def on_action_start(self, event):
+        """Called before an action runs"""
+    
+    def on_action_end(self, event):
+        """Called after an action finished (event.error is set on failure)"""
+
+
+def add_action_listener(listener):
+    """Register a listener for page object actions"""
+    if listener not in _action_listeners:
+        _action_listeners.append(listener)
+
+
+def remove_action_listener(listener):
+    """Unregister an action listener"""
+    if listener in _action_listeners:
+        _action_listeners.remove(listener)
+
+
+def page_action(method):
+    """Decorator that reports a page object method to the registered action listeners"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _action_listeners:
+            return method(self, *args, **kwargs)
+        
+        event = ActionEvent(self, method.__name__, args, kwargs, _action_depth[0])
+        for listener in list(_action_listeners):
+            listener.on_action_start(event)
+        start = time.perf_counter()
+        _action_depth[0] += 1
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            _action_depth[0] -= 1
+            event.duration = time.perf_counter() - start
+            for listener in list(_action_listeners):
+                listener.on_action_end(event)
+    return wrapper
+
+
 class BasePage:
     """Base class for all page objects"""
     
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        self.events = get_event_session(driver)
     
-    def find_element(self, locator, timeout=10):
+    def _wait_until(self, operation, locator, condition, timeout=None, absence_ok=False):
+        """
+        Wait for an expected condition on a locator under its wait budget
+
+        Args:
+            timeout: Explicit timeout (default: the learned budget, or EXPLICIT_WAIT)
+            absence_ok: A timeout is an expected answer (find_elements, is_present, is_displayed).
+                These waits keep the default timeout and are not recorded: a budget learned
+                from fast hits could never grow back, and a slow render would then look
+                like an absent element instead of a wait timeout.
+        """
+        key = wait_budgets.key(self, operation, locator)
+        budget = wait_budgets.timeout(key, timeout, learn=not absence_ok)
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, budget).until(condition((By.CSS_SELECTOR, locator)))
+        except TimeoutException:
+            if not absence_ok:
+                wait_budgets.record(key, budget, timed_out=True)
+            raise
+        if not absence_ok:
+            wait_budgets.record(key, time.perf_counter() - start)
+        return result
+    
+    @page_action
+    def find_element(self, locator, timeout=None):
         """Find a single element with explicit wait"""
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            return wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+            return self._wait_until("find_element", locator, EC.presence_of_element_located, timeout)
         except TimeoutException:
             raise NoSuchElementException(f"Element not found: {locator}")
     
-    def find_elements(self, locator, timeout=10):
+    @page_action
+    def find_elements(self, locator, timeout=None):
         """Find multiple elements with explicit wait"""
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+            self._wait_until("find_elements", locator, EC.presence_of_element_located, timeout, absence_ok=True)
             return self.driver.find_elements(By.CSS_SELECTOR, locator)
         except TimeoutException:
             return []
     
-    def click(self, locator, timeout=10):
+    @page_action
+    def click(self, locator, timeout=None):
         """Click an element with explicit wait"""
-        element = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, locator)))
+        element = self._wait_until("click", locator, EC.element_to_be_clickable, timeout)
         element.click()
     
-    def send_keys(self, locator, text, timeout=10):
+    @page_action
+    def send_keys(self, locator, text, timeout=None):
         """Send keys to an element with explicit wait"""
-        element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+        element = self._wait_until("send_keys", locator, EC.presence_of_element_located, timeout)
         element.clear()
         element.send_keys(text)
     
-    def get_text(self, locator, timeout=10):
+    @page_action
+    def get_text(self, locator, timeout=None):
         """Get text from an element"""
-        element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+        element = self._wait_until("get_text", locator, EC.presence_of_element_located, timeout)
         return element.text
     
-    def is_displayed(self, locator, timeout=10):
+    @page_action
+    def is_displayed(self, locator, timeout=None):
         """Check if element is displayed"""
         try:
-            element = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, locator)))
+            element = self._wait_until("is_displayed", locator, EC.visibility_of_element_located, timeout,
+                                       absence_ok=True)
             return element.is_displayed()
         except TimeoutException:
             return False
     
-    def is_present(self, locator, timeout=10):
+    @page_action
+    def is_present(self, locator, timeout=None):
         """Check if element is present in DOM"""
         try:
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+            self._wait_until("is_present", locator, EC.presence_of_element_located, timeout, absence_ok=True)
             return True
         except TimeoutException:
             return False
     
-    def wait_for_element_invisible(self, locator, timeout=10):
+    @page_action
+    def wait_for_element_invisible(self, locator, timeout=None):
         """Wait for element to be invisible"""
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, locator)))
+            self._wait_until("wait_for_element_invisible", locator, EC.invisibility_of_element_located, timeout)
             return True
         except TimeoutException:
             return False
@@ -77,42 +241,126 @@ class BasePage:
         """Get current page URL"""
         return self.driver.current_url
     
+    @page_action
     def navigate_to(self, url):
-        """Navigate to a URL"""
-        self.driver.get(url)
+        """Navigate to a URL (restoring the test's pending storage state on the first visit to its origin)"""
+        if not navigate_with_pending_state(self.driver, url):
+            self.driver.get(url)
     
     def get_page_title(self):
         """Get page title"""
         return self.driver.title
     
+    @page_action
     def scroll_to_element(self, locator):
         """Scroll to an element"""
         element = self.find_element(locator)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
         time.sleep(0.5)  # Small delay for scroll animation
     
-    def wait_for_page_load(self, timeout=10):
+    @page_action
+    def wait_for_page_load(self, timeout=None):
         """Wait for page to load completely"""
-        self.wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+        key = wait_budgets.key(self, "wait_for_page_load")
+        budget = wait_budgets.timeout(key, timeout)
+        if self.events and self.events.wait_for_page_load(budget):
+            return
+        start = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, budget).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete")
+        except TimeoutException:
+            wait_budgets.record(key, budget, timed_out=True)
+            raise
+        wait_budgets.record(key, time.perf_counter() - start)
+    
+    def wait_for_network_idle(self, timeout=10, quiet_ms=500):
+        """Wait until no network requests are in flight"""
+        if self.events and self.events.wait_for_network_idle(timeout, quiet_ms):
+            return
+        self._wait_until_stable("return performance.getEntriesByType('resource').length", timeout, quiet_ms)
+    
+    def wait_for_dom_stable(self, timeout=10, quiet_ms=300):
+        """Wait until the DOM stops changing"""
+        if self.events and self.events.wait_for_dom_stable(timeout, quiet_ms):
+            return
+        self._wait_until_stable("return document.getElementsByTagName('*').length", timeout, quiet_ms)
+    
+    def settle(self, delay):
+        """
+        Wait for the page to react to an action; sleeps for delay when events are
+        unavailable or the page does not settle in time
+        """
+        if self.events:
+            try:
+                if self.events.wait_for_settled(timeout=max(delay * 3, 2)):
+                    return
+            except TimeoutException:
+                pass
+        time.sleep(delay)
     
-    def select_dropdown_option(self, locator, value, timeout=10):
+    def _wait_until_stable(self, script, timeout, quiet_ms):
+        """Poll a script until its value stops changing for quiet_ms"""
+        last = {"value": None, "since": time.monotonic()}
+        
+        def stable(driver):
+            value = driver.execute_script(script)
+            now = time.monotonic()
+            if value != last["value"]:
+                last["value"], last["since"] = value, now
+                return False
+            return now - last["since"] >= quiet_ms / 1000
+        
+        WebDriverWait(self.driver, timeout, poll_frequency=min(0.5, quiet_ms / 1000)).until(stable)
+    
+    @page_action
+    def select_dropdown_option(self, locator, value, timeout=None):
         """Select an option from dropdown by value"""
         from selenium.webdriver.support.ui import Select
-        element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+        element = self._wait_until("select_dropdown_option", locator, EC.presence_of_element_located, timeout)
         select = Select(element)
         select.select_by_value(value)
     
-    def select_dropdown_option_by_text(self, locator, text, timeout=10):
+    @page_action
+    def select_dropdown_option_by_text(self, locator, text, timeout=None):
         """Select an option from dropdown by visible text"""
         from selenium.webdriver.support.ui import Select
-        element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+        element = self._wait_until("select_dropdown_option", locator, EC.presence_of_element_located, timeout)
         select = Select(element)
         select.select_by_visible_text(text)
     
-    def get_dropdown_selected_value(self, locator, timeout=10):
+    @page_action
+    def get_dropdown_selected_value(self, locator, timeout=None):
         """Get selected value from dropdown"""
         from selenium.webdriver.support.ui import Select
-        element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, locator)))
+        element = self._wait_until("get_dropdown_selected_value", locator, EC.presence_of_element_located, timeout)
         select = Select(element)
         return select.first_selected_option.get_attribute("value")
-
+    
+    def capture_state(self, probe_locator=None):
+        """
+        Capture the current page state (URL, localStorage, sessionStorage, form controls)
+        
+        Args:
+            probe_locator: Element whose text is recorded to verify a later restore
+        """
+        return self.driver.execute_script(_CAPTURE_STATE_SCRIPT, probe_locator)
+    
+    def restore_state(self, state, probe_locator=None):
+        """Restore a state from capture_state; returns False if the probe element does not match"""
+        if self.driver.current_url != state["url"]:
+            self.navigate_to(state["url"])
+            self.wait_for_page_load()
+        if state["localStorage"] or state["sessionStorage"]:
+            self.driver.execute_script(_RESTORE_STORAGE_SCRIPT, state["localStorage"], state["sessionStorage"])
+            # The app reads storage on load
+            self.driver.refresh()
+            self.wait_for_page_load()
+        self.driver.execute_script(_RESTORE_CONTROLS_SCRIPT, state["controls"])
+        time.sleep(0.5)  # Wait for debounce
+        self.settle(1)
+        if probe_locator and state.get("probe") is not None:
+            probe = self.driver.execute_script(
+                "var el = document.querySelector(arguments[0]); return el ? el.innerText : null;", probe_locator)
+            return probe == state["probe"]
+        return True
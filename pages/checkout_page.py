@@ -0,0 +1,127 @@
+"""
+Checkout page object for checkout.html
+"""
+from pages.base_page import BasePage
+from locators.locators import CheckoutPageLocators
+from selenium.webdriver.support.ui import WebDriverWait
+from utils.cart_seed import read_cart, seed_cart
+from urllib.parse import urlsplit
+import time
+
+
+# Checkout field -> validation message locator
+FIELD_ERRORS = {
+    "full_name": CheckoutPageLocators.FULL_NAME_ERROR,
+    "address": CheckoutPageLocators.ADDRESS_ERROR,
+    "city": CheckoutPageLocators.CITY_ERROR,
+    "postal_code": CheckoutPageLocators.POSTAL_CODE_ERROR,
+    "country": CheckoutPageLocators.COUNTRY_ERROR,
+    "payment": CheckoutPageLocators.PAYMENT_ERROR
+}
+
+# Reads every visible validation message in one round trip
+_FIELD_ERRORS_SCRIPT = """
+var selectors = arguments[0], errors = {};
+Object.keys(selectors).forEach(function (field) {
+    var el = document.querySelector(selectors[field]);
+    var text = el && el.offsetParent !== null ? el.textContent.trim() : '';
+    if (text) { errors[field] = text; }
+});
+return errors;
+"""
+
+
+class CheckoutPage(BasePage):
+    """Checkout page object"""
+    
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.locators = CheckoutPageLocators
+        self.timings = {}
+    
+    def open(self, base_url):
+        """Open the checkout page"""
+        self.navigate_to(f"{base_url}/checkout.html")
+        self.wait_for_page_load()
+    
+    def open_with_cart(self, base_url, items, timeout=30):
+        """
+        Open the checkout page with items already in the cart (stand-in shop only)
+        
+        The cart is written straight to localStorage, so the only page loads are one
+        to reach the app's origin (skipped when already there) and the checkout itself.
+        Seed and render times are kept in self.timings.
+        """
+        url = f"{base_url}/checkout.html"
+        if self._origin(self.driver.current_url) != self._origin(url):
+            self.navigate_to(url)
+        start = time.perf_counter()
+        seed_cart(self.driver, items)
+        self.timings["seed"] = round(time.perf_counter() - start, 3)
+        
+        start = time.perf_counter()
+        self.navigate_to(url)
+        self.wait_for_page_load()
+        if items:
+            self.wait_for_cart_items(len(items), timeout)
+        self.timings["render"] = round(time.perf_counter() - start, 3)
+    
+    @staticmethod
+    def _origin(url):
+        parts = urlsplit(url)
+        return (parts.scheme, parts.netloc)
+    
+    def wait_for_cart_items(self, count, timeout=30):
+        """Wait until the cart list shows exactly count items"""
+        WebDriverWait(self.driver, timeout).until(lambda driver: self.get_cart_item_count() == count)
+    
+    def get_cart_item_count(self):
+        """Get the number of items listed in the cart"""
+        return self.driver.execute_script(
+            "var el = document.querySelector(arguments[0]); return el ? el.querySelectorAll(arguments[1]).length : 0;",
+            self.locators.CART_ITEMS, self.locators.CART_ITEM)
+    
+    def get_cart_count(self):
+        """Get the number shown on the cart badge"""
+        text = self.get_text(self.locators.CART_COUNT).strip()
+        return int(text) if text.isdigit() else 0
+    
+    def get_total(self):
+        """Get the order total as a float"""
+        text = self.get_text(self.locators.TOTAL_SUMMARY)
+        amounts = [part for part in text.replace(",", "").split("$") if part.strip()]
+        return float(amounts[-1].split()[0]) if amounts else 0.0
+    
+    def get_cart_entries(self):
+        """Get the cart as stored by the app"""
+        return read_cart(self.driver) or []
+    
+    def is_empty_cart_message_displayed(self):
+        """Check if the empty cart message is displayed"""
+        return self.is_displayed(self.locators.EMPTY_CART_MESSAGE, timeout=5)
+    
+    def fill_shipping_details(self, full_name, address, city, postal_code, country=None):
+        """Fill in the shipping form"""
+        self.send_keys(self.locators.FULL_NAME, full_name)
+        self.send_keys(self.locators.ADDRESS, address)
+        self.send_keys(self.locators.CITY, city)
+        self.send_keys(self.locators.POSTAL_CODE, postal_code)
+        if country:
+            self.select_dropdown_option_by_text(self.locators.COUNTRY, country)
+    
+    def select_payment_method(self, value=None):
+        """Select a payment method by value (default: the first one)"""
+        locator = self.locators.PAYMENT_METHOD
+        if value:
+            locator = f'{locator}[value="{value}"]'
+        element = self.find_element(locator)
+        self.driver.execute_script("arguments[0].click();", element)
+    
+    def place_order(self):
+        """Click the place order button"""
+        self.click(self.locators.PLACE_ORDER_BUTTON)
+        self.settle(1)  # Wait for validation or confirmation
+    
+    def get_field_errors(self):
+        """Get the displayed validation messages as {field: message}"""
+        return self.driver.execute_script(_FIELD_ERRORS_SCRIPT, FIELD_ERRORS)
@@ -3,7 +3,91 @@ Home page object for index.html
 """
 from pages.base_page import BasePage
 from locators.locators import HomePageLocators
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from utils.result_cache import ProductSnapshot
+import json
+import re
 import time
+import weakref
+
+
+# Home page product sections: name -> grid locator
+SECTIONS = {
+    "deals": HomePageLocators.DEALS_GRID,
+    "bestsellers": HomePageLocators.BESTSELLERS_GRID,
+    "favorites": HomePageLocators.FAVORITES_GRID
+}
+
+# Extracts the cards of every home section in one round trip
+_EXTRACT_SECTIONS_SCRIPT = """
+var sections = arguments[0], nameSelector = arguments[1], priceSelector = arguments[2], imageSelector = arguments[3];
+var result = {};
+Object.keys(sections).forEach(function (key) {
+    var grid = document.querySelector(sections[key]);
+    result[key] = grid ? Array.prototype.map.call(grid.children, function (card) {
+        var name = card.querySelector(nameSelector);
+        var price = card.querySelector(priceSelector);
+        var image = card.querySelector(imageSelector);
+        return [
+            name ? name.textContent.trim() : null,
+            price ? price.textContent.trim() : null,
+            image ? image.getAttribute('src') : null
+        ];
+    }) : null;
+});
+return result;
+"""
+
+# Records when each section grid first gets items and when it last changed.
+# Injected before navigation (CDP) so times are relative to navigation start.
+_SECTION_OBSERVER_SCRIPT = """
+(function (sections) {
+    if (window.__szSections) return;
+    var state = window.__szSections = {sections: {}, late: document.readyState !== 'loading'};
+    Object.keys(sections).forEach(function (key) {
+        state.sections[key] = {first: null, last: null, items: 0};
+    });
+    function check() {
+        var now = performance.now();
+        Object.keys(sections).forEach(function (key) {
+            var grid = document.querySelector(sections[key]);
+            var items = grid ? grid.children.length : 0;
+            var entry = state.sections[key];
+            if (items && entry.first === null) entry.first = state.late ? null : now;
+            if (items !== entry.items) {
+                entry.items = items;
+                entry.last = state.late ? null : now;
+                entry.changed = now;
+            }
+        });
+    }
+    new MutationObserver(check).observe(document, {childList: true, subtree: true});
+    check();
+})(%s);
+"""
+
+_WAIT_SECTIONS_SCRIPT = """
+var callback = arguments[arguments.length - 1], quiet = arguments[0], timeout = arguments[1];
+var start = performance.now();
+(function poll() {
+    var state = window.__szSections, now = performance.now();
+    var pending = state ? Object.keys(state.sections).filter(function (key) {
+        var entry = state.sections[key];
+        return !(entry.items > 0 && now - (entry.changed || 0) >= quiet);
+    }) : null;
+    var stable = pending !== null && pending.length === 0;
+    if (stable || now - start >= timeout) {
+        callback({sections: state ? state.sections : {}, late: state ? state.late : true,
+                  timed_out: !stable, pending: pending || []});
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+# Drivers that already inject the section observer into new documents
+_observed_drivers = weakref.WeakSet()
 
 
 class HomePage(BasePage):
@@ -13,6 +97,23 @@ class HomePage(BasePage):
         super().__init__(driver)
         self.locators = HomePageLocators
     
+    def navigate_to(self, url):
+        """Navigate to a URL (with section render timing enabled)"""
+        self._observe_sections()
+        super().navigate_to(url)
+    
+    def _observe_sections(self):
+        """Inject the section observer into every new document; returns False without CDP"""
+        if self.driver in _observed_drivers:
+            return True
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                        {"source": _SECTION_OBSERVER_SCRIPT % json.dumps(SECTIONS)})
+        except (AttributeError, WebDriverException):
+            return False
+        _observed_drivers.add(self.driver)
+        return True
+    
     def enter_search_query(self, query):
         """Enter search query in the search input"""
         self.send_keys(self.locators.SEARCH_INPUT, query)
@@ -21,13 +122,13 @@ class HomePage(BasePage):
     def click_search_button(self):
         """Click the search button"""
         self.click(self.locators.SEARCH_BUTTON)
-        time.sleep(1)  # Wait for search results
+        self.settle(1)  # Wait for search results
     
     def perform_search(self, query):
         """Perform a complete search action"""
         self.enter_search_query(query)
         self.click_search_button()
-        time.sleep(2)  # Wait for results to load
+        self.settle(2)  # Wait for results to load
     
     def get_search_results_count(self):
         """Get the search results count text"""
@@ -101,7 +202,55 @@ class HomePage(BasePage):
         """Close the search results section"""
         if self.is_present(self.locators.CLOSE_SEARCH_RESULTS):
             self.click(self.locators.CLOSE_SEARCH_RESULTS)
-            time.sleep(0.5)
+            self.settle(0.5)
+    
+    def get_sections(self):
+        """
+        Extract the products of every home section in a single script call
+        
+        Returns {section: tuple of ProductSnapshot}; a section whose grid is missing maps to None.
+        """
+        data = self.driver.execute_script(
+            _EXTRACT_SECTIONS_SCRIPT, SECTIONS, self.locators.SECTION_ITEM_NAME,
+            self.locators.SECTION_ITEM_PRICE, self.locators.SECTION_ITEM_IMAGE
+        )
+        sections = {}
+        for key, cards in data.items():
+            if cards is None:
+                sections[key] = None
+                continue
+            products = []
+            for name, price_text, image in cards:
+                # Deal cards may show the old and the new price; the first amount is used
+                match = re.search(r"\d+(?:[.,]\d+)?", price_text or "")
+                price = float(match.group().replace(",", ".")) if match else None
+                products.append(ProductSnapshot(name, price, image))
+            sections[key] = tuple(products)
+        return sections
+    
+    def get_section_render_timings(self, timeout=10, quiet_ms=500):
+        """
+        Wait for the home sections to finish rendering and return their render timings
+        
+        Returns {section: {"first_render": s, "complete": s, "items": n}} with times in seconds
+        since navigation start. Times are None when the page was loaded without the
+        observer (no CDP support), in which case only item counts are reported.
+        Raises TimeoutException when a section has not rendered, or is still changing,
+        after timeout seconds.
+        """
+        self.driver.execute_script(_SECTION_OBSERVER_SCRIPT % json.dumps(SECTIONS))
+        data = self.driver.execute_async_script(_WAIT_SECTIONS_SCRIPT, quiet_ms, timeout * 1000)
+        if data["timed_out"]:
+            raise TimeoutException(f"Home sections did not finish rendering within {timeout}s: "
+                                   f"{', '.join(data['pending']) or 'observer missing'}")
+        timings = {}
+        for key, entry in data["sections"].items():
+            timings[key] = {
+                "first_render": round(entry["first"] / 1000, 3) if entry.get("first") is not None else None,
+                "complete": round(entry["last"] / 1000, 3) if entry.get("last") is not None else None,
+                "items": entry["items"]
+            }
+        return timings
     
     def get_cart_count(self):
         """Get the current cart count"""
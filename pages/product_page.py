@@ -0,0 +1,54 @@
+"""
+Product detail page object for product.html
+"""
+from pages.base_page import BasePage
+from locators.locators import ProductDetailPageLocators
+from utils.cart_seed import read_cart
+
+
+class ProductPage(BasePage):
+    """Product detail page object"""
+    
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.locators = ProductDetailPageLocators
+    
+    def open_product(self, base_url, product_id):
+        """Open the detail page of a product"""
+        self.navigate_to(f"{base_url}/product.html?id={product_id}")
+        self.wait_for_page_load()
+        self.find_element(self.locators.PRODUCT_DETAILS)
+    
+    def get_product_name(self):
+        """Get the product name"""
+        return self.get_text(self.locators.PRODUCT_NAME).strip()
+    
+    def get_product_price(self):
+        """Get the product price as a float"""
+        price_text = self.get_text(f"{self.locators.PRODUCT_DETAILS} {self.locators.PRODUCT_PRICE}")
+        return float(price_text.replace("$", "").replace(",", "").strip())
+    
+    def get_product_image(self):
+        """Get the product image source"""
+        image = self.find_element(f"{self.locators.PRODUCT_DETAILS} {self.locators.PRODUCT_IMAGE}")
+        return image.get_attribute("src")
+    
+    def add_to_cart(self):
+        """Click the add to cart button"""
+        self.click(f"{self.locators.PRODUCT_DETAILS} {self.locators.ADD_TO_CART}")
+        self.settle(1)  # Wait for the cart badge to update
+    
+    def add_products_to_cart(self, base_url, product_ids):
+        """Add each product to the cart from its detail page"""
+        for product_id in product_ids:
+            self.open_product(base_url, product_id)
+            self.add_to_cart()
+    
+    def get_cart_count(self):
+        """Get the number shown on the cart badge"""
+        text = self.get_text(self.locators.CART_COUNT).strip()
+        return int(text) if text.isdigit() else 0
+    
+    def get_cart_entries(self):
+        """Get the cart as stored by the app"""
+        return read_cart(self.driver) or []
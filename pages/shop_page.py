@@ -1,34 +1,92 @@
 """
 Shop page object for shop.html
 """
-from pages.base_page import BasePage
+from pages.base_page import BasePage, page_action
 from locators.locators import ShopPageLocators
 from selenium.webdriver.common.by import By
+from utils.result_cache import ProductSnapshot, ResultSnapshot, result_cache
+import config
+import hashlib
 import time
 
 
+# Extracts every product card on the current results page in one round trip
+_EXTRACT_RESULTS_SCRIPT = """
+var root = document.querySelector(arguments[0]);
+var count = document.querySelector(arguments[1]);
+var cards = root ? root.querySelectorAll(arguments[2]) : [];
+var nameSelector = arguments[3], priceSelector = arguments[4], imageSelector = arguments[5];
+function selected(selector) {
+    var control = document.querySelector(selector);
+    return control ? control.value : null;
+}
+return {
+    results_count: count ? count.textContent.trim() : '',
+    selected: {category: selected(arguments[6]), price: selected(arguments[7]), sort: selected(arguments[8])},
+    products: Array.prototype.map.call(cards, function (card) {
+        var name = card.querySelector(nameSelector);
+        var price = card.querySelector(priceSelector);
+        var image = card.querySelector(imageSelector);
+        return [
+            name ? name.textContent.trim() : null,
+            price ? price.textContent.trim() : null,
+            image ? image.getAttribute('src') : null
+        ];
+    })
+};
+"""
+
+# Fingerprints the catalog from the headers of the page and its same-origin data/script
+# files (not document.lastModified: without a Last-Modified header it is "now")
+_CATALOG_VERSION_SCRIPT = """
+var callback = arguments[arguments.length - 1];
+var urls = [location.origin + location.pathname]
+    .concat(Array.prototype.map.call(document.querySelectorAll('script[src]'), function (s) { return s.src; }))
+    .concat(performance.getEntriesByType('resource').map(function (e) { return e.name; })
+        .filter(function (u) { return /\\.json(\\?|$)/.test(u); }))
+    .filter(function (u) { return u.indexOf(location.origin) === 0; });
+Promise.all(urls.map(function (u) {
+    return fetch(u, {method: 'HEAD', cache: 'no-cache'}).then(function (r) {
+        return u + '|' + (r.headers.get('etag') || r.headers.get('last-modified') || r.headers.get('content-length') || '');
+    }).catch(function () { return u; });
+})).then(function (parts) { callback(parts.sort().join('\\n')); });
+"""
+
+
 class ShopPage(BasePage):
     """Shop page object"""
     
     def __init__(self, driver):
         super().__init__(driver)
         self.locators = ShopPageLocators
+        self.use_result_cache = config.RESULT_CACHE
+        self._pristine = False
+    
+    def navigate_to(self, url):
+        """Navigate to a URL"""
+        super().navigate_to(url)
+        self._pristine = url.split("?")[0].endswith("shop.html")
     
+    @page_action
     def enter_search_query(self, query):
         """Enter search query in the search input"""
+        self._pristine = False
         self.send_keys(self.locators.SEARCH_INPUT, query)
         time.sleep(0.5)  # Wait for debounce
     
+    @page_action
     def click_search_button(self):
         """Click the search button"""
+        self._pristine = False
         self.click(self.locators.SEARCH_BUTTON)
-        time.sleep(1)  # Wait for search results
+        self.settle(1)  # Wait for search results
     
+    @page_action
     def perform_search(self, query):
         """Perform a complete search action"""
         self.enter_search_query(query)
         self.click_search_button()
-        time.sleep(2)  # Wait for results to load
+        self.settle(2)  # Wait for results to load
     
     def get_product_cards(self):
         """Get all product cards from results"""
@@ -76,56 +134,70 @@ class ShopPage(BasePage):
             # If results container doesn't exist or is empty, consider it as no results
             return len(self.get_product_cards()) == 0
     
+    @page_action
     def select_category_filter(self, category):
         """Select category filter"""
+        self._pristine = False
         if category:
             self.select_dropdown_option_by_text(self.locators.CATEGORY_FILTER, category)
         else:
             self.select_dropdown_option(self.locators.CATEGORY_FILTER, "")
-        time.sleep(1)  # Wait for filter to apply
+        self.settle(1)  # Wait for filter to apply
     
+    @page_action
     def select_price_filter(self, price_range):
         """Select price filter by visible text"""
+        self._pristine = False
         if price_range:
             self.select_dropdown_option_by_text(self.locators.PRICE_FILTER, price_range)
         else:
             self.select_dropdown_option(self.locators.PRICE_FILTER, "")
-        time.sleep(1)  # Wait for filter to apply
+        self.settle(1)  # Wait for filter to apply
     
+    @page_action
     def select_rating_filter(self, rating):
         """Select rating filter"""
+        self._pristine = False
         if rating:
             self.select_dropdown_option(self.locators.RATING_FILTER, rating)
         else:
             self.select_dropdown_option(self.locators.RATING_FILTER, "")
-        time.sleep(1)  # Wait for filter to apply
+        self.settle(1)  # Wait for filter to apply
     
+    @page_action
     def select_shipping_filter(self, shipping):
         """Select shipping filter"""
+        self._pristine = False
         if shipping:
             self.select_dropdown_option(self.locators.SHIPPING_FILTER, shipping)
         else:
             self.select_dropdown_option(self.locators.SHIPPING_FILTER, "")
-        time.sleep(1)  # Wait for filter to apply
+        self.settle(1)  # Wait for filter to apply
     
+    @page_action
     def reset_filters(self):
         """Click reset filters button"""
+        self._pristine = False
         self.click(self.locators.RESET_FILTERS_BUTTON)
-        time.sleep(1)  # Wait for filters to reset
+        self.settle(1)  # Wait for filters to reset
     
+    @page_action
     def select_sort_option(self, sort_value):
         """Select sort option"""
-        # Map human-readable values to actual option values
+        self._pristine = False
+        value = self._sort_value(sort_value)
+        self.select_dropdown_option(self.locators.SORT_OPTION, value)
+        self.settle(1)  # Wait for sort to apply
+    
+    def _sort_value(self, sort_value):
+        """Map human-readable sort values to actual option values"""
         sort_map = {
             "Price: Low to High": "priceAsc",
             "Price: High to Low": "priceDesc",
             "Name: A-Z": "nameAsc",
             "Featured": "featured"
         }
-        
-        value = sort_map.get(sort_value, sort_value)
-        self.select_dropdown_option(self.locators.SORT_OPTION, value)
-        time.sleep(1)  # Wait for sort to apply
+        return sort_map.get(sort_value, sort_value)
     
     def get_results_count_text(self):
         """Get the results count text"""
@@ -137,17 +209,21 @@ class ShopPage(BasePage):
         """Check if pagination is displayed"""
         return self.is_present(self.locators.PAGINATION)
     
+    @page_action
     def click_next_page(self):
         """Click next page button"""
+        self._pristine = False
         if self.is_present(self.locators.PAGINATION_NEXT):
             self.click(self.locators.PAGINATION_NEXT)
-            time.sleep(2)  # Wait for page to load
+            self.settle(2)  # Wait for page to load
     
+    @page_action
     def click_previous_page(self):
         """Click previous page button"""
+        self._pristine = False
         if self.is_present(self.locators.PAGINATION_PREV):
             self.click(self.locators.PAGINATION_PREV)
-            time.sleep(2)  # Wait for page to load
+            self.settle(2)  # Wait for page to load
     
     def get_current_page_number(self):
         """Get current page number from pagination"""
@@ -236,3 +312,75 @@ class ShopPage(BasePage):
                     return False
         return True
 
+    
+    @page_action
+    def get_results_snapshot(self):
+        """
+        Extract all product cards on the current results page, and the selected
+        category, price and sort values, in a single script call
+        """
+        data = self.driver.execute_script(
+            _EXTRACT_RESULTS_SCRIPT, self.locators.PRODUCT_RESULTS, self.locators.RESULTS_COUNT,
+            self.locators.PRODUCT_CARD, self.locators.PRODUCT_NAME, self.locators.PRODUCT_PRICE,
+            self.locators.PRODUCT_IMAGE, self.locators.CATEGORY_FILTER, self.locators.PRICE_FILTER,
+            self.locators.SORT_OPTION
+        )
+        products = []
+        for name, price_text, image in data["products"]:
+            try:
+                price = float(price_text.replace("$", "").strip())
+            except (AttributeError, ValueError):
+                price = None
+            products.append(ProductSnapshot(name, price, image))
+        return ResultSnapshot(tuple(products), data["results_count"], data["selected"], False)
+    
+    def get_catalog_version(self):
+        """Get a fingerprint of the product catalog served by the site (one HEAD request per file)"""
+        if config.CATALOG_VERSION:
+            return config.CATALOG_VERSION
+        fingerprint = self.driver.execute_async_script(_CATALOG_VERSION_SCRIPT)
+        return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:12]
+    
+    @page_action
+    def search_results(self, query, category=None, price_range=None, rating=None, shipping=None,
+                       sort=None, page=1, use_cache=None):
+        """
+        Get a read-only snapshot of the results for a search
+        
+        Drives the shop page from a fresh load (search, filters, sort, paging) and extracts
+        the results. With the result cache enabled, snapshots are reused within the worker
+        and the UI is only driven on a cache miss; the catalog version is fingerprinted
+        once per worker and site.
+        """
+        use_cache = self.use_result_cache if use_cache is None else use_cache
+        base_url = self.get_current_url().split("?")[0].rsplit("/", 1)[0]
+        sort_value = self._sort_value(sort) if sort else None
+        key = (base_url, query, category, price_range, rating, shipping, sort_value, page)
+        
+        if use_cache:
+            key += (result_cache.catalog_version(base_url, self.get_catalog_version),)
+            snapshot = result_cache.get(key)
+            if snapshot is not None:
+                return snapshot
+        
+        if not self._pristine:
+            self.navigate_to(f"{base_url}/shop.html")
+            self.wait_for_page_load()
+        self.perform_search(query)
+        if category:
+            self.select_category_filter(category)
+        if price_range:
+            self.select_price_filter(price_range)
+        if rating:
+            self.select_rating_filter(rating)
+        if shipping:
+            self.select_shipping_filter(shipping)
+        if sort:
+            self.select_sort_option(sort)
+        for _ in range(page - 1):
+            self.click_next_page()
+        
+        snapshot = self.get_results_snapshot()
+        if use_cache:
+            result_cache.put(key, snapshot)
+        return snapshot
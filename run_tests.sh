@@ -18,6 +18,16 @@ else
     source venv/bin/activate
 fi
 
+# Watch mode: rerun affected tests on save (Ctrl+C to stop)
+if [ "$1" == "--watch" ]; then
+    shift
+    echo ""
+    echo "Starting watch mode..."
+    echo ""
+    python -m utils.watch "$@"
+    exit $?
+fi
+
 echo ""
 echo "Running tests..."
 echo ""
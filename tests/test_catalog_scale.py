@@ -0,0 +1,48 @@
+"""
+Test cases against a large synthetic catalog on the local stand-in shop (TC-18 to TC-19)
+"""
+import pytest
+
+
+@pytest.mark.scale
+@pytest.mark.pagination
+class TestCatalogScale:
+    """Pagination, search and sort at production-like catalog sizes"""
+
+    def test_tc18_pagination_through_large_result_set(self, standin_shop_page):
+        """
+        TC-18: Pagination through a large result set
+        Expected: Next/Previous move between full pages of different products
+        """
+        shop_page = standin_shop_page
+        shop_page.perform_search("phone")
+
+        page1 = shop_page.get_results_snapshot()
+        assert len(page1.products) == 12, "A large result set should fill the first page"
+        assert shop_page.is_pagination_displayed(), "Pagination should be displayed"
+
+        shop_page.click_next_page()
+        page2 = shop_page.get_results_snapshot()
+        assert shop_page.get_current_page_number() == 2, "Should be on page 2 after clicking next"
+        assert len(page2.products) == 12, "Page 2 should be full"
+        assert not set(page1.products) & set(page2.products), "Page 2 should show different products"
+
+        shop_page.click_previous_page()
+        assert shop_page.get_current_page_number() == 1, "Should be back on page 1"
+        assert shop_page.get_results_snapshot().products == page1.products, "Page 1 should show the same products"
+
+    def test_tc19_sort_by_price_across_pages(self, standin_shop_page):
+        """
+        TC-19: Sort by price across pages
+        Expected: Prices ascend within and across pages
+        """
+        shop_page = standin_shop_page
+        shop_page.perform_search("shirt")
+        shop_page.select_sort_option("Price: Low to High")
+
+        prices = [p.price for p in shop_page.get_results_snapshot().products]
+        shop_page.click_next_page()
+        prices += [p.price for p in shop_page.get_results_snapshot().products]
+
+        assert len(prices) == 24, "Both pages should be full"
+        assert prices == sorted(prices), "Prices should be sorted from lowest to highest across pages"
@@ -0,0 +1,116 @@
+"""
+Test cases for the product detail page and checkout (TC-22 to TC-28)
+"""
+import time
+
+import pytest
+
+from utils.cart_seed import build_cart
+
+
+@pytest.mark.checkout
+class TestProductDetail:
+    """Test cases for the product detail page"""
+
+    @pytest.mark.read_only
+    def test_tc22_product_details_display(self, product_page, base_url):
+        """
+        TC-22: Product details display
+        Expected: The product page shows a name, price and image
+        """
+        product_page.open_product(base_url, 1)
+
+        assert product_page.get_product_name(), "Product should have a name"
+        assert product_page.get_product_price() > 0, "Product should have a price"
+        assert product_page.get_product_image(), "Product should have an image"
+
+    def test_tc23_add_to_cart_from_product_page(self, product_page, base_url):
+        """
+        TC-23: Add to cart from the product page
+        Expected: The cart badge and the stored cart both gain the product
+        """
+        product_page.open_product(base_url, 1)
+        count_before = product_page.get_cart_count()
+
+        product_page.add_to_cart()
+
+        assert product_page.get_cart_count() > count_before, "Cart count should increase"
+        assert product_page.get_cart_entries(), "Product should be stored in the cart"
+
+
+@pytest.mark.checkout
+class TestCheckout:
+    """Test cases for checkout with a cart built through the product pages"""
+
+    @pytest.mark.cart(3)
+    def test_tc24_seeded_cart_shown_at_checkout(self, seeded_checkout_page):
+        """
+        TC-24: Seeded cart shown at checkout
+        Expected: Every item added to the cart is listed and the total is positive
+        """
+        checkout_page = seeded_checkout_page
+
+        assert checkout_page.get_cart_item_count() == 3, "All added items should be listed"
+        assert checkout_page.get_total() > 0, "Order total should be positive"
+
+    def test_tc25_empty_cart_message(self, checkout_page):
+        """
+        TC-25: Empty cart message
+        Expected: Checkout with an empty cart shows the empty cart message
+        """
+        # Every test gets a fresh browser, so the cart starts empty
+        assert checkout_page.is_empty_cart_message_displayed(), "Empty cart message should be displayed"
+        assert checkout_page.get_cart_item_count() == 0, "No items should be listed"
+
+    @pytest.mark.cart(1)
+    def test_tc26_required_fields_validation(self, seeded_checkout_page):
+        """
+        TC-26: Required fields validation
+        Expected: Placing an order with an empty form shows validation errors and keeps the cart
+        """
+        checkout_page = seeded_checkout_page
+        checkout_page.place_order()
+
+        errors = checkout_page.get_field_errors()
+        assert "full_name" in errors, "Full name should be reported as required"
+        assert checkout_page.get_cart_item_count() == 1, "Cart should be kept when validation fails"
+
+    @pytest.mark.storage_state("cart_3_items")
+    def test_tc28_cart_restored_from_storage_state(self, checkout_page):
+        """
+        TC-28: Cart restored from a storage state
+        Expected: A cart built once through the product pages is restored at checkout
+        """
+        checkout_page.wait_for_cart_items(3)
+
+        assert checkout_page.get_cart_item_count() == 3, "All items of the saved cart should be listed"
+        assert len(checkout_page.get_cart_entries()) == 3, "The saved cart should be restored to localStorage"
+
+
+@pytest.mark.checkout
+@pytest.mark.scale
+class TestLargeCartCheckout:
+    """Checkout timing with large carts on the local stand-in shop"""
+
+    @pytest.mark.parametrize("cart_size", [10, 100, 1000])
+    def test_tc27_large_cart_checkout_timing(self, standin_checkout_page, standin_base_url, cart_size,
+                                             record_property):
+        """
+        TC-27: Large cart checkout timing
+        Expected: A large seeded cart renders in full and the order clears it
+        """
+        checkout_page = standin_checkout_page
+        checkout_page.open_with_cart(standin_base_url, build_cart(cart_size))
+        assert checkout_page.get_cart_item_count() == cart_size, "All seeded items should be listed"
+
+        checkout_page.fill_shipping_details("Test User", "1 Main Street", "Springfield", "12345", "United States")
+        checkout_page.select_payment_method()
+        start = time.perf_counter()
+        checkout_page.click(checkout_page.locators.PLACE_ORDER_BUTTON)
+        checkout_page.wait_for_cart_items(0)
+        checkout_page.timings["place_order"] = round(time.perf_counter() - start, 3)
+
+        timings = dict(checkout_page.timings, cart_size=cart_size)
+        record_property("checkout_timings", timings)
+        assert checkout_page.get_field_errors() == {}, "A complete form should pass validation"
+        assert not checkout_page.get_cart_entries(), "Placing the order should clear the cart"
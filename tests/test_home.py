@@ -0,0 +1,40 @@
+"""
+Test cases for the home page product sections (TC-20 to TC-21)
+"""
+import pytest
+
+
+@pytest.mark.home
+@pytest.mark.read_only
+class TestHomeSections:
+    """Test cases for the Deals, Bestsellers and Favorites sections"""
+
+    def test_tc20_sections_display_products(self, home_page):
+        """
+        TC-20: Home sections display products
+        Expected: Deals, Bestsellers and Favorites each show products with name, price and image
+        """
+        home_page.get_section_render_timings()
+        sections = home_page.get_sections()
+
+        for section, products in sections.items():
+            assert products is not None, f"Section '{section}' should be present"
+            assert len(products) > 0, f"Section '{section}' should display products"
+            for product in products:
+                assert product.name, f"Every product in '{section}' should have a name"
+                assert product.price is not None, f"'{product.name}' in '{section}' should have a price"
+                assert product.image, f"'{product.name}' in '{section}' should have an image"
+
+    def test_tc21_section_render_timings(self, home_page, record_property):
+        """
+        TC-21: Home section render timings
+        Expected: Every section renders, and finishes rendering after it first renders
+        """
+        timings = home_page.get_section_render_timings()
+        record_property("render_timings", timings)
+
+        for section, timing in timings.items():
+            assert timing["items"] > 0, f"Section '{section}' should render items"
+            if timing["first_render"] is not None and timing["complete"] is not None:
+                assert timing["complete"] >= timing["first_render"], \
+                    f"Section '{section}' should complete after its first render"
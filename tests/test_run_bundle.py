@@ -0,0 +1,98 @@
+"""
+Unit tests for run artifact bundles (utils/run_bundle.py); no browser needed
+"""
+import os
+import time
+import zipfile
+
+import pytest
+
+from utils.run_bundle import INDEX_NAME, collect_artifacts, prune, read_index, remove_packed, write_bundle
+
+
+def make_file(path, content=b"x", age=0):
+    """Create a file (and its directory), optionally backdated by age seconds"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    if age:
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.mark.unit
+class TestRunBundle:
+    """Collecting, packing and pruning run artifacts"""
+
+    @pytest.fixture(autouse=True)
+    def workdir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    def test_collect_artifacts_since(self):
+        make_file("screenshots/old.png", age=3600)
+        make_file("screenshots/new.png")
+        make_file("reports/nested/report.html")
+        make_file("reports/wait.lock")
+        make_file("reports/part.tmp")
+        files = collect_artifacts(time.time() - 60, ("screenshots", "reports", "missing"))
+        assert files == ["reports/nested/report.html", "screenshots/new.png"]
+        assert "screenshots/old.png" in collect_artifacts(0, ("screenshots",))
+
+    def test_write_bundle_and_read_index(self):
+        files = [make_file("screenshots/a.png", b"png" * 100), make_file("reports/r.html", b"<p>" * 100)]
+        path = write_bundle("bundles", files + ["screenshots/gone.png"], {"exitstatus": 1}, name="run_1")
+        assert path == os.path.join("bundles", "run_1.zip")
+        index = read_index(path)
+        assert index["bundle"] == "run_1"
+        assert index["exitstatus"] == 1
+        # Files that disappeared before packing are left out
+        assert [entry["path"] for entry in index["files"]] == files
+        with zipfile.ZipFile(path) as bundle:
+            assert bundle.namelist() == [INDEX_NAME] + files
+            assert bundle.getinfo("screenshots/a.png").compress_type == zipfile.ZIP_STORED
+            assert bundle.getinfo("reports/r.html").compress_type == zipfile.ZIP_DEFLATED
+            assert bundle.read("reports/r.html") == b"<p>" * 100
+        assert not [name for name in os.listdir("bundles") if name.endswith(".tmp")]
+
+    def test_write_bundle_never_overwrites(self):
+        files = [make_file("reports/r.html")]
+        first = write_bundle("bundles", files, name="run_1")
+        second = write_bundle("bundles", files, name="run_1")
+        assert first != second
+        assert second.endswith("run_1_2.zip")
+
+    def test_remove_packed_keeps_history(self):
+        files = [make_file("screenshots/a.png"), make_file("archive/output_1.json"),
+                 make_file("bug_reports/signatures.json")]
+        assert remove_packed(files) == ["screenshots/a.png"]
+        assert os.path.exists("archive/output_1.json")
+        assert os.path.exists("bug_reports/signatures.json")
+
+    def make_bundles(self, sizes):
+        """Bundles run_0 (newest) .. run_n, each sizes[i] bytes"""
+        for i, size in enumerate(sizes):
+            make_file(f"bundles/run_{i}.zip", b"x" * size, age=(i + 1) * 86400)
+
+    def test_prune_keep(self):
+        self.make_bundles([10] * 5)
+        removed = prune("bundles", keep=2)
+        assert sorted(os.path.basename(path) for path in removed) == ["run_2.zip", "run_3.zip", "run_4.zip"]
+
+    def test_prune_max_age(self):
+        self.make_bundles([10] * 4)
+        removed = prune("bundles", max_age_days=2.5)
+        assert sorted(os.path.basename(path) for path in removed) == ["run_2.zip", "run_3.zip"]
+
+    def test_prune_max_size_removes_everything_older(self):
+        # run_2 does not fit; run_3 would, but is older, so it goes too
+        self.make_bundles([400 * 1024, 400 * 1024, 400 * 1024, 10])
+        removed = prune("bundles", max_size_mb=1)
+        assert sorted(os.path.basename(path) for path in removed) == ["run_2.zip", "run_3.zip"]
+
+    def test_prune_keeps_newest(self):
+        self.make_bundles([2 * 1024 * 1024, 10])
+        removed = prune("bundles", keep=1, max_age_days=0.5, max_size_mb=1)
+        assert [os.path.basename(path) for path in removed] == ["run_1.zip"]
+        assert os.listdir("bundles") == ["run_0.zip"]
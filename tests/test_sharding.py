@@ -0,0 +1,87 @@
+"""
+Unit tests for duration-aware sharding (utils/sharding.py); no browser needed
+"""
+import json
+import os
+
+import pytest
+
+from utils.sharding import assign_shards, estimate, load_durations, parse_shard, DURATION_STEP
+
+
+pytest_plugins = ["pytester"]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KEYS = [f"tests/test_search.py::test_tc{i}" for i in range(1, 13)]
+DURATIONS = {key: float(i * 3) for i, key in enumerate(KEYS[:9], 1)}
+
+
+@pytest.mark.unit
+class TestSharding:
+    """Shard parsing, duration estimates and the LPT split"""
+
+    @pytest.mark.parametrize("value,expected", [("1/1", (1, 1)), ("2/4", (2, 4)), ("4/4", (4, 4))])
+    def test_parse_shard(self, value, expected):
+        assert parse_shard(value) == expected
+
+    @pytest.mark.parametrize("value", ["0/3", "4/3", "1-3", "a/b", "3"])
+    def test_parse_shard_rejects_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+    def test_estimate_rounds_and_defaults_to_mean(self):
+        estimates = estimate(["a", "b", "c"], {"a": 1.26, "b": 4.0})
+        assert estimates["a"] == 1.5
+        assert estimates["b"] == 4.0
+        # Unseen tests get the mean known duration (2.63 -> 2.5)
+        assert estimates["c"] == 2.5
+
+    def test_estimate_never_zero(self):
+        assert estimate(["a"], {"a": 0.1})["a"] == DURATION_STEP
+        assert estimate(["a"], {})["a"] > 0
+
+    def test_assign_shards_covers_every_test_once(self):
+        shards = assign_shards(KEYS, estimate(KEYS, DURATIONS), 3)
+        assigned = [key for _, selected in shards for key in selected]
+        assert sorted(assigned) == sorted(KEYS)
+
+    def test_assign_shards_balances_totals(self):
+        estimates = estimate(KEYS, DURATIONS)
+        totals = [total for total, _ in assign_shards(KEYS, estimates, 3)]
+        # LPT keeps the spread within the longest single test
+        assert max(totals) - min(totals) <= max(estimates.values())
+
+    def test_same_input_gives_same_plan(self):
+        """Every node must compute the same split, whatever the collection order"""
+        plans = [assign_shards(keys, estimate(keys, DURATIONS), 4)
+                 for keys in (KEYS, list(reversed(KEYS)), KEYS[::2] + KEYS[1::2])]
+        assert plans[0] == plans[1] == plans[2]
+
+    def test_durations_come_only_from_archive(self, tmp_path, monkeypatch):
+        archive = tmp_path / "archive"
+        archive.mkdir()
+        output = {"start_time": 1, "content": {"suites": {"0": {
+            "suite_name": "tests/test_search.py",
+            "tests": {"0": {"test_name": "test_tc1", "duration": 4.0}}
+        }}}}
+        (archive / "output_1.json").write_text(json.dumps(output))
+        # A node-local output.json must not change the plan
+        monkeypatch.chdir(tmp_path)
+        local = json.loads(json.dumps(output))
+        local["start_time"] = 2
+        local["content"]["suites"]["0"]["tests"]["0"]["duration"] = 100.0
+        (tmp_path / "output.json").write_text(json.dumps(local))
+        assert load_durations(str(archive)) == {"tests/test_search.py::test_tc1": 4.0}
+
+    @pytest.mark.parametrize("workers", [[], ["-n", "2"]], ids=["serial", "xdist"])
+    def test_shard_applies_with_and_without_xdist(self, pytester, monkeypatch, workers):
+        """Under xdist the workers collect, so they must deselect the other shards themselves"""
+        pytest.importorskip("xdist")
+        monkeypatch.setenv("PYTHONPATH", PROJECT_ROOT)
+        monkeypatch.delenv("SHARD", raising=False)
+        pytester.makepyfile(test_many="\n".join(f"def test_{i}(): pass" for i in range(8)))
+        archive = pytester.mkdir("archive")
+        result = pytester.runpytest_subprocess("-p", "utils.sharding", "--shard=1/2",
+                                               f"--shard-archive={archive}", *workers)
+        # No history: every test gets the same estimate, so the shard holds half
+        result.assert_outcomes(passed=4)
@@ -11,6 +11,7 @@ import time
 class TestSortAndFilter:
     """Test cases for sorting and filtering functionality"""
     
+    @pytest.mark.read_only
     def test_tc7_sort_by_price_low_to_high(self, shop_page):
         """
         TC-7: Sort by price (Low → High)
@@ -28,6 +29,7 @@ class TestSortAndFilter:
         assert shop_page.verify_prices_sorted_ascending(), \
             "Prices should be sorted from lowest to highest"
     
+    @pytest.mark.read_only
     def test_tc8_sort_by_price_high_to_low(self, shop_page):
         """
         TC-8: Sort by price (High → Low)
@@ -45,6 +47,7 @@ class TestSortAndFilter:
         assert shop_page.verify_prices_sorted_descending(), \
             "Prices should be sorted from highest to lowest"
     
+    @pytest.mark.read_only
     def test_tc9_sort_by_name_a_to_z(self, shop_page):
         """
         TC-9: Sort by name (A → Z)
@@ -62,36 +65,31 @@ class TestSortAndFilter:
         assert shop_page.verify_names_sorted_alphabetically(), \
             "Product names should be sorted alphabetically (A-Z)"
     
+    @pytest.mark.read_only
     def test_tc10_filter_by_category(self, shop_page):
         """
         TC-10: Filter by category
         Expected: Only products in Clothing category displayed
         """
-        # Search for "Shirt"
-        shop_page.perform_search("Shirt")
-        time.sleep(2)
-        
-        # Apply Category = Clothing filter
-        shop_page.select_category_filter("Clothing")
-        time.sleep(2)
+        # Search for "Shirt", apply Category = Clothing and sort Price: Low → High
+        # (the same results as TC-12, so one of them can reuse the per-worker cached snapshot)
+        results = shop_page.search_results("Shirt", category="Clothing", sort="Price: Low to High")
         
         # Verify filter is applied
-        selected_category = shop_page.get_dropdown_selected_value(shop_page.locators.CATEGORY_FILTER)
-        assert selected_category == "Clothing", "Category filter should be set to Clothing"
+        assert results.selected["category"] == "Clothing", "Category filter should be set to Clothing"
         
         # Verify products are displayed (filtered results)
-        products = shop_page.get_product_cards()
-        assert len(products) >= 0, "Should display filtered products or no results message"
+        assert len(results.products) >= 0, "Should display filtered products or no results message"
     
-    def test_tc11_filter_by_price_range(self, shop_page):
+    @pytest.mark.setup_actions(("perform_search", "Shoes"))
+    def test_tc11_filter_by_price_range(self, prepared_shop_page):
         """
         TC-11: Filter by price range
         Expected: Only products within the selected price range are displayed
         Note: Adjusting to available price ranges in the application
         """
-        # Search for "Shoes"
-        shop_page.perform_search("Shoes")
-        time.sleep(2)
+        # Search for "Shoes" (setup_actions)
+        shop_page = prepared_shop_page
         
         # Get initial product count and prices
         initial_products = shop_page.get_product_cards()
@@ -121,34 +119,24 @@ class TestSortAndFilter:
             assert len(initial_products) != len(products) or len(initial_products) == 0, \
                 "Price filter should affect the results"
     
+    @pytest.mark.read_only
     def test_tc12_combine_sorting_filtering(self, shop_page):
         """
         TC-12: Combine sorting and filtering
         Expected: Results filtered AND sorted correctly
         """
-        # Search for "Shirt"
-        shop_page.perform_search("Shirt")
-        time.sleep(2)
-        
-        # Filter Category = Clothing
-        shop_page.select_category_filter("Clothing")
-        time.sleep(2)
-        
-        # Sort Price: Low → High
-        shop_page.select_sort_option("Price: Low to High")
-        time.sleep(2)
+        # Search for "Shirt", filter Category = Clothing, sort Price: Low → High
+        # (the same results as TC-10, so one of them can reuse the per-worker cached snapshot)
+        results = shop_page.search_results("Shirt", category="Clothing", sort="Price: Low to High")
         
         # Verify filter is still applied
-        selected_category = shop_page.get_dropdown_selected_value(shop_page.locators.CATEGORY_FILTER)
-        assert selected_category == "Clothing", "Category filter should remain applied"
+        assert results.selected["category"] == "Clothing", "Category filter should remain applied"
         
         # Verify sort is applied
-        selected_sort = shop_page.get_dropdown_selected_value(shop_page.locators.SORT_OPTION)
-        assert selected_sort == "priceAsc", "Sort should be set to Price: Low to High"
+        assert results.selected["sort"] == "priceAsc", "Sort should be set to Price: Low to High"
         
         # Verify prices are sorted in ascending order
-        products = shop_page.get_product_cards()
-        if len(products) > 0:
-            assert shop_page.verify_prices_sorted_ascending(), \
-                "Prices should be sorted ascending after applying both filter and sort"
+        prices = [product.price for product in results.products if product.price is not None]
+        assert prices == sorted(prices), \
+            "Prices should be sorted ascending after applying both filter and sort"
 
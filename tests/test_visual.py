@@ -0,0 +1,106 @@
+"""
+Visual regression tests for key page states (TC-16 to TC-17)
+Baselines are recorded with VISUAL_UPDATE_BASELINES=true; a missing baseline fails
+"""
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from locators.locators import HomePageLocators
+from utils.visual import VisualCheck, VisualComparator
+
+
+@pytest.mark.visual
+class TestVisualRegression:
+    """Visual regression tests against recorded baselines"""
+
+    @pytest.mark.parametrize("section", ["DEALS_GRID", "BESTSELLERS_GRID", "FAVORITES_GRID"])
+    def test_tc16_home_sections_match_baseline(self, home_page, visual, section):
+        """
+        TC-16: Home page product sections
+        Expected: Each section renders the same as its baseline
+        """
+        locator = getattr(HomePageLocators, section)
+        home_page.scroll_to_element(locator)
+        home_page.settle(1)
+
+        visual.assert_matches(f"home_{section.lower()}", element=home_page.find_element(locator))
+
+    @pytest.mark.parametrize("sort", ["Featured", "Price: Low to High", "Price: High to Low", "Name: A-Z"])
+    def test_tc17_shop_grid_sorted_matches_baseline(self, shop_page, visual, sort):
+        """
+        TC-17: Shop product grid under each sort option
+        Expected: The sorted grid renders the same as its baseline
+        """
+        shop_page.select_sort_option(sort)
+
+        visual.assert_matches(f"shop_grid_{sort}",
+                              element=shop_page.find_element(shop_page.locators.PRODUCT_RESULTS))
+
+
+def png(array):
+    """Encode an RGB array as PNG bytes"""
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def gradient(height=100, width=150):
+    """A 100x150 image with distinct tiles"""
+    rows, cols = np.mgrid[0:height, 0:width]
+    return np.stack([rows * 2, cols, (rows + cols) % 256], axis=-1).astype(np.uint8)
+
+
+@pytest.mark.unit
+class TestVisualComparator:
+    """Tile-hash comparison of captures with baselines; no browser needed"""
+
+    @pytest.fixture
+    def comparator(self, tmp_path):
+        comparator = VisualComparator(tmp_path / "baselines", tmp_path / "diffs", tile=32)
+        VisualComparator(tmp_path / "baselines", tmp_path / "diffs", tile=32, update=True) \
+            .compare("state", png(gradient()))
+        return comparator
+
+    def test_match(self, comparator):
+        result = comparator.compare("state", png(gradient()))
+        assert result.status == "match"
+        assert (result.changed_tiles, result.total_tiles) == (0, 20)
+        assert result.heatmap is None
+
+    def test_change_within_tolerance_matches(self, comparator):
+        image = gradient()
+        image[0, 0] = 255 - image[0, 0]
+        comparator.tolerance = 0.001
+        result = comparator.compare("state", png(image))
+        assert result.status == "match"
+        assert result.changed_tiles == 1
+
+    def test_mismatch(self, comparator):
+        image = gradient()
+        image[40:70, 100:140] = 255 - image[40:70, 100:140]
+        result = comparator.compare("state", png(image))
+        assert result.status == "mismatch"
+        # Rows 40-69 span tile rows 1 and 2, columns 100-139 tile columns 3 and 4
+        assert result.changed_tiles == 4
+        assert 0 < result.diff_ratio <= 30 * 40 / (100 * 150)
+        with Image.open(result.heatmap) as heatmap:
+            assert heatmap.size == (150, 100)
+
+    def test_size_mismatch(self, comparator):
+        result = comparator.compare("state", png(gradient(width=160)))
+        assert result.status == "size_mismatch"
+        assert (result.baseline_size, result.actual_size) == ("150x100", "160x100")
+
+    def test_missing_baseline_fails(self, comparator, tmp_path):
+        class Driver:
+            def get_screenshot_as_png(self):
+                return png(gradient())
+
+        result = comparator.compare("other", png(gradient()))
+        assert result.status == "missing"
+        assert not (tmp_path / "baselines" / "other.png").exists()
+        with pytest.raises(AssertionError, match="No baseline"):
+            VisualCheck(Driver(), comparator).assert_matches("other")
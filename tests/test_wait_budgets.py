@@ -0,0 +1,103 @@
+"""
+Unit tests for adaptive wait budgets (utils/wait_budgets.py); no browser needed
+"""
+import json
+
+import pytest
+
+from utils.wait_budgets import WaitBudgets
+
+
+KEY = "ShopPage|find_element|.product-card"
+
+
+def make_budgets(tmp_path, **kwargs):
+    options = dict(enabled=True, default=10, min_samples=3)
+    options.update(kwargs)
+    return WaitBudgets(str(tmp_path / "wait_budgets.json"), **options)
+
+
+@pytest.mark.unit
+class TestWaitBudgets:
+    """Learned budgets, timeout precedence, recording and saving"""
+
+    def test_learned_needs_min_samples(self, tmp_path):
+        budgets = make_budgets(tmp_path)
+        budgets.record(KEY, 0.5)
+        budgets.record(KEY, 0.5)
+        assert budgets.learned(KEY) is None
+        budgets.record(KEY, 0.5)
+        assert budgets.learned(KEY) is not None
+
+    def test_learned_is_percentile_times_margin_plus_padding(self, tmp_path):
+        budgets = make_budgets(tmp_path)
+        for seconds in (1.0, 2.0, 4.0):
+            budgets.record(KEY, seconds)
+        # p95 of three samples is the largest: 4.0 * 1.5 + 0.5
+        assert budgets.learned(KEY) == 6.5
+
+    def test_learned_is_clamped(self, tmp_path):
+        budgets = make_budgets(tmp_path)
+        for _ in range(3):
+            budgets.record(KEY, 0.01)
+            budgets.record("slow", 30.0)
+        assert budgets.learned(KEY) == budgets.minimum
+        assert budgets.learned("slow") == budgets.default
+
+    def test_timeout_precedence(self, tmp_path):
+        budgets = make_budgets(tmp_path)
+        assert budgets.timeout(KEY) == 10
+        for _ in range(3):
+            budgets.record(KEY, 1.0)
+        assert budgets.timeout(KEY) == 2.0
+        assert budgets.timeout(KEY, learn=False) == 10
+        assert budgets.timeout(KEY, explicit=5) == 5
+        budgets.set_override(KEY, 7)
+        assert budgets.timeout(KEY, explicit=5) == 7
+
+    def test_timeout_disabled_ignores_history(self, tmp_path):
+        budgets = make_budgets(tmp_path, enabled=False)
+        budgets.record(KEY, 1.0)
+        assert budgets.timeout(KEY) == 10
+        assert budgets.timeout(KEY, explicit=3) == 3
+        assert KEY not in budgets.data["waits"]
+
+    def test_timed_out_wait_lets_budget_grow_back(self, tmp_path):
+        budgets = make_budgets(tmp_path)
+        for _ in range(3):
+            budgets.record(KEY, 0.2)
+        tight = budgets.timeout(KEY)
+        budgets.record(KEY, tight, timed_out=True)
+        assert budgets.timeout(KEY) > tight
+        assert budgets.data["waits"][KEY]["timeouts"] == 1
+
+    def test_record_keeps_history_limit(self, tmp_path):
+        budgets = make_budgets(tmp_path, history=4)
+        for seconds in range(6):
+            budgets.record(KEY, seconds)
+        assert budgets.data["waits"][KEY]["samples"] == [2, 3, 4, 5]
+
+    def test_save_merges_with_concurrent_writers(self, tmp_path):
+        first, second = make_budgets(tmp_path), make_budgets(tmp_path)
+        first.record(KEY, 1.0)
+        second.record(KEY, 2.0, timed_out=True)
+        second.record("other", 0.5)
+        first.save()
+        second.save()
+        data = json.loads((tmp_path / "wait_budgets.json").read_text())
+        assert data["waits"][KEY]["samples"] == [1.0, 2.0]
+        assert data["waits"][KEY]["timeouts"] == 1
+        assert data["waits"]["other"]["samples"] == [0.5]
+
+    def test_save_stores_budgets_and_keeps_overrides(self, tmp_path):
+        budgets = make_budgets(tmp_path)
+        budgets.set_override("pinned", 8)
+        for _ in range(3):
+            budgets.record(KEY, 1.0)
+        budgets.save()
+        data = json.loads((tmp_path / "wait_budgets.json").read_text())
+        assert data["waits"][KEY]["budget"] == 2.0
+        assert data["overrides"] == {"pinned": 8}
+        # Nothing new to merge: the file is left alone
+        budgets.save()
+        assert json.loads((tmp_path / "wait_budgets.json").read_text()) == data
@@ -0,0 +1,188 @@
+"""
+Record-and-Replay Action Log
+Records every BasePage action of a test (locator, arguments, timing, resulting URL)
+into a compact gzip JSONL log that is attached to the bug report, and replays a log
+against any base URL (e.g. a local stand-in) at full speed without the fixed sleeps
+of the page objects.
+
+Recording is opt-in (ACTION_LOG=true).
+
+Usage:
+    ACTION_LOG=true pytest
+    python -m utils.action_log show bug_reports/actions/<log>.jsonl.gz
+    python -m utils.action_log replay <log> --base-url http://localhost:8000 --stop-at 12
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from pages.base_page import ActionListener, BasePage
+
+
+ACTION_LOG_DIR = os.path.join("bug_reports", "actions")
+
+# Actions that change page state; everything else is a read and is skipped on replay by default
+STATE_CHANGING_ACTIONS = {
+    "navigate_to", "click", "send_keys", "select_dropdown_option",
+    "select_dropdown_option_by_text", "scroll_to_element", "wait_for_page_load"
+}
+
+
+class ActionRecorder(ActionListener):
+    """Record the outermost BasePage actions performed on one driver"""
+
+    def __init__(self, driver, test_name, base_url):
+        self.driver = driver
+        self.test_name = test_name
+        self.base_url = base_url
+        self.started = time.time()
+        self.entries = []
+        self._open = 0
+
+    def on_action_start(self, event):
+        # Page-specific actions (e.g. ShopPage.perform_search) are recorded as the BasePage actions they run
+        if event.page.driver is not self.driver or not hasattr(BasePage, event.name):
+            return
+        # Only the outermost action is recorded (e.g. not find_element inside scroll_to_element)
+        event.recorded = self._open == 0
+        self._open += 1
+
+    def on_action_end(self, event):
+        if event.page.driver is not self.driver or not hasattr(BasePage, event.name):
+            return
+        self._open -= 1
+        if not getattr(event, "recorded", False):
+            return
+        entry = {
+            "step": len(self.entries) + 1,
+            "action": event.name,
+            "args": list(event.args),
+            "kwargs": dict(event.kwargs),
+            "offset": round(event.start_time - self.started, 4),
+            "duration": round(event.duration, 4)
+        }
+        if event.name in STATE_CHANGING_ACTIONS:
+            try:
+                entry["url"] = self.driver.current_url
+            except Exception:
+                entry["url"] = None
+        if event.error is not None:
+            entry["error"] = f"{type(event.error).__name__}: {event.error}"
+        self.entries.append(entry)
+
+    def save(self, log_dir=ACTION_LOG_DIR):
+        """Write the log as gzip JSONL (header line first) and return its path"""
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started).strftime("%Y%m%d_%H%M%S")
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.test_name)[:80]
+        path = Path(log_dir) / f"{safe_name}_{stamp}.jsonl.gz"
+        header = {
+            "version": 1,
+            "test": self.test_name,
+            "base_url": self.base_url,
+            "started": datetime.fromtimestamp(self.started).isoformat(),
+            "steps": len(self.entries)
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for record in [header] + self.entries:
+                f.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+        return str(path)
+
+
+def load_log(path):
+    """Load a log; returns (header, entries)"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return records[0], records[1:]
+
+
+def _rewrite_url(url, recorded_base, base_url):
+    """Point a recorded URL at another base URL"""
+    if base_url and recorded_base and url.startswith(recorded_base):
+        return base_url.rstrip("/") + url[len(recorded_base.rstrip("/")):]
+    return url
+
+
+def replay(path, base_url=None, stop_at=None, include_reads=False, browser=None, headless=None):
+    """
+    Re-execute a recorded log
+
+    Args:
+        path: Log file
+        base_url: Base URL to replay against (defaults to the recorded one)
+        stop_at: Step number to pause at for inspection
+        include_reads: Also replay read-only actions (get_text, is_present, ...)
+        browser: Browser to replay in (defaults to config.BROWSER)
+        headless: Run headless (defaults to config.HEADLESS)
+    """
+    from utils.browser_factory import create_driver
+    from utils.event_session import attach_event_session
+
+    header, entries = load_log(path)
+    driver = create_driver(browser, headless=headless)
+    attach_event_session(driver)
+    page = BasePage(driver)
+    try:
+        for entry in entries:
+            if entry["action"] not in STATE_CHANGING_ACTIONS and not include_reads:
+                continue
+            args = list(entry["args"])
+            if entry["action"] == "navigate_to" and args:
+                args[0] = _rewrite_url(args[0], header.get("base_url"), base_url)
+            start = time.perf_counter()
+            outcome = "ok"
+            try:
+                getattr(page, entry["action"])(*args, **entry.get("kwargs", {}))
+                # Wait for the app to react instead of the page objects' fixed sleeps
+                if page.events:
+                    page.settle(0)
+            except Exception as e:
+                outcome = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - start
+            recorded = f"(recorded {entry['duration']:.2f}s)"
+            print(f"[{entry['step']:>3}] {entry['action']:32} {elapsed:6.2f}s {recorded:20} {outcome}")
+            if "error" in entry:
+                print(f"      recorded error: {entry['error']}")
+            if stop_at is not None and entry["step"] >= stop_at:
+                print(f"Stopped at step {entry['step']}: {driver.current_url}")
+                input("Browser left open for inspection. Press Enter to quit...")
+                break
+    finally:
+        driver.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or replay recorded BasePage action logs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    show_parser = subparsers.add_parser("show", help="Print a log")
+    show_parser.add_argument("path")
+    replay_parser = subparsers.add_parser("replay", help="Replay a log in a browser")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--base-url", help="Base URL to replay against (e.g. a local stand-in)")
+    replay_parser.add_argument("--stop-at", type=int, help="Pause at this step for inspection")
+    replay_parser.add_argument("--include-reads", action="store_true", help="Also replay read-only actions")
+    replay_parser.add_argument("--browser", help="Browser to use (default: config.BROWSER)")
+    replay_parser.add_argument("--headless", action="store_true", help="Run headless")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        header, entries = load_log(args.path)
+        print(f"{header['test']} ({header['started']}, base URL {header['base_url']})")
+        for entry in entries:
+            target = ", ".join(repr(a) for a in entry["args"])
+            error = f"  !! {entry['error']}" if "error" in entry else ""
+            print(f"[{entry['step']:>3}] +{entry['offset']:7.2f}s {entry['duration']:6.2f}s "
+                  f"{entry['action']}({target}){error}")
+        return 0
+
+    replay(args.path, args.base_url, args.stop_at, args.include_reads, args.browser, args.headless or None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
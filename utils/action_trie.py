@@ -0,0 +1,121 @@
+"""
+Action-Prefix Sharing
+Tests declare their setup as a sequence of page object actions:
+
+    @pytest.mark.setup_actions(("perform_search", "Shirt"))
+    def test_something(self, prepared_shop_page):
+        prepared_shop_page.select_category_filter("Clothing")  # the action under test
+        ...
+
+Setup sequences are stored in a trie. Tests are ordered so that tests sharing a
+prefix run back to back, and the page state after a shared prefix is captured
+the first time it runs in a worker. Later tests restore that state instead of
+replaying the actions, and only run their remaining actions. A restored state
+is set through JavaScript rather than the UI, so the action a test verifies
+belongs in the test body, not in its setup_actions.
+"""
+import pytest
+
+
+class PrefixNode:
+    """A node in the action trie; state holds the captured page state after this prefix"""
+
+    def __init__(self):
+        self.children = {}
+        self.count = 0
+        self.state = None
+
+
+class ActionTrie:
+    """Trie of setup action sequences"""
+
+    def __init__(self):
+        self.root = PrefixNode()
+
+    def insert(self, actions):
+        """Add a test's action sequence"""
+        node = self.root
+        for action in actions:
+            node = node.children.setdefault(action, PrefixNode())
+            node.count += 1
+
+    def path(self, actions):
+        """Get the nodes along an action sequence, creating missing ones"""
+        nodes = []
+        node = self.root
+        for action in actions:
+            node = node.children.setdefault(action, PrefixNode())
+            nodes.append(node)
+        return nodes
+
+    def clear(self):
+        """Remove all sequences and captured states"""
+        self.root = PrefixNode()
+
+
+def get_setup_actions(item):
+    """Get the setup actions declared on a test item as a tuple of hashable tuples"""
+    marker = item.get_closest_marker("setup_actions")
+    if marker is None:
+        return ()
+    return tuple(tuple(action) for action in marker.args)
+
+
+def schedule(items, trie, group_workers=False):
+    """
+    Build the trie from collected items and return them in prefix-sharing order
+
+    Tests are grouped at the position of the first test that shares each prefix, so
+    tests without setup actions keep their relative order. With group_workers, tests
+    that share a first action get the same xdist_group so --dist loadgroup keeps
+    them on one worker.
+    """
+    trie.clear()
+    first_seen = {}
+    keys = []
+    for index, item in enumerate(items):
+        actions = get_setup_actions(item)
+        trie.insert(actions)
+        key = []
+        for depth in range(1, len(actions) + 1):
+            key.append(first_seen.setdefault(actions[:depth], index))
+        key.append(index)
+        keys.append(tuple(key))
+        if group_workers and actions:
+            item.add_marker(pytest.mark.xdist_group(name=f"setup:{actions[0]!r}"))
+    order = sorted(range(len(items)), key=lambda i: keys[i])
+    return [items[i] for i in order]
+
+
+def run_setup_actions(page, actions, trie, probe_locator=None):
+    """
+    Bring a page to the state after the given actions
+
+    Restores the deepest captured prefix state (verified against probe_locator) and
+    runs the remaining actions, capturing state at shared prefixes for later tests.
+    Returns the number of actions that were restored instead of replayed.
+    """
+    nodes = trie.path(actions)
+    fresh_url = page.get_current_url()
+    start = 0
+    for depth in range(len(nodes), 0, -1):
+        state = nodes[depth - 1].state
+        if not state:
+            continue
+        if page.restore_state(state, probe_locator):
+            start = depth
+        else:
+            # The app did not reproduce the captured state; replay from a fresh page
+            nodes[depth - 1].state = False
+            page.driver.execute_script("localStorage.clear(); sessionStorage.clear();")
+            page.navigate_to(fresh_url)
+            page.wait_for_page_load()
+        break
+
+    for depth in range(start, len(actions)):
+        name, *args = actions[depth]
+        getattr(page, name)(*args)
+        node = nodes[depth]
+        if node.count > 1 and node.state is None:
+            node.state = page.capture_state(probe_locator)
+    return start
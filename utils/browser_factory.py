@@ -0,0 +1,113 @@
+"""
+Browser factory for creating WebDriver instances
+Supports Chrome/Chromium and Firefox; additional engines register a builder
+"""
+import functools
+import os
+import zlib
+
+from selenium import webdriver
+
+import config
+
+
+_BUILDERS = {}
+
+
+def register_browser(*names):
+    """Register a builder function for one or more browser names"""
+    def decorator(builder):
+        for name in names:
+            _BUILDERS[name] = builder
+        return builder
+    return decorator
+
+
+def available_browsers():
+    """Get the names of all registered browsers"""
+    return sorted(_BUILDERS)
+
+
+@functools.lru_cache(maxsize=None)
+def driver_path(browser):
+    """Resolve the driver binary once per process"""
+    if browser == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    from webdriver_manager.chrome import ChromeDriverManager
+    if browser == "chromium":
+        from webdriver_manager.core.os_manager import ChromeType
+        return ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install()
+    return ChromeDriverManager().install()
+
+
+@register_browser("chrome", "chromium")
+def _build_chrome(browser, headless):
+    """Build a Chrome or Chromium driver"""
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--start-maximized")
+    # Console errors for bug reports are read from the browser log
+    options.set_capability("goog:loggingPrefs", {"browser": "SEVERE"})
+
+    service = Service(driver_path(browser))
+    return webdriver.Chrome(service=service, options=options)
+
+
+@register_browser("firefox")
+def _build_firefox(browser, headless):
+    """Build a Firefox driver"""
+    from selenium.webdriver.firefox.service import Service
+    from selenium.webdriver.firefox.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("-headless")
+    options.add_argument("--width=1920")
+    options.add_argument("--height=1080")
+
+    service = Service(driver_path(browser))
+    return webdriver.Firefox(service=service, options=options)
+
+
+def create_driver(browser=None, headless=None):
+    """
+    Create a WebDriver instance for the given browser
+
+    Args:
+        browser: Browser name (defaults to config.BROWSER)
+        headless: Run headless (defaults to config.HEADLESS)
+    """
+    browser = (browser or config.BROWSER).lower()
+    headless = config.HEADLESS if headless is None else headless
+    builder = _BUILDERS.get(browser)
+    if builder is None:
+        raise ValueError(f"Unsupported browser: {browser}. Available: {', '.join(available_browsers())}")
+    return builder(browser, headless)
+
+
+def select_engine(nodeid, pool=None):
+    """
+    Pick the browser engine for a test
+
+    With a BROWSER_POOL configured, xdist workers are assigned engines round-robin
+    (gw0 -> first engine, gw1 -> second, ...). Without xdist, tests are split by a
+    stable hash of their node id so the assignment is the same on every run.
+    """
+    pool = pool if pool is not None else config.BROWSER_POOL
+    if not pool:
+        return config.BROWSER.lower()
+
+    worker = os.getenv("PYTEST_XDIST_WORKER", "")
+    if worker.startswith("gw") and worker[2:].isdigit():
+        return pool[int(worker[2:]) % len(pool)]
+    return pool[zlib.crc32(nodeid.encode("utf-8")) % len(pool)]
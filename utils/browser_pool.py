@@ -0,0 +1,357 @@
+"""
+Warm Browser Pool Daemon
+Keeps a configurable number of pre-launched Chrome instances ready and leases them
+to pytest processes over a Unix socket. Clients attach through one shared
+chromedriver using the remote WebDriver protocol. A browser is replaced with a
+fresh one after each lease, so tests never share browser state.
+
+Usage:
+    python -m utils.browser_pool start --size 4 &
+    python -m utils.browser_pool status
+    python -m utils.browser_pool stop
+
+Protocol (one JSON object per line):
+    {"op": "lease"}   -> {"ok": true, "lease_id": ..., "executor": ..., "debugger_address": ..., "pid": ...}
+    {"op": "release"} -> {"ok": true}   (closing the connection also releases the lease)
+    {"op": "status"}  -> {"ok": true, "ready": n, "leased": n, "size": n}
+    {"op": "shutdown"}
+"""
+import argparse
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+
+import config
+
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+def _free_port():
+    """Get a free local TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_http(url, timeout=30):
+    """Wait until a local HTTP endpoint answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def _find_chrome():
+    """Locate the Chrome/Chromium binary"""
+    if os.getenv("CHROME_BINARY"):
+        return os.getenv("CHROME_BINARY")
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError("Chrome/Chromium binary not found; set CHROME_BINARY")
+
+
+class WarmBrowser:
+    """A pre-launched Chrome listening on a remote debugging port"""
+
+    def __init__(self, chrome_binary, headless):
+        self.port = _free_port()
+        self.profile_dir = tempfile.mkdtemp(prefix="stylezone_pool_")
+        args = [
+            chrome_binary,
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={self.profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--window-size=1920,1080",
+            "about:blank"
+        ]
+        if headless:
+            args.insert(1, "--headless=new")
+        self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    @property
+    def debugger_address(self):
+        return f"127.0.0.1:{self.port}"
+
+    def wait_ready(self, timeout=30):
+        """Wait until the DevTools endpoint answers"""
+        return _wait_for_http(f"http://{self.debugger_address}/json/version", timeout)
+
+    def close(self):
+        """Kill the browser and remove its profile"""
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class BrowserPool:
+    """Pool of warm browsers behind a single chromedriver"""
+
+    def __init__(self, size=2, headless=True):
+        self.size = size
+        self.headless = headless
+        self.chrome_binary = _find_chrome()
+        self.ready = queue.Queue()
+        self.leased = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._chromedriver = None
+        self.executor = None
+
+    def start(self):
+        """Start chromedriver and launch the initial browsers"""
+        from utils.browser_factory import driver_path
+
+        port = _free_port()
+        self._chromedriver = subprocess.Popen(
+            [driver_path("chrome"), f"--port={port}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self.executor = f"http://127.0.0.1:{port}"
+        if not _wait_for_http(f"{self.executor}/status"):
+            raise RuntimeError("chromedriver did not start")
+        for _ in range(self.size):
+            self._launch_async()
+
+    def _launch_async(self):
+        """Launch a replacement browser in the background"""
+        threading.Thread(target=self._launch, daemon=True).start()
+
+    def _launch(self):
+        if self._closed.is_set():
+            return
+        browser = WarmBrowser(self.chrome_binary, self.headless)
+        if browser.wait_ready():
+            self.ready.put(browser)
+        else:
+            browser.close()
+            time.sleep(1)
+            self._launch_async()
+
+    def lease(self, timeout=60):
+        """Take a ready browser; returns (lease_id, browser)"""
+        browser = self.ready.get(timeout=timeout)
+        lease_id = uuid.uuid4().hex
+        with self._lock:
+            self.leased[lease_id] = browser
+        return lease_id, browser
+
+    def release(self, lease_id):
+        """Dispose of a leased browser and warm up a replacement"""
+        with self._lock:
+            browser = self.leased.pop(lease_id, None)
+        if browser is None:
+            return
+        browser.close()
+        self._launch_async()
+
+    def status(self):
+        with self._lock:
+            leased = len(self.leased)
+        return {"ready": self.ready.qsize(), "leased": leased, "size": self.size, "executor": self.executor}
+
+    def close(self):
+        """Kill every browser and chromedriver"""
+        self._closed.set()
+        with self._lock:
+            browsers = list(self.leased.values())
+            self.leased.clear()
+        while not self.ready.empty():
+            browsers.append(self.ready.get_nowait())
+        for browser in browsers:
+            browser.close()
+        if self._chromedriver and self._chromedriver.poll() is None:
+            self._chromedriver.terminate()
+
+
+class _LeaseHandler(socketserver.StreamRequestHandler):
+    """One connection per client; a lease lives until released or disconnected"""
+
+    def handle(self):
+        pool = self.server.pool
+        lease_id = None
+        try:
+            for line in self.rfile:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "lease" and lease_id is None:
+                    try:
+                        lease_id, browser = pool.lease(timeout=request.get("timeout", 60))
+                        response = {"ok": True, "lease_id": lease_id, "executor": pool.executor,
+                                    "debugger_address": browser.debugger_address,
+                                    "pid": browser.process.pid}
+                    except queue.Empty:
+                        response = {"ok": False, "error": "no browser became ready"}
+                elif op == "release":
+                    pool.release(lease_id)
+                    lease_id = None
+                    response = {"ok": True}
+                elif op == "status":
+                    response = dict(pool.status(), ok=True)
+                elif op == "shutdown":
+                    self.wfile.write(b'{"ok": true}\n')
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                else:
+                    response = {"ok": False, "error": f"unsupported request: {op}"}
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+        except (OSError, ValueError):
+            pass
+        finally:
+            if lease_id is not None:
+                pool.release(lease_id)
+
+
+class _PoolServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(size=2, headless=None, socket_path=None):
+    """Run the pool daemon in the foreground until stopped (headless: default config.HEADLESS)"""
+    socket_path = socket_path or config.WARM_POOL_SOCKET
+    headless = config.HEADLESS if headless is None else headless
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    pool = BrowserPool(size, headless)
+    pool.start()
+    server = _PoolServer(socket_path, _LeaseHandler)
+    server.pool = pool
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"Browser pool ready on {socket_path} ({size} browser(s), chromedriver {pool.executor})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+class BrowserLease:
+    """Client side of a lease; keeps the connection open for the lease lifetime"""
+
+    def __init__(self, sock, info):
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+        self.info = info
+
+    @classmethod
+    def acquire(cls, socket_path=None, timeout=60):
+        """Lease a warm browser; returns None when the daemon is not running"""
+        socket_path = socket_path or config.WARM_POOL_SOCKET
+        if not os.path.exists(socket_path):
+            return None
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(socket_path)
+            lease = cls(sock, None)
+            lease.info = lease._request({"op": "lease", "timeout": timeout})
+        except (OSError, ValueError):
+            return None
+        if not lease.info.get("ok"):
+            lease.close()
+            return None
+        return lease
+
+    def _request(self, request):
+        self._file.write((json.dumps(request) + "\n").encode("utf-8"))
+        self._file.flush()
+        return json.loads(self._file.readline())
+
+    def connect(self):
+        """
+        Attach a remote WebDriver session to the leased browser
+
+        If attaching fails the lease is released, so the browser is not held until
+        the daemon's lease timeout.
+        """
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        options.debugger_address = self.info["debugger_address"]
+        options.set_capability("goog:loggingPrefs", {"browser": "SEVERE"})
+        try:
+            return webdriver.Remote(command_executor=self.info["executor"], options=options)
+        except Exception:
+            self.release()
+            raise
+
+    def release(self):
+        """Return the browser to the daemon (it is replaced with a fresh one)"""
+        try:
+            self._request({"op": "release"})
+        except (OSError, ValueError):
+            pass
+        self.close()
+
+    def close(self):
+        try:
+            self._file.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def _send(request, socket_path):
+    """Send a single request to the daemon"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        return json.loads(sock.makefile("rb").readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm browser pool shared across pytest invocations")
+    parser.add_argument("--socket", default=config.WARM_POOL_SOCKET, help="Unix socket path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    start_parser = subparsers.add_parser("start", help="Run the pool daemon (foreground)")
+    start_parser.add_argument("--size", type=int, default=config.WARM_POOL_SIZE, help="Number of warm browsers")
+    display = start_parser.add_mutually_exclusive_group()
+    display.add_argument("--headless", dest="headless", action="store_true", default=config.HEADLESS,
+                         help="Launch headless browsers (default: HEADLESS)")
+    display.add_argument("--headed", dest="headless", action="store_false", help="Launch visible browsers")
+    subparsers.add_parser("status", help="Show pool status")
+    subparsers.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        serve(args.size, args.headless, args.socket)
+        return 0
+    try:
+        response = _send({"op": "status" if args.command == "status" else "shutdown"}, args.socket)
+    except OSError as e:
+        print(f"Browser pool is not running ({e})")
+        return 1
+    print(json.dumps(response, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
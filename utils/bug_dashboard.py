@@ -0,0 +1,258 @@
+"""
+Aggregated Bug Report Dashboard
+Builds a single bug_reports/index.html over all bug reports with client-side
+paging and filtering. Report summaries are appended to dashboard_data.js as they
+are generated, so existing entries are never re-rendered; a report that gains an
+occurrence is appended again and the newest entry wins.
+
+Usage:
+    python -m utils.bug_dashboard             # append reports missing from the dashboard
+    python -m utils.bug_dashboard --rebuild   # rebuild the dashboard from scratch
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+
+DATA_FILE = "dashboard_data.js"
+INDEX_FILE = "dashboard_index.txt"
+DASHBOARD_FILE = "index.html"
+MESSAGE_LIMIT = 300
+
+_DASHBOARD_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Bug Report Dashboard</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; color: #333; margin: 0; padding: 20px; background-color: #f5f5f5; }
+        h1 { color: #dc2626; margin-top: 0; }
+        .filters { display: flex; flex-wrap: wrap; gap: 10px; margin-bottom: 15px; }
+        .filters input, .filters select { padding: 6px 8px; border: 1px solid #d1d5db; border-radius: 4px; }
+        table { width: 100%; border-collapse: collapse; background: white; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        th, td { padding: 8px 10px; border-bottom: 1px solid #e5e7eb; text-align: left; vertical-align: top; }
+        th { background-color: #f9fafb; }
+        td.message { font-family: 'Courier New', monospace; font-size: 0.85em; white-space: pre-wrap; max-width: 600px; }
+        img.thumb { width: 160px; height: 90px; object-fit: cover; border: 1px solid #ddd; border-radius: 4px; }
+        .marker { display: inline-block; padding: 1px 6px; margin: 1px; border-radius: 4px; background-color: #e0e7ff; font-size: 0.8em; }
+        .pager { margin-top: 15px; display: flex; gap: 10px; align-items: center; }
+    </style>
+</head>
+<body>
+    <h1>Bug Report Dashboard</h1>
+    <div class="filters">
+        <input id="testFilter" type="search" placeholder="Filter by test or message">
+        <select id="markerFilter"><option value="">All markers</option></select>
+        <label>From <input id="dateFrom" type="date"></label>
+        <label>To <input id="dateTo" type="date"></label>
+        <select id="pageSize">
+            <option value="25">25 per page</option>
+            <option value="50" selected>50 per page</option>
+            <option value="100">100 per page</option>
+        </select>
+        <span id="matchCount"></span>
+    </div>
+    <table>
+        <thead><tr><th>Screenshot</th><th>Report</th><th>Test</th><th>Markers</th><th>Date</th><th>Failure</th></tr></thead>
+        <tbody id="rows"></tbody>
+    </table>
+    <div class="pager">
+        <button id="prevPage">Previous</button>
+        <span id="pageInfo"></span>
+        <button id="nextPage">Next</button>
+    </div>
+    <script>window.BUG_REPORTS = [];</script>
+    <script src="dashboard_data.js"></script>
+    <script>
+    (function () {
+        var latest = {};
+        window.BUG_REPORTS.forEach(function (r) { latest[r.report_id] = r; });
+        var reports = Object.keys(latest).map(function (id) { return latest[id]; }).sort(function (a, b) {
+            return a.timestamp < b.timestamp ? 1 : -1;
+        });
+        var page = 0;
+        var matches = reports;
+        var el = function (id) { return document.getElementById(id); };
+        var escape = function (text) {
+            var div = document.createElement('div');
+            div.textContent = text == null ? '' : String(text);
+            return div.innerHTML;
+        };
+
+        var markers = {};
+        reports.forEach(function (r) { (r.markers || []).forEach(function (m) { markers[m] = true; }); });
+        Object.keys(markers).sort().forEach(function (m) {
+            var option = document.createElement('option');
+            option.value = m;
+            option.textContent = m;
+            el('markerFilter').appendChild(option);
+        });
+
+        function applyFilters() {
+            var text = el('testFilter').value.toLowerCase();
+            var marker = el('markerFilter').value;
+            var from = el('dateFrom').value;
+            var to = el('dateTo').value;
+            matches = reports.filter(function (r) {
+                if (text && (r.test_name + ' ' + r.message).toLowerCase().indexOf(text) === -1) { return false; }
+                if (marker && (r.markers || []).indexOf(marker) === -1) { return false; }
+                if (from && r.date < from) { return false; }
+                if (to && r.date > to) { return false; }
+                return true;
+            });
+            page = 0;
+            render();
+        }
+
+        function render() {
+            var size = parseInt(el('pageSize').value, 10);
+            var pages = Math.max(1, Math.ceil(matches.length / size));
+            page = Math.min(page, pages - 1);
+            var rows = matches.slice(page * size, (page + 1) * size).map(function (r) {
+                var thumb = r.screenshot
+                    ? '<a href="' + escape(r.screenshot) + '"><img class="thumb" loading="lazy" src="' + escape(r.screenshot) + '" alt="screenshot"></a>'
+                    : '';
+                var tags = (r.markers || []).map(function (m) { return '<span class="marker">' + escape(m) + '</span>'; }).join('');
+                return '<tr><td>' + thumb + '</td>'
+                    + '<td><a href="' + escape(r.link) + '">' + escape(r.report_id) + '</a>'
+                    + (r.occurrences > 1 ? ' &times;' + r.occurrences : '') + '</td>'
+                    + '<td><code>' + escape(r.test_name) + '</code></td>'
+                    + '<td>' + tags + '</td>'
+                    + '<td>' + escape(r.timestamp.replace('T', ' ').slice(0, 19)) + '</td>'
+                    + '<td class="message">' + escape(r.message) + '</td></tr>';
+            });
+            el('rows').innerHTML = rows.join('');
+            el('pageInfo').textContent = 'Page ' + (page + 1) + ' of ' + pages;
+            el('matchCount').textContent = matches.length + ' of ' + reports.length + ' reports';
+            el('prevPage').disabled = page === 0;
+            el('nextPage').disabled = page >= pages - 1;
+        }
+
+        ['testFilter', 'markerFilter', 'dateFrom', 'dateTo', 'pageSize'].forEach(function (id) {
+            el(id).addEventListener('input', applyFilters);
+        });
+        el('prevPage').addEventListener('click', function () { page--; render(); });
+        el('nextPage').addEventListener('click', function () { page++; render(); });
+        applyFilters();
+    })();
+    </script>
+</body>
+</html>
+"""
+
+
+class BugDashboard:
+    """Incrementally maintained dashboard over all bug reports in a directory"""
+
+    def __init__(self, report_dir="bug_reports"):
+        self.report_dir = Path(report_dir)
+        self.report_dir.mkdir(exist_ok=True)
+        self.data_path = self.report_dir / DATA_FILE
+        self.index_path = self.report_dir / INDEX_FILE
+        self.dashboard_path = self.report_dir / DASHBOARD_FILE
+
+    def add_report(self, report_data):
+        """Append a single report to the dashboard if it is not already listed"""
+        if report_data["report_id"] in self._indexed_ids():
+            return False
+        self._write_shell()
+        self._append([report_data])
+        return True
+
+    def update_report(self, report_data):
+        """Append the new summary of a report that is already listed (e.g. with a new occurrence)"""
+        if report_data["report_id"] not in self._indexed_ids():
+            return self.add_report(report_data)
+        self._write_shell()
+        self._append([report_data], index=False)
+        return True
+
+    def update(self):
+        """Append every report in the directory that is missing from the dashboard"""
+        indexed = self._indexed_ids()
+        new_reports = []
+        for path in sorted(self.report_dir.glob("BUG_*.json")):
+            if path.stem in indexed:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    new_reports.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        self._write_shell()
+        self._append(new_reports)
+        return len(new_reports)
+
+    def rebuild(self):
+        """Drop the dashboard data and rebuild it from all reports"""
+        for path in (self.data_path, self.index_path, self.dashboard_path):
+            if path.exists():
+                path.unlink()
+        return self.update()
+
+    def _indexed_ids(self):
+        """Get the ids of reports already in the dashboard"""
+        if not self.index_path.exists():
+            return set()
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def _write_shell(self):
+        """Write the static dashboard page once"""
+        if not self.dashboard_path.exists():
+            with open(self.dashboard_path, 'w', encoding='utf-8') as f:
+                f.write(_DASHBOARD_HTML)
+
+    def _append(self, reports, index=True):
+        """Append report summaries to the data file and the index"""
+        if not reports:
+            return
+        lines = []
+        for report_data in reports:
+            entry = json.dumps(self._summarize(report_data), ensure_ascii=False).replace("</", "<\\/")
+            lines.append(f"window.BUG_REPORTS.push({entry});\n")
+        # One write per file keeps appends from parallel workers from interleaving
+        with open(self.data_path, 'a', encoding='utf-8') as f:
+            f.write("".join(lines))
+        if not index:
+            return
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write("".join(f"{r['report_id']}\n" for r in reports))
+
+    def _summarize(self, report_data):
+        """Reduce a report to the fields shown on the dashboard"""
+        report_id = report_data["report_id"]
+        message = str(report_data.get("failure_message") or "").strip()
+        screenshot = report_data.get("screenshot")
+        if screenshot:
+            screenshot = screenshot.replace("\\", "/")
+            screenshot = os.path.relpath(os.path.abspath(screenshot), self.report_dir.resolve()).replace(os.sep, "/")
+        timestamp = report_data.get("timestamp") or ""
+        return {
+            "report_id": report_id,
+            "test_name": report_data.get("test_name", ""),
+            "timestamp": timestamp,
+            "date": timestamp[:10],
+            "markers": report_data.get("markers") or [],
+            "occurrences": len(report_data.get("occurrences") or []) or 1,
+            "message": message[:MESSAGE_LIMIT],
+            "screenshot": screenshot,
+            "link": f"{report_id}.html" if (self.report_dir / f"{report_id}.html").exists() else f"{report_id}.json"
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the aggregated bug report dashboard")
+    parser.add_argument("--report-dir", default="bug_reports", help="Directory containing BUG_*.json reports")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the dashboard from scratch")
+    args = parser.parse_args(argv)
+
+    dashboard = BugDashboard(args.report_dir)
+    added = dashboard.rebuild() if args.rebuild else dashboard.update()
+    print(f"Dashboard: {dashboard.dashboard_path} ({added} report(s) added)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,160 +1,166 @@
 """
 Bug Report Generator for Test Failures
 Automatically generates detailed bug reports when tests fail
+
+JSON is the canonical format. Markdown and HTML can be rendered at failure time
+or later from the JSON:
+    python -m utils.bug_report render BUG_20251123_140537
+    python -m utils.bug_report render --all --format html
+
+Failures are grouped by a signature (exception type, assertion location, locator
+and the message with numbers and ids removed). A failure whose signature already
+has a report is added to it as an occurrence instead of getting new files.
 """
+import argparse
+import hashlib
 import os
 import json
+import re
+import time
 from datetime import datetime
 from pathlib import Path
+from string import Template
+from utils.bug_dashboard import BugDashboard
 
 
-class BugReportGenerator:
-    """Generate bug reports for failed tests"""
-    
-    def __init__(self, report_dir="bug_reports"):
-        self.report_dir = Path(report_dir)
-        self.report_dir.mkdir(exist_ok=True)
+ALL_FORMATS = ("json", "md", "html")
+
+# Formats written at failure time (JSON is always written)
+DEFAULT_FORMATS = tuple(
+    fmt.strip() for fmt in os.getenv("BUG_REPORT_FORMATS", ",".join(ALL_FORMATS)).split(",") if fmt.strip()
+)
+
+# Record repeat failures as occurrences of one report (BUG_REPORT_DEDUPE=false writes a report per failure)
+DEDUPE = os.getenv("BUG_REPORT_DEDUPE", "true").lower() == "true"
+# A signature not seen for this many seconds gets a new report
+DEDUPE_WINDOW = int(os.getenv("BUG_REPORT_DEDUPE_WINDOW", "86400"))
+SIGNATURE_INDEX = "signatures.json"
+
+try:
+    import fcntl
+except ImportError:  # Windows: parallel workers may both report a new signature
+    fcntl = None
+
+# "E   selenium.common.exceptions.TimeoutException: Message: ..." lines of a pytest failure
+_EXCEPTION_LINE = re.compile(r"^([A-Za-z_][\w.]*(?:Error|Exception|Failed|Exit|Interrupt))(?::\s*(.*))?$")
+# "tests/test_home.py:42: AssertionError" (long) or "tests/test_home.py:42: in test_tc1" (short)
+_LOCATION = re.compile(r"^(\S+?\.py):(\d+): ", re.M)
+_SELENIUM_DOCS = re.compile(r";?\s*For documentation on this error.*$")
+_LOCATORS = (
+    re.compile(r"Element not found: (.+?)(?:; For documentation|\s*$)", re.M),
+    re.compile(r'"selector":\s*"(.+?)"'),
+)
+_VOLATILE = (
+    (re.compile(r"0x[0-9a-fA-F]+|\b[0-9a-fA-F]{16,}\b"), "<id>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def failure_signature(failure_message, test_name=None):
+    """
+    Normalize a failure into a signature
     
-    def generate_report(self, test_name, failure_message, screenshot_path=None, 
-                       test_steps=None, expected_result=None, actual_result=None,
-                       environment_info=None, additional_info=None):
-        """
-        Generate a bug report for a failed test
-        
-        Args:
-            test_name: Name of the failed test
-            failure_message: Error message from the test
-            screenshot_path: Path to screenshot (if available)
-            test_steps: List of test steps
-            expected_result: Expected result
-            actual_result: Actual result
-            environment_info: Environment details
-            additional_info: Any additional information
-        """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_id = f"BUG_{timestamp}"
-        
-        # Create report data
-        report_data = {
-            "report_id": report_id,
-            "timestamp": datetime.now().isoformat(),
-            "test_name": test_name,
-            "status": "FAILED",
-            "failure_message": str(failure_message),
-            "screenshot": screenshot_path if screenshot_path and os.path.exists(screenshot_path) else None,
-            "test_steps": test_steps or [],
-            "expected_result": expected_result or "N/A",
-            "actual_result": actual_result or "N/A",
-            "environment": environment_info or self._get_default_environment(),
-            "additional_info": additional_info or {}
-        }
-        
-        # Generate reports in multiple formats
-        self._generate_json_report(report_id, report_data)
-        self._generate_markdown_report(report_id, report_data)
-        self._generate_html_report(report_id, report_data)
-        
-        return report_id, report_data
+    Returns a dict with the exception type, assertion location, locator, cleaned
+    message and an id hashed from them.
+    """
+    text = str(failure_message or "")
+    error_lines = [line[1:].strip() for line in text.splitlines() if line.startswith("E ")]
+    first = error_lines[0] if error_lines else (text.strip().splitlines() or [""])[0]
+    exception, message = "", first
+    match = _EXCEPTION_LINE.match(first)
+    if match:
+        exception, message = match.group(1).rsplit(".", 1)[-1], match.group(2) or ""
+    elif first.startswith("assert "):
+        exception = "AssertionError"
+    message = _SELENIUM_DOCS.sub("", message.replace("Message: ", "", 1))
     
-    def _get_default_environment(self):
-        """Get default environment information"""
-        import platform
-        import sys
-        
-        return {
-            "platform": platform.platform(),
-            "python_version": sys.version,
-            "browser": "Chrome",
-            "base_url": os.getenv("BASE_URL", "https://muntasir101.github.io/stylezone")
-        }
+    # The deepest frame in a test file is where the assertion or failing call is
+    locations = _LOCATION.findall(text)
+    in_tests = [loc for loc in locations if os.path.basename(loc[0]).startswith("test_")]
+    location = ":".join((in_tests or locations or [("", "")])[-1]).strip(":").replace("\\", "/")
     
-    def _generate_json_report(self, report_id, report_data):
-        """Generate JSON format bug report"""
-        json_path = self.report_dir / f"{report_id}.json"
-        # Convert Path objects to strings for JSON serialization
-        serializable_data = self._make_json_serializable(report_data)
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(serializable_data, f, indent=2, ensure_ascii=False)
+    errors = "\n".join(error_lines) or text
+    locator = next((m.group(1) for pattern in _LOCATORS for m in [pattern.search(errors)] if m), "")
     
-    def _make_json_serializable(self, obj):
-        """Convert objects to JSON-serializable format"""
-        if isinstance(obj, dict):
-            return {key: self._make_json_serializable(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_json_serializable(item) for item in obj]
-        elif hasattr(obj, '__str__') and not isinstance(obj, (str, int, float, bool, type(None))):
-            return str(obj)
-        return obj
+    # Parametrize ids, numbers and hex ids differ between otherwise identical failures
+    if test_name and "[" in test_name:
+        for param in test_name[test_name.index("[") + 1:].rstrip("]").split("-"):
+            message = re.sub(rf"(?<![\w-]){re.escape(param)}(?![\w-])", "<param>", message)
+    for pattern, replacement in _VOLATILE:
+        message = pattern.sub(replacement, message)
+    message = message.strip()[:200]
     
-    def _generate_markdown_report(self, report_id, report_data):
-        """Generate Markdown format bug report"""
-        md_path = self.report_dir / f"{report_id}.md"
-        
-        md_content = f"""# Bug Report: {report_data['test_name']}
+    key = "\n".join((exception, location, locator, message))
+    return {
+        "id": hashlib.sha1(key.encode("utf-8")).hexdigest()[:12],
+        "exception": exception,
+        "location": location,
+        "locator": locator,
+        "message": message
+    }
+
+
+def _read_index(report_dir):
+    try:
+        with open(Path(report_dir) / SIGNATURE_INDEX, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def find_report(failure_message, test_name=None, report_dir="bug_reports", window=None):
+    """Report ID of the open report with this failure's signature, or None"""
+    window = DEDUPE_WINDOW if window is None else window
+    entry = _read_index(report_dir).get(failure_signature(failure_message, test_name)["id"])
+    if not entry or time.time() - entry["last_seen"] > window:
+        return None
+    if not (Path(report_dir) / f"{entry['report_id']}.json").exists():
+        return None
+    return entry["report_id"]
+
+# Templates are compiled once per process and shared by every render
+_MARKDOWN_TEMPLATE = Template("""# Bug Report: ${test_name}
 
-**Report ID:** {report_id}  
-**Date:** {report_data['timestamp']}  
-**Status:** {report_data['status']}
+**Report ID:** ${report_id}  
+**Date:** ${timestamp}  
+**Status:** ${status}
 
 ---
 
 ## Test Information
 
-**Test Name:** `{report_data['test_name']}`
+**Test Name:** `${test_name}`
 
-**Failure Message:**
+${occurrences_md}**Failure Message:**
 ```
-{report_data['failure_message']}
+${failure_message}
 ```
 
 ---
 
 ## Test Steps
 
-"""
-        if report_data['test_steps']:
-            for i, step in enumerate(report_data['test_steps'], 1):
-                md_content += f"{i}. {step}\n"
-        else:
-            md_content += "No steps provided.\n"
-        
-        md_content += f"""
+${steps_md}
 ---
 
 ## Expected vs Actual Results
 
 **Expected Result:**
-{report_data['expected_result']}
+${expected_result}
 
 **Actual Result:**
-{report_data['actual_result']}
+${actual_result}
 
 ---
 
 ## Screenshot
 
-"""
-        if report_data['screenshot']:
-            screenshot_name = os.path.basename(report_data['screenshot'])
-            md_content += f"![Screenshot]({report_data['screenshot']})\n\n"
-            md_content += f"**Screenshot Path:** `{report_data['screenshot']}`\n\n"
-        else:
-            md_content += "No screenshot available.\n\n"
-        
-        md_content += f"""---
+${screenshot_md}${visual_md}---
 
 ## Environment Information
 
-"""
-        for key, value in report_data['environment'].items():
-            md_content += f"- **{key.replace('_', ' ').title()}:** {value}\n"
-        
-        if report_data['additional_info']:
-            md_content += "\n---\n\n## Additional Information\n\n"
-            for key, value in report_data['additional_info'].items():
-                md_content += f"- **{key}:** {value}\n"
-        
-        md_content += f"""
+${environment_md}${additional_md}
 ---
 
 ## Reproduction Steps
@@ -166,47 +172,17 @@ class BugReportGenerator:
 ---
 
 **Generated by:** StyleZone Test Automation Framework  
-**Report Location:** `{md_path}`
-"""
-        
-        with open(md_path, 'w', encoding='utf-8') as f:
-            f.write(md_content)
-    
-    def _generate_html_report(self, report_id, report_data):
-        """Generate HTML format bug report"""
-        html_path = self.report_dir / f"{report_id}.html"
-        
-        screenshot_html = ""
-        if report_data['screenshot'] and os.path.exists(report_data['screenshot']):
-            screenshot_html = f"""
-            <div class="screenshot">
-                <h3>Screenshot</h3>
-                <img src="{os.path.abspath(report_data['screenshot'])}" alt="Test Failure Screenshot" style="max-width: 100%; border: 1px solid #ddd; border-radius: 4px;">
-                <p><strong>Screenshot Path:</strong> <code>{report_data['screenshot']}</code></p>
-            </div>
-            """
-        
-        steps_html = ""
-        if report_data['test_steps']:
-            steps_html = "<ol>"
-            for step in report_data['test_steps']:
-                steps_html += f"<li>{step}</li>"
-            steps_html += "</ol>"
-        else:
-            steps_html = "<p>No steps provided.</p>"
-        
-        env_html = ""
-        for key, value in report_data['environment'].items():
-            env_html += f"<tr><td><strong>{key.replace('_', ' ').title()}</strong></td><td>{value}</td></tr>"
-        
-        html_content = f"""<!DOCTYPE html>
+**Report Location:** `${md_path}`
+""")
+
+_HTML_TEMPLATE = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Bug Report: {report_data['test_name']}</title>
+    <title>Bug Report: ${test_name}</title>
     <style>
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             line-height: 1.6;
             color: #333;
@@ -214,136 +190,411 @@ class BugReportGenerator:
             margin: 0 auto;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             background: white;
             padding: 30px;
             border-radius: 8px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        h1 {{
+        }
+        h1 {
             color: #dc2626;
             border-bottom: 3px solid #dc2626;
             padding-bottom: 10px;
-        }}
-        h2 {{
+        }
+        h2 {
             color: #1f2937;
             margin-top: 30px;
             border-bottom: 2px solid #e5e7eb;
             padding-bottom: 5px;
-        }}
-        .badge {{
+        }
+        .badge {
             display: inline-block;
             padding: 4px 12px;
             border-radius: 4px;
             font-size: 14px;
             font-weight: bold;
-        }}
-        .badge-failed {{
+        }
+        .badge-failed {
             background-color: #fee2e2;
             color: #991b1b;
-        }}
-        .info-box {{
+        }
+        .info-box {
             background-color: #f9fafb;
             border-left: 4px solid #3b82f6;
             padding: 15px;
             margin: 15px 0;
-        }}
-        .error-box {{
+        }
+        .error-box {
             background-color: #fef2f2;
             border-left: 4px solid #dc2626;
             padding: 15px;
             margin: 15px 0;
             font-family: 'Courier New', monospace;
             white-space: pre-wrap;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 15px 0;
-        }}
-        table td {{
+        }
+        table td {
             padding: 10px;
             border-bottom: 1px solid #e5e7eb;
-        }}
-        table td:first-child {{
+        }
+        table td:first-child {
             width: 200px;
             font-weight: 600;
-        }}
-        code {{
+        }
+        code {
             background-color: #f3f4f6;
             padding: 2px 6px;
             border-radius: 3px;
             font-family: 'Courier New', monospace;
             font-size: 0.9em;
-        }}
-        .screenshot img {{
+        }
+        .screenshot img {
             max-width: 100%;
             border: 1px solid #ddd;
             border-radius: 4px;
             margin: 10px 0;
-        }}
-        ol, ul {{
+        }
+        ol, ul {
             margin: 10px 0;
             padding-left: 30px;
-        }}
-        .footer {{
+        }
+        .footer {
             margin-top: 40px;
             padding-top: 20px;
             border-top: 1px solid #e5e7eb;
             color: #6b7280;
             font-size: 0.9em;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
-        <h1>🐛 Bug Report: {report_data['test_name']}</h1>
+        <h1>🐛 Bug Report: ${test_name}</h1>
         
         <div class="info-box">
-            <p><strong>Report ID:</strong> {report_id}</p>
-            <p><strong>Date:</strong> {report_data['timestamp']}</p>
+            <p><strong>Report ID:</strong> ${report_id}</p>
+            <p><strong>Date:</strong> ${timestamp}</p>
             <p><strong>Status:</strong> <span class="badge badge-failed">FAILED</span></p>
         </div>
         
         <h2>Test Information</h2>
         <div class="info-box">
-            <p><strong>Test Name:</strong> <code>{report_data['test_name']}</code></p>
+            <p><strong>Test Name:</strong> <code>${test_name}</code></p>
         </div>
+        ${occurrences_html}
         
         <h2>Failure Message</h2>
-        <div class="error-box">{report_data['failure_message']}</div>
+        <div class="error-box">${failure_message}</div>
         
         <h2>Test Steps</h2>
-        {steps_html}
+        ${steps_html}
         
         <h2>Expected vs Actual Results</h2>
         <table>
             <tr>
                 <td>Expected Result</td>
-                <td>{report_data['expected_result']}</td>
+                <td>${expected_result}</td>
             </tr>
             <tr>
                 <td>Actual Result</td>
-                <td>{report_data['actual_result']}</td>
+                <td>${actual_result}</td>
             </tr>
         </table>
         
-        {screenshot_html}
+        ${screenshot_html}${visual_html}
         
         <h2>Environment Information</h2>
         <table>
-            {env_html}
+            ${env_html}
         </table>
         
         <div class="footer">
             <p><strong>Generated by:</strong> StyleZone Test Automation Framework</p>
-            <p><strong>Report Location:</strong> <code>{html_path}</code></p>
+            <p><strong>Report Location:</strong> <code>${html_path}</code></p>
         </div>
     </div>
 </body>
 </html>
-"""
+""")
+
+
+class BugReportGenerator:
+    """Generate bug reports for failed tests"""
+    
+    def __init__(self, report_dir="bug_reports", formats=None, dedupe=None):
+        self.report_dir = Path(report_dir)
+        self.report_dir.mkdir(exist_ok=True)
+        self.formats = tuple(formats or DEFAULT_FORMATS)
+        self.dedupe = DEDUPE if dedupe is None else dedupe
+        unknown = set(self.formats) - set(ALL_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown bug report format(s): {', '.join(sorted(unknown))}")
+    
+    def generate_report(self, test_name, failure_message, screenshot_path=None, 
+                       test_steps=None, expected_result=None, actual_result=None,
+                       environment_info=None, additional_info=None, markers=None, visual_diffs=None):
+        """
+        Generate a bug report for a failed test
+        
+        Args:
+            test_name: Name of the failed test
+            failure_message: Error message from the test
+            screenshot_path: Path to screenshot (if available)
+            test_steps: List of test steps
+            expected_result: Expected result
+            actual_result: Actual result
+            environment_info: Environment details
+            additional_info: Any additional information
+            markers: Pytest markers of the failed test
+            visual_diffs: Visual states that differ from their baselines (with heatmaps)
+        
+        If a report with the same failure signature exists, the failure is added to it
+        as an occurrence and that report's ID and data are returned.
+        """
+        signature = failure_signature(failure_message, test_name)
+        occurrence = {
+            "test_name": test_name,
+            "timestamp": datetime.now().isoformat(),
+            "screenshot": screenshot_path if screenshot_path and os.path.exists(screenshot_path) else None
+        }
+        if not self.dedupe:
+            return self._new_report(signature, occurrence, failure_message, test_steps, expected_result,
+                                    actual_result, environment_info, additional_info, markers, visual_diffs)
+        
+        # The index lock keeps parallel workers from opening two reports for one signature
+        with open(self.report_dir / f"{SIGNATURE_INDEX}.lock", 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            report_id = find_report(failure_message, test_name, self.report_dir)
+            if report_id:
+                report_data = self.add_occurrence(report_id, occurrence)
+            else:
+                report_id, report_data = self._new_report(
+                    signature, occurrence, failure_message, test_steps, expected_result, actual_result,
+                    environment_info, additional_info, markers, visual_diffs)
+            index = _read_index(self.report_dir)
+            index[signature["id"]] = {"report_id": report_id, "last_seen": time.time()}
+            tmp_path = self.report_dir / f"{SIGNATURE_INDEX}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_path, self.report_dir / SIGNATURE_INDEX)
+        return report_id, report_data
+    
+    def find_report(self, failure_message, test_name=None):
+        """Report ID of the report a failure would be added to, or None"""
+        return find_report(failure_message, test_name, self.report_dir) if self.dedupe else None
+    
+    def add_occurrence(self, report_id, occurrence):
+        """Add an occurrence to an existing report and re-render it"""
+        json_path = self.report_dir / f"{report_id}.json"
+        with open(json_path, 'r', encoding='utf-8') as f:
+            report_data = json.load(f)
+        report_data.setdefault("occurrences", []).append(self._make_json_serializable(occurrence))
+        self._generate_json_report(report_id, report_data)
+        self._render_formats(report_id, report_data, self.formats)
+        BugDashboard(self.report_dir).update_report(report_data)
+        return report_data
+    
+    def _new_report(self, signature, occurrence, failure_message, test_steps, expected_result, actual_result,
+                    environment_info, additional_info, markers, visual_diffs):
+        """Write a new report for a failure signature"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_id = f"BUG_{timestamp}"
+        # Several signatures can fail within one second
+        suffix = 1
+        while (self.report_dir / f"{report_id}.json").exists():
+            suffix += 1
+            report_id = f"BUG_{timestamp}_{suffix}"
+        
+        # Create report data
+        report_data = {
+            "report_id": report_id,
+            "timestamp": occurrence["timestamp"],
+            "test_name": occurrence["test_name"],
+            "status": "FAILED",
+            "failure_message": str(failure_message),
+            "screenshot": occurrence["screenshot"],
+            "test_steps": test_steps or [],
+            "expected_result": expected_result or "N/A",
+            "actual_result": actual_result or "N/A",
+            "environment": environment_info or self._get_default_environment(),
+            "additional_info": additional_info or {},
+            "markers": sorted(markers) if markers else [],
+            "visual_diffs": visual_diffs or [],
+            "signature": signature,
+            "occurrences": [occurrence]
+        }
+        
+        # JSON is always written; other formats can be rendered later with render_report
+        self._generate_json_report(report_id, report_data)
+        self._render_formats(report_id, report_data, self.formats)
+        
+        # Append to the aggregated dashboard (bug_reports/index.html)
+        BugDashboard(self.report_dir).add_report(self._make_json_serializable(report_data))
+        
+        return report_id, report_data
+    
+    def _get_default_environment(self):
+        """Get default environment information"""
+        import platform
+        import sys
+        
+        return {
+            "platform": platform.platform(),
+            "python_version": sys.version,
+            "browser": "Chrome",
+            "base_url": os.getenv("BASE_URL", "https://muntasir101.github.io/stylezone")
+        }
+    
+    def _generate_json_report(self, report_id, report_data):
+        """Generate JSON format bug report"""
+        json_path = self.report_dir / f"{report_id}.json"
+        # Convert Path objects to strings for JSON serialization
+        serializable_data = self._make_json_serializable(report_data)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(serializable_data, f, indent=2, ensure_ascii=False)
+    
+    def _make_json_serializable(self, obj):
+        """Convert objects to JSON-serializable format"""
+        if isinstance(obj, dict):
+            return {key: self._make_json_serializable(value) for key, value in obj.items()}
+        elif isinstance(obj, list):
+            return [self._make_json_serializable(item) for item in obj]
+        elif hasattr(obj, '__str__') and not isinstance(obj, (str, int, float, bool, type(None))):
+            return str(obj)
+        return obj
+    
+    def _render_formats(self, report_id, report_data, formats):
+        """Render the requested non-JSON formats"""
+        if "md" in formats:
+            self._generate_markdown_report(report_id, report_data)
+        if "html" in formats:
+            self._generate_html_report(report_id, report_data)
+    
+    def _generate_markdown_report(self, report_id, report_data):
+        """Generate Markdown format bug report"""
+        md_path = self.report_dir / f"{report_id}.md"
+        
+        if report_data['test_steps']:
+            steps_md = "".join(f"{i}. {step}\n" for i, step in enumerate(report_data['test_steps'], 1))
+        else:
+            steps_md = "No steps provided.\n"
+        
+        if report_data['screenshot']:
+            screenshot_md = f"![Screenshot]({report_data['screenshot']})\n\n"
+            screenshot_md += f"**Screenshot Path:** `{report_data['screenshot']}`\n\n"
+        else:
+            screenshot_md = "No screenshot available.\n\n"
+        
+        visual_md = ""
+        for diff in report_data.get('visual_diffs') or []:
+            if diff.get('status') == "size_mismatch":
+                visual_md += (f"**Visual diff:** `{diff['name']}` (size changed from {diff.get('baseline_size')} "
+                              f"to {diff.get('actual_size')})\n\n")
+            else:
+                visual_md += f"**Visual diff:** `{diff['name']}` ({diff['diff_ratio']:.2%} of pixels)\n\n"
+            if diff.get('heatmap'):
+                visual_md += f"![Heatmap]({diff['heatmap']})\n\n"
+        
+        environment_md = ""
+        for key, value in report_data['environment'].items():
+            environment_md += f"- **{key.replace('_', ' ').title()}:** {value}\n"
+        
+        occurrences = report_data.get('occurrences') or []
+        occurrences_md = ""
+        if len(occurrences) > 1:
+            occurrences_md = f"**Occurrences:** {len(occurrences)}\n\n"
+            occurrences_md += "".join(f"- `{o['test_name']}` at {o['timestamp']}\n" for o in occurrences) + "\n"
+        
+        additional_md = ""
+        if report_data['additional_info']:
+            additional_md = "\n---\n\n## Additional Information\n\n"
+            for key, value in report_data['additional_info'].items():
+                additional_md += f"- **{key}:** {value}\n"
+        
+        md_content = _MARKDOWN_TEMPLATE.substitute(
+            report_data,
+            report_id=report_id,
+            steps_md=steps_md,
+            screenshot_md=screenshot_md,
+            visual_md=visual_md,
+            occurrences_md=occurrences_md,
+            environment_md=environment_md,
+            additional_md=additional_md,
+            md_path=md_path
+        )
+        
+        with open(md_path, 'w', encoding='utf-8') as f:
+            f.write(md_content)
+    
+    def _generate_html_report(self, report_id, report_data):
+        """Generate HTML format bug report"""
+        html_path = self.report_dir / f"{report_id}.html"
+        
+        screenshot_html = ""
+        if report_data['screenshot'] and os.path.exists(report_data['screenshot']):
+            screenshot_html = f"""
+            <div class="screenshot">
+                <h3>Screenshot</h3>
+                <img src="{os.path.abspath(report_data['screenshot'])}" alt="Test Failure Screenshot" style="max-width: 100%; border: 1px solid #ddd; border-radius: 4px;">
+                <p><strong>Screenshot Path:</strong> <code>{report_data['screenshot']}</code></p>
+            </div>
+            """
+        
+        visual_html = ""
+        for diff in report_data.get('visual_diffs') or []:
+            heatmap = ""
+            if diff.get('heatmap') and os.path.exists(diff['heatmap']):
+                heatmap = f'<img src="{os.path.abspath(diff["heatmap"])}" alt="Visual Diff Heatmap" style="max-width: 100%; border: 1px solid #ddd; border-radius: 4px;">'
+            if diff.get('status') == "size_mismatch":
+                changed = f"size from {diff.get('baseline_size')} to {diff.get('actual_size')}"
+            else:
+                changed = f"{diff['diff_ratio']:.2%} of pixels in {diff['changed_tiles']}/{diff['total_tiles']} tiles"
+            visual_html += f"""
+            <div class="screenshot">
+                <h3>Visual Diff: {diff['name']}</h3>
+                {heatmap}
+                <p><strong>Changed:</strong> {changed}
+                (baseline <code>{diff['baseline']}</code>, actual <code>{diff['actual']}</code>)</p>
+            </div>
+            """
+        
+        steps_html = ""
+        if report_data['test_steps']:
+            steps_html = "<ol>"
+            for step in report_data['test_steps']:
+                steps_html += f"<li>{step}</li>"
+            steps_html += "</ol>"
+        else:
+            steps_html = "<p>No steps provided.</p>"
+        
+        occurrences = report_data.get('occurrences') or []
+        occurrences_html = ""
+        if len(occurrences) > 1:
+            occurrences_html = f"<h2>Occurrences ({len(occurrences)})</h2><table>"
+            for o in occurrences:
+                occurrences_html += f"<tr><td><code>{o['test_name']}</code></td><td>{o['timestamp']}</td></tr>"
+            occurrences_html += "</table>"
+        
+        env_html = ""
+        for key, value in report_data['environment'].items():
+            env_html += f"<tr><td><strong>{key.replace('_', ' ').title()}</strong></td><td>{value}</td></tr>"
+        
+        html_content = _HTML_TEMPLATE.substitute(
+            report_data,
+            report_id=report_id,
+            steps_html=steps_html,
+            screenshot_html=screenshot_html,
+            visual_html=visual_html,
+            occurrences_html=occurrences_html,
+            env_html=env_html,
+            html_path=html_path
+        )
         
         with open(html_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
@@ -358,3 +609,63 @@ class BugReportGenerator:
         with open(latest, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    
+    def render_report(self, report_id, formats=("md", "html")):
+        """
+        Render Markdown/HTML for an existing report from its canonical JSON
+        
+        Args:
+            report_id: Report ID (e.g. BUG_20251123_140537) or path to its JSON file
+            formats: Formats to render ("md", "html")
+        """
+        json_path = Path(report_id)
+        if json_path.suffix != ".json":
+            json_path = self.report_dir / f"{report_id}.json"
+        with open(json_path, 'r', encoding='utf-8') as f:
+            report_data = json.load(f)
+        self._render_formats(report_data['report_id'], report_data, formats)
+        if "html" in formats:
+            # Point the dashboard row at the HTML report instead of the raw JSON
+            BugDashboard(self.report_dir).update_report(report_data)
+        return report_data['report_id']
+    
+    def render_all(self, formats=("md", "html"), force=False):
+        """Render every report that is missing one of the requested formats"""
+        rendered = []
+        for json_path in sorted(self.report_dir.glob("BUG_*.json")):
+            missing = [fmt for fmt in formats
+                       if force or not (self.report_dir / f"{json_path.stem}.{fmt}").exists()]
+            if not missing:
+                continue
+            try:
+                rendered.append(self.render_report(json_path, missing))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Could not render {json_path.name}: {e}")
+        return rendered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render bug reports from their JSON files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    render = subparsers.add_parser("render", help="Render Markdown/HTML from JSON reports")
+    render.add_argument("report_ids", nargs="*", help="Report IDs or JSON paths to render")
+    render.add_argument("--all", action="store_true", help="Render every report missing a format")
+    render.add_argument("--force", action="store_true", help="Re-render formats that already exist")
+    render.add_argument("--format", dest="formats", action="append", choices=["md", "html"],
+                        help="Format to render (repeatable, default: md and html)")
+    render.add_argument("--report-dir", default="bug_reports", help="Directory containing BUG_*.json reports")
+    args = parser.parse_args(argv)
+    
+    formats = tuple(args.formats or ("md", "html"))
+    generator = BugReportGenerator(args.report_dir, formats=("json",))
+    if args.all:
+        rendered = generator.render_all(formats, force=args.force)
+    else:
+        rendered = [generator.render_report(report_id, formats) for report_id in args.report_ids]
+    for report_id in rendered:
+        print(f"Rendered {report_id}: {', '.join(formats)}")
+    print(f"{len(rendered)} report(s) rendered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Cart Seeding
+Puts items straight into the cart of the local stand-in shop (a JSON list under
+localStorage[CART_STORAGE_KEY]) so large-cart tests can start at checkout.html with
+N items instead of clicking .add-to-cart N times. One script call seeds any number
+of items.
+
+The schema is the stand-in's, built from the synthetic catalog; it is not verified
+against the live app. On the live site, build carts through
+ProductPage.add_products_to_cart or the "cart_3_items" storage state.
+"""
+import config
+from utils.catalog import generate_catalog
+
+
+# Fields copied from a product into its cart entry (the app keys entries on id)
+CART_ITEM_FIELDS = ("id", "name", "price", "image")
+
+_SEED_CART_SCRIPT = """
+localStorage.setItem(arguments[0], JSON.stringify(arguments[1]));
+return JSON.parse(localStorage.getItem(arguments[0])).length;
+"""
+
+_READ_CART_SCRIPT = """
+try { return JSON.parse(localStorage.getItem(arguments[0]) || '[]'); } catch (e) { return null; }
+"""
+
+
+def build_cart(count, products=None, quantity=1):
+    """
+    Build count cart entries in the stand-in's schema ({id, name, price, image, quantity})
+
+    Args:
+        count: Number of cart lines
+        products: Product dicts to take the lines from (default: the synthetic catalog,
+                  which matches the stand-in shop's products.json)
+        quantity: Quantity of every line
+    """
+    if products is None:
+        products = generate_catalog(count)
+    if not products:
+        raise ValueError("No products to build a cart from")
+    cart = []
+    for index in range(count):
+        product = products[index % len(products)]
+        entry = {field: product[field] for field in CART_ITEM_FIELDS if field in product}
+        entry["quantity"] = quantity
+        cart.append(entry)
+    return cart
+
+
+def seed_cart(driver, items, key=None):
+    """
+    Replace the cart of the current origin with items; returns the number of stored entries
+
+    The app reads the cart when a page loads, so load (or reload) a page afterwards.
+    """
+    return driver.execute_script(_SEED_CART_SCRIPT, key or config.CART_STORAGE_KEY, list(items))
+
+
+def read_cart(driver, key=None):
+    """Read the cart of the current origin (None if it is not valid JSON)"""
+    return driver.execute_script(_READ_CART_SCRIPT, key or config.CART_STORAGE_KEY)
+
+
+def clear_cart(driver, key=None):
+    """Remove the cart of the current origin"""
+    driver.execute_script("localStorage.removeItem(arguments[0]);", key or config.CART_STORAGE_KEY)
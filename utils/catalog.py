@@ -0,0 +1,218 @@
+"""
+Synthetic Catalog and Local Stand-in Shop
+Generates large, deterministic product catalogs (names, prices, categories,
+ratings, shipping) and serves them from local stand-ins of shop.html and
+checkout.html that follow the ShopPageLocators and CheckoutPageLocators DOM
+contracts, so pagination, search, sort and large-cart checkout can be exercised
+and timed at production-like data sizes.
+
+Usage:
+    python -m utils.catalog serve --size 20000 --port 8000
+    BASE_URL=http://localhost:8000 pytest -m pagination
+
+    python -m utils.catalog bench --sizes 1000 10000 100000
+"""
+import argparse
+import functools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import config
+
+
+STANDIN_SITE_DIR = Path(__file__).resolve().parent / "standin_site"
+SCALING_REPORT = os.path.join(config.REPORT_DIR, "catalog_scaling.json")
+
+# category: (product nouns, median price, price spread)
+CATEGORIES = {
+    "Electronics": (["Laptop", "Smartphone", "Phone Case", "Headphones", "Tablet", "Smartwatch", "Monitor",
+                     "Keyboard", "Mouse", "Bluetooth Speaker", "Phone Charger", "Webcam"], 120.0, 0.9),
+    "Clothing": (["Shirt", "T-Shirt", "Polo Shirt", "Jeans", "Hoodie", "Jacket", "Dress", "Sweater",
+                  "Shorts", "Chinos"], 35.0, 0.6),
+    "Footwear": (["Running Shoes", "Sneakers", "Boots", "Sandals", "Loafers", "Trail Shoes"], 70.0, 0.5),
+    "Home & Kitchen": (["Coffee Maker", "Blender", "Cookware Set", "Desk Lamp", "Throw Pillow", "Knife Set",
+                        "Water Bottle", "Air Fryer"], 45.0, 0.8),
+    "Sports": (["Yoga Mat", "Dumbbells", "Tennis Racket", "Football", "Cycling Helmet", "Gym Bag"], 40.0, 0.7),
+    "Beauty": (["Face Cream", "Shampoo", "Perfume", "Lipstick", "Hair Dryer", "Sunscreen"], 25.0, 0.6),
+    "Books": (["Novel", "Cookbook", "Travel Guide", "Notebook", "Biography"], 18.0, 0.4)
+}
+BRANDS = ["Acme", "Nova", "Zenith", "Urban", "Peak", "Lumen", "Vertex", "Aurora", "Summit", "Coastal",
+          "Orbit", "Evergreen", "Pulse", "Granite", "Harbor", "Solace"]
+ADJECTIVES = ["Classic", "Pro", "Slim", "Premium", "Essential", "Ultra", "Compact", "Wireless", "Vintage",
+              "Sport", "Deluxe", "Eco", "Smart", "Lightweight", "Everyday"]
+COLORS = ["Black", "White", "Blue", "Red", "Grey", "Green", "Navy", "Beige"]
+
+
+def generate_catalog(size, seed=42):
+    """Generate a deterministic list of product dicts"""
+    rng = random.Random(seed)
+    categories = list(CATEGORIES)
+    # Skewed so some categories are much larger than others, like a real shop
+    weights = [30, 25, 12, 12, 9, 7, 5]
+    products = []
+    for product_id in range(1, size + 1):
+        category = rng.choices(categories, weights)[0]
+        nouns, median, spread = CATEGORIES[category]
+        parts = [rng.choice(BRANDS), rng.choice(ADJECTIVES), rng.choice(nouns)]
+        if category in ("Clothing", "Footwear") or rng.random() < 0.2:
+            parts.insert(2, rng.choice(COLORS))
+        price = max(1.0, median * rng.lognormvariate(0, spread))
+        products.append({
+            "id": product_id,
+            "name": " ".join(parts),
+            "category": category,
+            "price": round(int(price) + 0.99 if price > 5 else price, 2),
+            "rating": round(min(5.0, max(1.0, rng.gauss(4.1, 0.6))), 1),
+            "reviews": int(rng.paretovariate(1.2) * 3),
+            "shipping": rng.choices(["prime", "free", "standard"], [30, 25, 45])[0],
+            "image": f"img/product.svg?id={product_id}"
+        })
+    return products
+
+
+def build_site(size, seed=42, site_dir=None):
+    """Write the stand-in shop and a generated products.json; returns the site directory"""
+    site_dir = Path(site_dir or tempfile.mkdtemp(prefix=f"stylezone_catalog_{size}_"))
+    shutil.copytree(STANDIN_SITE_DIR, site_dir, dirs_exist_ok=True)
+    catalog = {"size": size, "seed": seed, "categories": list(CATEGORIES), "products": generate_catalog(size, seed)}
+    with open(site_dir / "products.json", 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, separators=(",", ":"))
+    return site_dir
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class StandinServer:
+    """Serve a stand-in site directory on a local port in a background thread"""
+
+    def __init__(self, site_dir, port=0):
+        handler = functools.partial(_QuietHandler, directory=str(site_dir))
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.site_dir = site_dir
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _timed(timings, name, action):
+    start = time.perf_counter()
+    result = action()
+    timings[name] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def bench_size(driver, size, seed=42, query="phone", pages=5):
+    """Time ShopPage load, search, sort and paging against a catalog of the given size"""
+    from pages.shop_page import ShopPage
+
+    site_dir = build_site(size, seed)
+    server = StandinServer(site_dir).start()
+    try:
+        page = ShopPage(driver)
+        timings = {"size": size}
+        _timed(timings, "page_load", lambda: (page.navigate_to(f"{server.base_url}/shop.html"),
+                                              page.wait_for_page_load(),
+                                              page.find_element(page.locators.PRODUCT_CARD, timeout=60)))
+        _timed(timings, "search", lambda: page.perform_search(query))
+        timings["matches"] = page.get_results_count_text()
+        _timed(timings, "sort_price_asc", lambda: page.select_sort_option("Price: Low to High"))
+        _timed(timings, "sort_name", lambda: page.select_sort_option("Name: A-Z"))
+        start = time.perf_counter()
+        for _ in range(pages):
+            page.click_next_page()
+        timings["next_page"] = round((time.perf_counter() - start) / pages, 3)
+        _timed(timings, "snapshot", page.get_results_snapshot)
+        return timings
+    finally:
+        server.stop()
+        shutil.rmtree(site_dir, ignore_errors=True)
+
+
+def format_curve(rows):
+    """Format scaling results as a table, one row per catalog size"""
+    columns = ["page_load", "search", "sort_price_asc", "sort_name", "next_page", "snapshot"]
+    lines = [f"{'size':>8}" + "".join(f"{c:>16}" for c in columns)]
+    for row in rows:
+        lines.append(f"{row['size']:>8}" + "".join(f"{row[c]:>15.3f}s" for c in columns))
+    return "\n".join(lines)
+
+
+def bench(sizes, browser=None, headless=True, seed=42):
+    """Run the scaling benchmark for each size and write reports/catalog_scaling.json"""
+    from utils.browser_factory import create_driver
+    from utils.event_session import attach_event_session
+
+    driver = create_driver(browser, headless=headless)
+    # Event-driven settling, so timings reflect the app instead of fixed sleeps
+    attach_event_session(driver)
+    try:
+        rows = [bench_size(driver, size, seed) for size in sizes]
+    finally:
+        driver.quit()
+    os.makedirs(os.path.dirname(SCALING_REPORT), exist_ok=True)
+    with open(SCALING_REPORT, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=2)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic catalog generator and local stand-in shop")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    generate_parser = subparsers.add_parser("generate", help="Write a stand-in site with a generated catalog")
+    generate_parser.add_argument("output", help="Output directory")
+    serve_parser = subparsers.add_parser("serve", help="Serve a stand-in site with a generated catalog")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    bench_parser = subparsers.add_parser("bench", help="Time ShopPage operations at several catalog sizes")
+    bench_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    bench_parser.add_argument("--browser", help="Browser to use (default: config.BROWSER)")
+    bench_parser.add_argument("--headed", action="store_true", help="Show the browser")
+    for sub in (generate_parser, serve_parser):
+        sub.add_argument("--size", type=int, default=10000, help="Number of products")
+    for sub in (generate_parser, serve_parser, bench_parser):
+        sub.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same catalog)")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        print(f"Stand-in site written to {build_site(args.size, args.seed, args.output)}")
+    elif args.command == "serve":
+        site_dir = build_site(args.size, args.seed)
+        server = StandinServer(site_dir, args.port).start()
+        print(f"Serving {args.size} products at {server.base_url}/shop.html (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+            shutil.rmtree(site_dir, ignore_errors=True)
+    else:
+        rows = bench(args.sizes, args.browser, not args.headed, args.seed)
+        print(format_curve(rows))
+        print(f"\nScaling curve saved to {SCALING_REPORT}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+DOM Snapshot Capture
+Captures a serialized DOM snapshot on failure (MHTML via CDP, page source otherwise),
+stores it gzip-compressed and content-addressed by hash so identical page states are
+stored once, and opens snapshots offline in a browser.
+
+Usage:
+    python -m utils.dom_snapshot list
+    python -m utils.dom_snapshot open <hash prefix or path>
+    python -m utils.dom_snapshot extract <hash prefix or path> -o page.mhtml
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import webbrowser
+from pathlib import Path
+
+from selenium.common.exceptions import WebDriverException
+
+
+SNAPSHOT_DIR = "dom_snapshots"
+
+_BOUNDARY_RE = re.compile(r'boundary="([^"]+)"')
+_DATE_RE = re.compile(r"^Date: [^\r\n]*", re.MULTILINE)
+_CID_RE = re.compile(r"([\w.-]+)@mhtml\.blink")
+
+
+def _normalize_mhtml(mhtml):
+    """Replace per-capture random boundaries, dates and content ids so equal DOMs hash equally"""
+    match = _BOUNDARY_RE.search(mhtml)
+    if match:
+        mhtml = mhtml.replace(match.group(1), "----MultipartBoundary--stylezone----")
+    mhtml = _DATE_RE.sub("Date: -", mhtml, count=1)
+    content_ids = {}
+
+    def replace_cid(cid_match):
+        cid = content_ids.setdefault(cid_match.group(1), f"part-{len(content_ids)}")
+        return f"{cid}@mhtml.blink"
+
+    return _CID_RE.sub(replace_cid, mhtml)
+
+
+def capture_dom_snapshot(driver, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Capture the current page as a compressed, deduplicated snapshot
+
+    Returns a dict with the snapshot path, hash, format and sizes, or None when
+    nothing could be captured.
+    """
+    try:
+        content = driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"]
+        content = _normalize_mhtml(content)
+        snapshot_format = "mhtml"
+    except (AttributeError, KeyError, WebDriverException):
+        try:
+            content = driver.page_source
+            snapshot_format = "html"
+        except WebDriverException:
+            return None
+
+    raw = content.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_dir / f"{digest[:16]}.{snapshot_format}.gz"
+
+    deduplicated = path.exists()
+    if not deduplicated:
+        # Write to a temporary file first so parallel workers never see a partial snapshot
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+
+    return {
+        "path": str(path),
+        "sha256": digest,
+        "format": snapshot_format,
+        "size": len(raw),
+        "compressed_size": path.stat().st_size,
+        "deduplicated": deduplicated
+    }
+
+
+def find_snapshot(reference, snapshot_dir=SNAPSHOT_DIR):
+    """Resolve a snapshot path from a path or a hash prefix"""
+    if os.path.exists(reference):
+        return Path(reference)
+    matches = sorted(Path(snapshot_dir).glob(f"{reference}*.gz"))
+    if not matches:
+        raise FileNotFoundError(f"No snapshot matching '{reference}' in {snapshot_dir}")
+    if len(matches) > 1:
+        raise ValueError(f"Ambiguous snapshot reference '{reference}': {', '.join(m.name for m in matches)}")
+    return matches[0]
+
+
+def load_snapshot(reference, snapshot_dir=SNAPSHOT_DIR):
+    """Get the decompressed snapshot content"""
+    with gzip.open(find_snapshot(reference, snapshot_dir), 'rb') as f:
+        return f.read().decode("utf-8")
+
+
+def extract_snapshot(reference, output_path=None, snapshot_dir=SNAPSHOT_DIR):
+    """Decompress a snapshot to a file that a browser can open offline"""
+    path = find_snapshot(reference, snapshot_dir)
+    snapshot_format = path.name.split(".")[-2]
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(prefix=f"{path.name.split('.')[0]}_", suffix=f".{snapshot_format}")
+        os.close(fd)
+    with gzip.open(path, 'rb') as src, open(output_path, 'wb') as dst:
+        dst.write(src.read())
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect DOM snapshots captured on test failures")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR, help="Snapshot store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List stored snapshots")
+    open_parser = subparsers.add_parser("open", help="Open a snapshot in the default browser")
+    open_parser.add_argument("reference", help="Hash prefix or snapshot path")
+    extract_parser = subparsers.add_parser("extract", help="Decompress a snapshot to a file")
+    extract_parser.add_argument("reference", help="Hash prefix or snapshot path")
+    extract_parser.add_argument("-o", "--output", help="Output file (default: temporary file)")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for path in sorted(Path(args.snapshot_dir).glob("*.gz"), key=os.path.getmtime):
+            print(f"{path.name:40} {path.stat().st_size:>10} bytes")
+        return 0
+
+    output = extract_snapshot(args.reference, getattr(args, "output", None), args.snapshot_dir)
+    print(f"Snapshot extracted: {output}")
+    if args.command == "open":
+        # Chrome renders MHTML natively; HTML snapshots open in any browser
+        webbrowser.open(Path(output).resolve().as_uri())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
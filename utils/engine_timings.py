@@ -0,0 +1,106 @@
+"""
+Per-engine timing collection
+Records browser launch, page load and page object action timings per engine so
+engines can be compared side by side after a mixed-pool run
+"""
+import json
+import os
+import weakref
+from pathlib import Path
+
+from pages.base_page import ActionListener
+
+
+class EngineTimings(ActionListener):
+    """Collect launch, page-load and action timings keyed by browser engine"""
+
+    def __init__(self):
+        self.samples = {}
+        self._engines = weakref.WeakKeyDictionary()
+
+    def track(self, driver, engine):
+        """Associate a driver with the engine name used in the report"""
+        self._engines[driver] = engine
+
+    def record(self, engine, metric, seconds):
+        """Record a single timing sample"""
+        self.samples.setdefault(engine, {}).setdefault(metric, []).append(seconds)
+
+    def record_launch(self, driver, engine, seconds):
+        """Record how long it took to launch a browser"""
+        self.track(driver, engine)
+        self.record(engine, "launch", seconds)
+
+    def on_action_end(self, event):
+        """Record page object actions for the engine driving the page"""
+        engine = self._engines.get(event.page.driver)
+        if engine is None or event.error is not None:
+            return
+        metric = "page_load" if event.name == "navigate_to" else f"action:{event.name}"
+        self.record(engine, metric, event.duration)
+
+    def save(self, output_dir, worker_id):
+        """Write this process's samples to output_dir/<worker_id>.json"""
+        if not self.samples:
+            return None
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / f"{worker_id}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.samples, f)
+        return path
+
+
+def merge_timings(output_dir):
+    """Merge per-worker timing files into one {engine: {metric: [seconds]}} mapping"""
+    merged = {}
+    for path in sorted(Path(output_dir).glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for engine, metrics in data.items():
+            for metric, values in metrics.items():
+                merged.setdefault(engine, {}).setdefault(metric, []).extend(values)
+    return merged
+
+
+def summarize(merged):
+    """Reduce samples to {engine: {metric: {count, mean, p95, total}}}"""
+    summary = {}
+    for engine, metrics in merged.items():
+        for metric, values in metrics.items():
+            values = sorted(values)
+            summary.setdefault(engine, {})[metric] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "total": sum(values)
+            }
+    return summary
+
+
+def format_table(summary):
+    """Format a side-by-side table of mean (p95) seconds per metric and engine"""
+    engines = sorted(summary)
+    metrics = sorted({metric for engine in engines for metric in summary[engine]},
+                     key=lambda m: (m != "launch", m != "page_load", m))
+    width = max([len(m) for m in metrics] + [6])
+    lines = ["metric".ljust(width) + "".join(engine.rjust(22) for engine in engines)]
+    for metric in metrics:
+        row = metric.ljust(width)
+        for engine in engines:
+            stats = summary[engine].get(metric)
+            cell = f"{stats['mean']:.3f}s ({stats['p95']:.3f}s) x{stats['count']}" if stats else "-"
+            row += cell.rjust(22)
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def write_summary(output_dir, report_path):
+    """Merge worker files, write the JSON summary and return the formatted table"""
+    summary = summarize(merge_timings(output_dir))
+    if not summary:
+        return None
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return format_table(summary)
@@ -0,0 +1,218 @@
+"""
+Event-driven waits backed by a CDP session
+Listeners are injected into every document through the Chrome DevTools Protocol,
+so waits resolve from browser events in a single WebDriver round trip instead of
+polling the driver every 500ms. Console errors and uncaught exceptions are read from
+the browser log (the DevTools Log domain, via goog:loggingPrefs), so nothing is kept
+in storage the app under test can see.
+"""
+import weakref
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+# Installed at document start on every navigation. Keeps a small event state on
+# window.__szEvents that the wait script below subscribes to.
+_BOOTSTRAP_SCRIPT = r"""
+(function () {
+    if (window.__szEvents) { return; }
+    var state = window.__szEvents = {
+        pending: 0,
+        lastNetwork: performance.now(),
+        lastMutation: performance.now(),
+        mutations: 0,
+        waiters: []
+    };
+
+    function notify() {
+        var waiters = state.waiters;
+        state.waiters = [];
+        waiters.forEach(function (fn) { fn(); });
+    }
+    function beginRequest() { state.pending++; state.lastNetwork = performance.now(); }
+    function endRequest() {
+        state.pending = Math.max(0, state.pending - 1);
+        state.lastNetwork = performance.now();
+        notify();
+    }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            beginRequest();
+            return originalFetch.apply(this, arguments).finally(endRequest);
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        beginRequest();
+        this.addEventListener('loadend', endRequest);
+        return originalSend.apply(this, arguments);
+    };
+
+    new MutationObserver(function () {
+        state.mutations++;
+        state.lastMutation = performance.now();
+        notify();
+    }).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    document.addEventListener('readystatechange', notify);
+    window.addEventListener('load', notify);
+})();
+"""
+
+# Resolves once the requested condition holds. Re-checks only when the bootstrap
+# listeners report an event or a quiet period can have elapsed.
+_WAIT_SCRIPT = r"""
+var callback = arguments[arguments.length - 1];
+var kind = arguments[0], quietMs = arguments[1], timeoutMs = arguments[2], since = arguments[3];
+var state = window.__szEvents;
+if (!state) { callback({status: 'unavailable'}); return; }
+var deadline = Date.now() + timeoutMs;
+var done = false;
+
+function quietFor(last) {
+    var left = quietMs - (performance.now() - last);
+    return left <= 0 ? 0 : left;
+}
+function remaining() {
+    if (kind === 'load') { return document.readyState === 'complete' ? 0 : null; }
+    if (kind === 'dom_change') { return state.mutations > since ? 0 : null; }
+    if (kind === 'network_idle') { return state.pending > 0 ? null : quietFor(state.lastNetwork); }
+    if (kind === 'dom_stable') { return quietFor(state.lastMutation); }
+    if (kind === 'settled') {
+        if (state.pending > 0) { return null; }
+        return Math.max(quietFor(state.lastNetwork), quietFor(state.lastMutation));
+    }
+    return 0;
+}
+function attempt() {
+    if (done) { return; }
+    var wait = remaining();
+    if (wait === 0) { done = true; callback({status: 'ok'}); return; }
+    var left = deadline - Date.now();
+    if (left <= 0) { done = true; callback({status: 'timeout'}); return; }
+    state.waiters.push(attempt);
+    setTimeout(attempt, wait === null ? left : Math.min(wait, left));
+}
+attempt();
+"""
+
+# Browser log sources kept as console errors, with the level reported for them
+_CONSOLE_SOURCES = {"console-api": "error", "javascript": "exception"}
+
+_sessions = weakref.WeakKeyDictionary()
+
+
+class EventSession:
+    """CDP-backed event channel that lives alongside a classic WebDriver session"""
+
+    def __init__(self, driver, script_timeout=35):
+        self.driver = driver
+        self.script_timeout = script_timeout
+        self.available = False
+        # Reading the browser log drains it, so errors are kept here until cleared
+        self._console_errors = []
+
+    def start(self):
+        """Install the event listeners; returns False when CDP is not supported"""
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _BOOTSTRAP_SCRIPT})
+            self.driver.execute_script(_BOOTSTRAP_SCRIPT)
+            self.driver.set_script_timeout(self.script_timeout)
+            self.available = True
+        except (AttributeError, WebDriverException):
+            self.available = False
+        return self.available
+
+    def wait_for(self, condition, timeout=10, quiet_ms=500, since=0):
+        """
+        Wait for a condition pushed by the page listeners
+
+        Args:
+            condition: One of "load", "network_idle", "dom_stable", "dom_change", "settled"
+            timeout: Maximum wait in seconds
+            quiet_ms: Quiet period for idle/stable conditions
+            since: Mutation count to compare against for "dom_change"
+
+        Returns True when the condition is met and False when the event channel is
+        unavailable (callers should fall back to polling). Raises TimeoutException.
+        """
+        if not self.available:
+            return False
+        timeout_ms = int(min(timeout, self.script_timeout - 1) * 1000)
+        try:
+            result = self.driver.execute_async_script(_WAIT_SCRIPT, condition, quiet_ms, timeout_ms, since)
+            if result and result.get("status") == "unavailable":
+                # Document was created before the listeners were registered
+                self.driver.execute_script(_BOOTSTRAP_SCRIPT)
+                result = self.driver.execute_async_script(_WAIT_SCRIPT, condition, quiet_ms, timeout_ms, since)
+        except TimeoutException:
+            raise
+        except WebDriverException:
+            return False
+        if not result or result.get("status") != "ok":
+            raise TimeoutException(f"Timed out after {timeout}s waiting for '{condition}' event")
+        return True
+
+    def wait_for_page_load(self, timeout=10):
+        """Wait for the document load event"""
+        return self.wait_for("load", timeout)
+
+    def wait_for_network_idle(self, timeout=10, quiet_ms=500):
+        """Wait until no fetch/XHR requests have been in flight for quiet_ms"""
+        return self.wait_for("network_idle", timeout, quiet_ms)
+
+    def wait_for_dom_stable(self, timeout=10, quiet_ms=300):
+        """Wait until the DOM has not changed for quiet_ms"""
+        return self.wait_for("dom_stable", timeout, quiet_ms)
+
+    def wait_for_dom_change(self, since, timeout=10):
+        """Wait until the DOM changes after the given mutation count"""
+        return self.wait_for("dom_change", timeout, since=since)
+
+    def wait_for_settled(self, timeout=10, quiet_ms=300):
+        """Wait until both network and DOM have been quiet for quiet_ms"""
+        return self.wait_for("settled", timeout, quiet_ms)
+
+    def mutation_count(self):
+        """Get the number of DOM mutations seen in the current document"""
+        try:
+            return self.driver.execute_script("return window.__szEvents ? window.__szEvents.mutations : 0;")
+        except WebDriverException:
+            return 0
+
+    def get_console_errors(self, clear=False):
+        """Get console errors and uncaught exceptions from the browser log (across navigations)"""
+        if not self.available:
+            return []
+        try:
+            entries = self.driver.get_log("browser")
+        except (AttributeError, WebDriverException):
+            entries = []
+        self._console_errors += [
+            {"level": _CONSOLE_SOURCES[entry.get("source")], "message": entry.get("message", ""),
+             "timestamp": entry.get("timestamp")}
+            for entry in entries
+            if entry.get("level") == "SEVERE" and entry.get("source") in _CONSOLE_SOURCES
+        ]
+        errors = list(self._console_errors)
+        if clear:
+            self._console_errors = []
+        return errors
+
+
+def attach_event_session(driver):
+    """Start an event session for a driver and register it for page objects"""
+    session = EventSession(driver)
+    if session.start():
+        _sessions[driver] = session
+        return session
+    return None
+
+
+def get_event_session(driver):
+    """Get the event session attached to a driver, or None when waits should poll"""
+    session = _sessions.get(driver)
+    if session and session.available:
+        return session
+    return None
@@ -0,0 +1,236 @@
+"""
+Streaming JSONL results
+Pytest plugin that appends one JSON line per test phase (setup/call/teardown) to a
+run file while the run is in progress, so partial results are usable even if the
+run is killed. The run file is truncated when the run starts, so reusing a path
+keeps only the latest run.
+
+Usage:
+    pytest --live-results reports/live/nightly.jsonl
+    python -m utils.live_results tail --follow       # stream progress of the latest run
+    python -m utils.live_results summary             # summarize the latest run
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+LIVE_RESULTS_DIR = os.path.join("reports", "live")
+LONGREPR_LIMIT = 2000
+
+
+class LiveResultsWriter:
+    """JSONL writer for one run; every record is a single unbuffered append"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A reused path starts over, so summaries never mix runs
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+
+    def write(self, record):
+        """Append one record"""
+        line = json.dumps(record, default=str, ensure_ascii=False) + "\n"
+        os.write(self._fd, line.encode("utf-8"))
+
+    def close(self):
+        """Close the run file"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class LiveResultsPlugin:
+    """Write test phase results as they are reported"""
+
+    def __init__(self, path):
+        self.writer = LiveResultsWriter(path)
+        self.run_id = Path(path).stem
+        self.counts = Counter()
+
+    def pytest_sessionstart(self, session):
+        self.writer.write({
+            "event": "session_start",
+            "run_id": self.run_id,
+            "timestamp": time.time(),
+            "host": socket.gethostname(),
+            "args": list(session.config.invocation_params.args)
+        })
+
+    def pytest_collection_finish(self, session):
+        self.writer.write({"event": "collected", "timestamp": time.time(), "count": len(session.items)})
+
+    def pytest_runtest_logreport(self, report):
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None and hasattr(node, "gateway") else "main"
+        record = {
+            "event": "phase",
+            "timestamp": time.time(),
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": report.outcome,
+            "duration": round(report.duration, 4),
+            "worker": worker,
+            "artifacts": dict(report.user_properties).get("artifacts", {})
+        }
+        resources = dict(report.user_properties).get("resources")
+        if resources:
+            record["resources"] = resources
+        if report.failed:
+            record["longrepr"] = report.longreprtext[-LONGREPR_LIMIT:]
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            self.counts[report.outcome] += 1
+        self.writer.write(record)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.writer.write({
+            "event": "session_finish",
+            "timestamp": time.time(),
+            "exitstatus": int(exitstatus),
+            "counts": dict(self.counts)
+        })
+        self.writer.close()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--live-results",
+        action="store",
+        default=os.getenv("LIVE_RESULTS"),
+        help="Write per-phase results to this JSONL file while the run progresses (replaces an earlier run)"
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("--live-results")
+    # Workers report to the controller, which writes the single run file
+    if path and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(LiveResultsPlugin(path), "live_results_writer")
+
+
+def read_records(path):
+    """Read records from a run file, ignoring a partially written last line"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def latest_run_file(directory=LIVE_RESULTS_DIR):
+    """Get the most recently modified run file"""
+    files = list(Path(directory).glob("*.jsonl"))
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def summarize(records, slowest=10):
+    """Summarize a run: outcome counts, failures and slowest tests"""
+    counts = Counter()
+    durations = Counter()
+    failures = []
+    finished = None
+    for record in records:
+        if record.get("event") == "session_finish":
+            finished = record
+        if record.get("event") != "phase":
+            continue
+        durations[record["nodeid"]] += record["duration"]
+        if record["when"] == "call" or (record["when"] == "setup" and record["outcome"] != "passed"):
+            counts[record["outcome"]] += 1
+        if record["outcome"] == "failed":
+            failures.append(record)
+    return {
+        "counts": dict(counts),
+        "failures": failures,
+        "slowest": durations.most_common(slowest),
+        "finished": finished is not None,
+        "exitstatus": finished.get("exitstatus") if finished else None
+    }
+
+
+def format_record(record):
+    """Format a record as a single progress line"""
+    stamp = datetime.fromtimestamp(record.get("timestamp", 0)).strftime("%H:%M:%S")
+    event = record.get("event")
+    if event == "phase":
+        return (f"{stamp} [{record['worker']}] {record['outcome'].upper():8} "
+                f"{record['when']:8} {record['duration']:7.2f}s {record['nodeid']}")
+    if event == "collected":
+        return f"{stamp} collected {record['count']} test(s)"
+    if event == "session_finish":
+        return f"{stamp} finished (exit status {record['exitstatus']}): {record.get('counts', {})}"
+    return f"{stamp} {event}"
+
+
+def tail(path, follow=False, poll_interval=0.5):
+    """Print records from a run file, optionally following new lines"""
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        while True:
+            chunk = f.readline()
+            if chunk:
+                buffer += chunk
+                if not buffer.endswith("\n"):
+                    continue
+                try:
+                    record = json.loads(buffer)
+                except ValueError:
+                    record = None
+                buffer = ""
+                if record:
+                    print(format_record(record), flush=True)
+                    if follow and record.get("event") == "session_finish":
+                        return
+            elif follow:
+                time.sleep(poll_interval)
+            else:
+                return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read streaming JSONL test results")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    tail_parser = subparsers.add_parser("tail", help="Print progress lines")
+    tail_parser.add_argument("path", nargs="?", help="Run file (default: latest in reports/live)")
+    tail_parser.add_argument("--follow", "-f", action="store_true", help="Keep reading until the run finishes")
+    summary_parser = subparsers.add_parser("summary", help="Summarize a run")
+    summary_parser.add_argument("path", nargs="?", help="Run file (default: latest in reports/live)")
+    summary_parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    path = args.path or latest_run_file()
+    if not path:
+        print(f"No run files found in {LIVE_RESULTS_DIR}")
+        return 1
+
+    if args.command == "tail":
+        tail(path, follow=args.follow)
+        return 0
+
+    summary = summarize(read_records(path))
+    if args.json:
+        print(json.dumps(summary, indent=2, default=str))
+        return 0
+    state = "finished" if summary["finished"] else "in progress or interrupted"
+    print(f"Run: {path} ({state})")
+    print("Outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(summary["counts"].items())))
+    if summary["failures"]:
+        print("\nFailures:")
+        for record in summary["failures"]:
+            print(f"  [{record['worker']}] {record['nodeid']} ({record['when']})")
+    print("\nSlowest tests:")
+    for nodeid, duration in summary["slowest"]:
+        print(f"  {duration:8.2f}s  {nodeid}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
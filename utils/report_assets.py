@@ -0,0 +1,131 @@
+"""
+pytest-html Report Assets
+Pytest plugin that attaches failure artifacts (screenshot, visual diff heatmaps,
+DOM snapshot, action log and bug report) to the test's row in the pytest-html
+report, in one of two modes selected per run:
+
+- inline: screenshots and heatmaps are base64-inlined into a self-contained
+  report.html (pytest.ini default; fine for small runs)
+- linked: --self-contained-html is turned off, screenshots, heatmaps and DOM
+  snapshots are stored next to the report in reports/assets/ and shown as
+  lazy-loaded thumbnails, so report.html stays small however many tests fail
+
+Usage:
+    pytest --report-assets=linked
+    REPORT_ASSETS=linked pytest -n 4
+"""
+import base64
+import hashlib
+import os
+import shutil
+
+import pytest
+
+import config
+
+try:
+    from pytest_html import extras
+except ImportError:  # Without pytest-html there is no report to attach to
+    extras = None
+
+
+THUMBNAIL_HTML = ('<div style="display: inline-block; margin: 5px 10px 5px 0;">'
+                  '<a href="{href}" target="_blank"><img src="{href}" loading="lazy" alt="{name}" '
+                  'style="width: 320px; border: 1px solid #ddd; border-radius: 4px;"></a>'
+                  '<div>{name}</div></div>')
+
+
+def _store(path, assets_dir, prefix):
+    """Hard-link (or copy) an artifact into the assets directory; returns its new path"""
+    target = os.path.join(assets_dir, f"{prefix}_{os.path.basename(path)}")
+    if not os.path.exists(target):
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+    return target
+
+
+class ReportAssetsPlugin:
+    """Add a failed test's artifacts to its pytest-html row"""
+
+    def __init__(self, report_path, mode):
+        self.report_dir = os.path.dirname(os.path.abspath(report_path))
+        self.assets_dir = os.path.join(self.report_dir, "assets")
+        self.mode = mode
+        self._calls = {}
+
+    def _link(self, path):
+        return os.path.relpath(os.path.abspath(path), self.report_dir).replace(os.sep, "/")
+
+    def _image(self, path, name, prefix):
+        if self.mode == "inline":
+            with open(path, 'rb') as f:
+                return extras.png(base64.b64encode(f.read()).decode("ascii"), name)
+        href = self._link(_store(path, self.assets_dir, prefix))
+        return extras.html(THUMBNAIL_HTML.format(href=href, name=name))
+
+    def extras_for(self, nodeid, artifacts):
+        """pytest-html extras for a test's artifacts"""
+        prefix = hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:8]
+        if self.mode == "linked":
+            os.makedirs(self.assets_dir, exist_ok=True)
+        found = []
+        images = [(artifacts.get("screenshot"), "Screenshot")]
+        images += [(heatmap, "Visual diff") for heatmap in artifacts.get("visual_diffs") or []]
+        for path, name in images:
+            if path and os.path.exists(path):
+                found.append(self._image(path, name, prefix))
+        snapshot = artifacts.get("dom_snapshot")
+        if snapshot and os.path.exists(snapshot):
+            if self.mode == "linked":
+                snapshot = _store(snapshot, self.assets_dir, prefix)
+            found.append(extras.url(self._link(snapshot), "DOM snapshot"))
+        if artifacts.get("action_log") and os.path.exists(artifacts["action_log"]):
+            found.append(extras.url(self._link(artifacts["action_log"]), "Action log"))
+        bug_report = artifacts.get("bug_report")
+        if bug_report:
+            html_report = os.path.splitext(bug_report)[0] + ".html"
+            found.append(extras.url(self._link(html_report if os.path.exists(html_report) else bug_report),
+                                    "Bug report"))
+        return found
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report):
+        """
+        The driver fixture records artifacts during teardown, after the call report
+        was made; pytest-html only shows extras of the call report, and renders the
+        test when its teardown report arrives, so they are added to it here first
+        """
+        if report.when == "call":
+            self._calls[report.nodeid] = report
+            return
+        if report.when != "teardown":
+            return
+        call = self._calls.pop(report.nodeid, None)
+        artifacts = dict(report.user_properties).get("artifacts")
+        if call is None or not artifacts:
+            return
+        try:
+            call.extras = list(getattr(call, "extras", [])) + self.extras_for(report.nodeid, artifacts)
+        except OSError as e:
+            print(f"Warning: Could not attach artifacts of {report.nodeid} to the HTML report: {e}")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--report-assets", choices=("inline", "linked"), default=config.REPORT_ASSETS,
+                     help="Inline failure screenshots into a self-contained HTML report, or store them "
+                          "next to it as linked, lazy-loaded thumbnails")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    report_path = config.getoption("htmlpath", None)
+    # The controller writes the HTML report (from reports relayed by xdist workers)
+    if extras is None or not report_path or hasattr(config, "workerinput"):
+        return
+    mode = config.getoption("--report-assets")
+    if mode == "linked":
+        # Runs before pytest-html picks its report class
+        config.option.self_contained_html = False
+    config.pluginmanager.register(ReportAssetsPlugin(report_path, mode), "report_assets")
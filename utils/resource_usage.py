@@ -0,0 +1,153 @@
+"""
+Browser Resource Sampling
+Samples CPU time, resident memory and process count of a browser's process tree
+by reading /proc (Linux only, no extra dependency) while a test runs. The results
+are attached to the test report and the heaviest tests are listed after the run,
+to size xdist worker counts against runner memory and spot pages that balloon.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+
+PROC = Path("/proc")
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def is_supported():
+    """Check whether /proc is available"""
+    return (PROC / "self" / "stat").exists()
+
+
+def _read_stat(pid):
+    """Parse /proc/<pid>/stat; returns (ppid, cpu_seconds, rss_bytes) or None"""
+    try:
+        data = (PROC / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    # The command name is in parentheses and may contain spaces
+    fields = data[data.rfind(")") + 2:].split()
+    ppid = int(fields[1])
+    cpu_ticks = int(fields[11]) + int(fields[12])  # utime + stime
+    rss_bytes = int(fields[21]) * _PAGE_SIZE
+    return ppid, cpu_ticks / _CLOCK_TICKS, rss_bytes
+
+
+def process_tree(root_pid):
+    """Get {pid: (cpu_seconds, rss_bytes)} for a process and all of its descendants"""
+    stats = {}
+    children = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        stat = _read_stat(entry.name)
+        if stat is None:
+            continue
+        pid = int(entry.name)
+        stats[pid] = stat
+        children.setdefault(stat[0], []).append(pid)
+    tree = {}
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        if pid in stats and pid not in tree:
+            tree[pid] = stats[pid][1:]
+            pending.extend(children.get(pid, ()))
+    return tree
+
+
+def browser_pid(driver):
+    """Get the pid of the local driver service process (the browser is its child)"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+class ResourceSampler:
+    """Periodically sample a process tree in a background thread"""
+
+    def __init__(self, root_pid, interval=0.5):
+        self.root_pid = root_pid
+        self.interval = interval
+        self._cpu = {}
+        self._cpu_baseline = {}
+        self._rss = []
+        self._processes = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Take the first sample and start the background thread"""
+        # CPU already used (e.g. by a pre-launched warm browser) is not counted
+        self._cpu_baseline = {pid: cpu for pid, (cpu, _) in process_tree(self.root_pid).items()}
+        self.sample()
+        self._thread.start()
+        return self
+
+    def sample(self):
+        """Take one sample"""
+        tree = process_tree(self.root_pid)
+        if not tree:
+            return
+        # CPU time is cumulative per process; keep the latest value of every pid seen
+        for pid, (cpu, _) in tree.items():
+            self._cpu[pid] = cpu
+        self._rss.append(sum(rss for _, rss in tree.values()))
+        self._processes.append(len(tree))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        """Stop sampling; returns the usage summary or None when nothing was sampled"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self.interval * 2)
+        self.sample()
+        if not self._rss:
+            return None
+        return {
+            "cpu_seconds": round(sum(cpu - self._cpu_baseline.get(pid, 0) for pid, cpu in self._cpu.items()), 2),
+            "peak_rss_mb": round(max(self._rss) / 2 ** 20, 1),
+            "mean_rss_mb": round(sum(self._rss) / len(self._rss) / 2 ** 20, 1),
+            "peak_processes": max(self._processes),
+            "samples": len(self._rss)
+        }
+
+
+def start_sampling(pid, interval=0.5):
+    """Start a sampler for a browser process tree, or return None when unsupported"""
+    if pid is None or not is_supported():
+        return None
+    return ResourceSampler(pid, interval).start()
+
+
+def heaviest(records, key="peak_rss_mb", limit=10):
+    """Get the heaviest tests by one metric; records are (nodeid, usage) pairs"""
+    return sorted(records, key=lambda r: r[1].get(key, 0), reverse=True)[:limit]
+
+
+def format_table(records, limit=10):
+    """Format the heaviest tests by peak memory"""
+    lines = [f"{'peak RSS':>10} {'mean RSS':>10} {'CPU':>8} {'procs':>6}  test"]
+    for nodeid, usage in heaviest(records, limit=limit):
+        lines.append(f"{usage['peak_rss_mb']:>8.1f}MB {usage['mean_rss_mb']:>8.1f}MB "
+                     f"{usage['cpu_seconds']:>7.2f}s {usage['peak_processes']:>6}  {nodeid}")
+    return "\n".join(lines)
+
+
+def write_summary(records, report_path):
+    """Write every test's usage plus totals to JSON"""
+    if not records:
+        return None
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    summary = {
+        "tests": {nodeid: usage for nodeid, usage in records},
+        "max_peak_rss_mb": max(usage["peak_rss_mb"] for _, usage in records),
+        "total_cpu_seconds": round(sum(usage["cpu_seconds"] for _, usage in records), 2)
+    }
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return report_path
@@ -0,0 +1,62 @@
+"""
+Search Result Snapshot Cache
+Per-process (per xdist worker) LRU cache of read-only search result snapshots
+extracted from the shop page. Entries are keyed on everything that determines the
+results, including the catalog version. The version is fingerprinted once per worker
+and site, so a catalog change is picked up by the next run (or pin it with
+CATALOG_VERSION).
+"""
+from collections import OrderedDict, namedtuple
+
+import config
+
+
+ProductSnapshot = namedtuple("ProductSnapshot", ["name", "price", "image"])
+# selected: the category, price and sort control values the results were taken with
+ResultSnapshot = namedtuple("ResultSnapshot", ["products", "results_count", "selected", "cached"])
+
+
+class ResultCache:
+    """Bounded LRU cache of ResultSnapshot objects"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+
+    def catalog_version(self, site, fingerprint):
+        """Catalog version of a site; fingerprint() is only called the first time"""
+        if site not in self._versions:
+            self._versions[site] = fingerprint()
+        return self._versions[site]
+
+    def get(self, key):
+        """Get a cached snapshot (marking it recently used) or None"""
+        snapshot = self._entries.get(key)
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return snapshot._replace(cached=True)
+
+    def put(self, key, snapshot):
+        """Store a snapshot, evicting the least recently used entry when full"""
+        self._entries[key] = snapshot
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and catalog versions"""
+        self._entries.clear()
+        self._versions.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# One cache per worker process
+result_cache = ResultCache(maxsize=config.RESULT_CACHE_SIZE)
@@ -0,0 +1,292 @@
+"""
+Run Artifact Bundles
+Pytest plugin that packs the artifacts a run wrote (screenshots, DOM snapshots,
+visual diffs, bug reports, reports and archived outputs) into one zip per run,
+bundles/run_<timestamp>.zip, and prunes old bundles by count, age and total size.
+
+Packed files are removed from the working tree (except those later runs build on),
+so the artifact directories do not grow without bound; --bundle-copy leaves them.
+
+Each bundle starts with index.json (run times, exit status, outcome counts and every
+file with its size), and zip members can be read on their own, so a single
+screenshot or report can be extracted without unpacking the run.
+
+Usage:
+    pytest --bundle                        # pack (and remove) this run's files, then apply retention
+    pytest --bundle --bundle-copy          # leave the packed files in the working tree
+    python -m utils.run_bundle list
+    python -m utils.run_bundle show run_20251123_140537
+    python -m utils.run_bundle extract run_20251123_140537 "screenshots/*" --to /tmp/run
+    python -m utils.run_bundle prune --keep 10 --max-size-mb 500
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import config
+from utils.bug_dashboard import BugDashboard
+
+
+INDEX_NAME = "index.json"
+ARTIFACT_DIRS = (config.SCREENSHOT_DIR, config.DOM_SNAPSHOT_DIR, config.VISUAL_DIFF_DIR,
+                 "bug_reports", config.REPORT_DIR, "archive")
+# Kept in place when packed files are removed: files later runs build on (duration history for
+# --shard, the dashboard and signature index of the bug reports)
+KEEP_IN_PLACE = ("archive/*", "bug_reports/index.html", "bug_reports/dashboard_data.js",
+                 "bug_reports/dashboard_index.txt", "bug_reports/signatures.json")
+# Already compressed; deflating them again only costs time
+STORED_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".gz", ".zip")
+
+
+def collect_artifacts(since=0, directories=ARTIFACT_DIRS):
+    """Files in the artifact directories modified at or after since, as relative paths"""
+    files = []
+    for directory in directories:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.endswith((".lock", ".tmp")):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) >= since:
+                        files.append(Path(path).as_posix())
+                except OSError:
+                    continue
+    return sorted(files)
+
+
+def write_bundle(bundle_dir, files, run_info=None, name=None):
+    """Pack files into bundle_dir/<name>.zip with an index; returns the bundle path"""
+    os.makedirs(bundle_dir, exist_ok=True)
+    name = name or datetime.now().strftime("run_%Y%m%d_%H%M%S")
+    path = os.path.join(bundle_dir, f"{name}.zip")
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(bundle_dir, f"{name}_{suffix}.zip")
+    entries = []
+    for file in files:
+        try:
+            stat = os.stat(file)
+        except OSError:
+            continue
+        entries.append({"path": file, "size": stat.st_size, "mtime": round(stat.st_mtime, 3)})
+    index = dict(run_info or {}, bundle=Path(path).stem, files=entries)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as bundle:
+        bundle.writestr(INDEX_NAME, json.dumps(index, indent=2))
+        for entry in entries:
+            compression = zipfile.ZIP_STORED if entry["path"].lower().endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+            bundle.write(entry["path"], entry["path"], compress_type=compression)
+    os.replace(tmp_path, path)
+    return path
+
+
+def remove_packed(files):
+    """
+    Remove packed files except those later runs build on, and drop removed bug
+    reports from the dashboard; returns the removed paths
+    """
+    removed = []
+    for file in files:
+        if any(fnmatch.fnmatch(file, pattern) for pattern in KEEP_IN_PLACE):
+            continue
+        try:
+            os.remove(file)
+            removed.append(file)
+        except OSError:
+            continue
+    if any(file.startswith("bug_reports/BUG_") for file in removed):
+        BugDashboard("bug_reports").rebuild()
+    return removed
+
+
+def list_bundles(bundle_dir):
+    """Bundle paths, newest first"""
+    return sorted(Path(bundle_dir).glob("run_*.zip"), key=os.path.getmtime, reverse=True)
+
+
+def prune(bundle_dir, keep=0, max_age_days=0, max_size_mb=0):
+    """
+    Remove old bundles; returns the removed paths
+
+    Args:
+        keep: Keep at most this many bundles (0: no limit)
+        max_age_days: Remove bundles older than this (0: no limit)
+        max_size_mb: Remove the oldest bundles until the rest fit in this size (0: no limit)
+    """
+    removed = []
+    total = 0
+    full = False
+    for position, path in enumerate(list_bundles(bundle_dir)):
+        size = path.stat().st_size
+        age_days = (time.time() - path.stat().st_mtime) / 86400
+        # Once a bundle does not fit, every older one goes too
+        full = full or bool(max_size_mb and total + size > max_size_mb * 1024 * 1024)
+        # The newest bundle is never pruned
+        if position and ((keep and position >= keep) or (max_age_days and age_days > max_age_days) or full):
+            path.unlink()
+            removed.append(str(path))
+            continue
+        total += size
+    return removed
+
+
+def resolve_bundle(bundle, bundle_dir):
+    """Path of a bundle given as a path, file name or run name"""
+    for candidate in (bundle, os.path.join(bundle_dir, bundle), os.path.join(bundle_dir, f"{bundle}.zip")):
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError(f"No bundle '{bundle}' in {bundle_dir}")
+
+
+def read_index(path):
+    """Read a bundle's index without unpacking it"""
+    with zipfile.ZipFile(path) as bundle:
+        return json.loads(bundle.read(INDEX_NAME))
+
+
+def extract(path, patterns, target="."):
+    """Extract the members matching any of the patterns; returns the extracted paths"""
+    with zipfile.ZipFile(path) as bundle:
+        members = [name for name in bundle.namelist()
+                   if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+        for member in members:
+            bundle.extract(member, target)
+    return [os.path.join(target, member) for member in members]
+
+
+class RunBundlePlugin:
+    """Pack the run's artifacts once everything else has written its output"""
+
+    def __init__(self, move=True):
+        self.bundle_dir = config.RUN_BUNDLE_DIR
+        self.move = move
+        self.retention = {"keep": config.RUN_BUNDLE_KEEP, "max_age_days": config.RUN_BUNDLE_MAX_AGE_DAYS,
+                          "max_size_mb": config.RUN_BUNDLE_MAX_SIZE_MB}
+        self.base_url = config.BASE_URL
+        # Filesystem timestamps can be coarser than time.time()
+        self.started = time.time() - 1
+        self.exitstatus = None
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.exitstatus = int(exitstatus)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_unconfigure(self, config):
+        """Runs after pytest-html and the terminal summary have written their reports"""
+        files = collect_artifacts(self.started)
+        if not files:
+            return
+        terminal = config.pluginmanager.get_plugin("terminalreporter")
+        stats = terminal.stats if terminal else {}
+        run_info = {
+            "started": datetime.fromtimestamp(self.started + 1).isoformat(),
+            "finished": datetime.now().isoformat(),
+            "exitstatus": self.exitstatus,
+            "base_url": self.base_url,
+            "counts": {outcome: len(stats[outcome]) for outcome in
+                       ("passed", "failed", "error", "skipped", "xfailed", "xpassed") if stats.get(outcome)},
+            "failed": [report.nodeid for report in stats.get("failed", [])]
+        }
+        path = write_bundle(self.bundle_dir, files, run_info)
+        print(f"Run bundle: {path} ({len(files)} files, {os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+        if self.move:
+            removed = remove_packed(files)
+            print(f"Removed {len(removed)} packed file(s) from the working tree")
+        pruned = prune(self.bundle_dir, **self.retention)
+        if pruned:
+            print(f"Pruned {len(pruned)} old bundle(s)")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bundle", action="store_true", default=config.RUN_BUNDLE,
+                     help=f"Pack this run's artifacts into {config.RUN_BUNDLE_DIR}/run_<timestamp>.zip")
+    parser.addoption("--bundle-copy", action="store_true", default=False,
+                     help="Leave packed artifacts in the working tree instead of removing them")
+
+
+def pytest_configure(config):
+    # Workers write into the same directories; the controller packs once
+    if hasattr(config, "workerinput") or config.option.collectonly:
+        return
+    if config.getoption("--bundle"):
+        config.pluginmanager.register(RunBundlePlugin(move=not config.getoption("--bundle-copy")), "run_bundle")
+
+
+def format_size(size):
+    return f"{size / 1024 / 1024:.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List, inspect, extract and prune run artifact bundles")
+    parser.add_argument("--bundle-dir", default=config.RUN_BUNDLE_DIR, help="Bundle directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List bundles, newest first")
+    show_parser = subparsers.add_parser("show", help="Print a bundle's index")
+    show_parser.add_argument("bundle", help="Bundle path or run name")
+    extract_parser = subparsers.add_parser("extract", help="Extract files from a bundle")
+    extract_parser.add_argument("bundle", help="Bundle path or run name")
+    extract_parser.add_argument("patterns", nargs="+", help="Paths or glob patterns, e.g. 'screenshots/*'")
+    extract_parser.add_argument("--to", default=".", help="Target directory")
+    pack_parser = subparsers.add_parser("pack", help="Pack the current artifacts into a bundle")
+    pack_parser.add_argument("--since-hours", type=float, default=0,
+                             help="Only files modified in the last N hours (default: all)")
+    pack_parser.add_argument("--copy", action="store_true", help="Leave the packed files in place")
+    prune_parser = subparsers.add_parser("prune", help="Remove old bundles")
+    prune_parser.add_argument("--keep", type=int, default=config.RUN_BUNDLE_KEEP)
+    prune_parser.add_argument("--max-age-days", type=float, default=config.RUN_BUNDLE_MAX_AGE_DAYS)
+    prune_parser.add_argument("--max-size-mb", type=float, default=config.RUN_BUNDLE_MAX_SIZE_MB)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        bundles = list_bundles(args.bundle_dir)
+        if not bundles:
+            print(f"No bundles in {args.bundle_dir}")
+        for path in bundles:
+            index = read_index(path)
+            counts = ", ".join(f"{k}={v}" for k, v in sorted(index.get("counts", {}).items()))
+            print(f"{path.stem:28}{format_size(path.stat().st_size):>10}{len(index['files']):>7} files  "
+                  f"{index.get('started', '-')[:19]}  {counts}")
+    elif args.command == "show":
+        index = read_index(resolve_bundle(args.bundle, args.bundle_dir))
+        files = index.pop("files")
+        print(json.dumps(index, indent=2))
+        for entry in files:
+            print(f"{format_size(entry['size']):>10}  {entry['path']}")
+    elif args.command == "extract":
+        extracted = extract(resolve_bundle(args.bundle, args.bundle_dir), args.patterns, args.to)
+        for path in extracted:
+            print(path)
+        if not extracted:
+            print("No matching files")
+            return 1
+    elif args.command == "pack":
+        since = time.time() - args.since_hours * 3600 if args.since_hours else 0
+        files = collect_artifacts(since)
+        if not files:
+            print("No artifacts to pack")
+            return 1
+        path = write_bundle(args.bundle_dir, files, {"packed": datetime.now().isoformat()})
+        print(f"Run bundle: {path} ({len(files)} files)")
+        if not args.copy:
+            removed = remove_packed(files)
+            print(f"Removed {len(removed)} packed file(s) from the working tree")
+    else:
+        removed = prune(args.bundle_dir, args.keep, args.max_age_days, args.max_size_mb)
+        for path in removed:
+            print(f"Removed {path}")
+        print(f"{len(removed)} bundle(s) pruned")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
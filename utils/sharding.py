@@ -0,0 +1,230 @@
+"""
+Duration-Aware Sharding
+Pytest plugin that splits the suite across CI nodes with --shard=i/n (1-based).
+Tests are assigned by historical duration using longest-processing-time bin
+packing, so every shard gets about the same total time. Durations come only from
+run outputs in the shared --shard-archive directory (archive/output_*.json format,
+a "duration" per test); tests without history use the mean known duration.
+
+The assignment depends only on the collected tests and the archived durations
+(rounded to DURATION_STEP), so every node with the same archive computes the same
+split. Files local to one node (output.json, live results) are not read.
+
+Usage:
+    pytest --shard=1/3 --record-durations     # on node 1 of 3, then archive the output
+    python -m utils.sharding plan 3           # preview the split
+"""
+import argparse
+import glob
+import heapq
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+import pytest
+
+ARCHIVE_DIR = "archive"
+DEFAULT_DURATION = 10.0
+# Durations are rounded so run-to-run jitter does not reshuffle the shards
+DURATION_STEP = 0.5
+# Only the most recent runs of a test are averaged
+HISTORY_RUNS = 5
+
+
+def test_key(nodeid):
+    """Key a test like the archive format does: '<file>::<test name>' without the class"""
+    parts = nodeid.split("::")
+    return f"{parts[0]}::{parts[-1]}"
+
+
+def _archive_durations(directory):
+    """Yield (start_time, key, seconds) from archive-format outputs that record durations"""
+    for path in sorted(glob.glob(os.path.join(directory, "output_*.json"))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        start = float(data.get("start_time", 0) or 0)
+        for suite in data.get("content", {}).get("suites", {}).values():
+            for test in suite.get("tests", {}).values():
+                duration = test.get("duration")
+                if isinstance(duration, (int, float)):
+                    yield start, f"{suite['suite_name']}::{test['test_name']}", float(duration)
+
+
+def load_durations(archive_dir=ARCHIVE_DIR):
+    """Get {test key: mean duration of its most recent runs} from the shared archive"""
+    history = defaultdict(list)
+    for start, key, seconds in _archive_durations(archive_dir):
+        history[key].append((start, seconds))
+    durations = {}
+    for key, runs in history.items():
+        recent = [seconds for _, seconds in sorted(runs)[-HISTORY_RUNS:]]
+        durations[key] = sum(recent) / len(recent)
+    return durations
+
+
+def estimate(keys, durations, default=None):
+    """Estimated seconds per key; unseen tests get the mean known duration"""
+    if default is None:
+        default = sum(durations.values()) / len(durations) if durations else DEFAULT_DURATION
+    return {key: round(durations.get(key, default) / DURATION_STEP) * DURATION_STEP or DURATION_STEP
+            for key in keys}
+
+
+def assign_shards(keys, estimates, count):
+    """
+    Longest-processing-time bin packing
+
+    Tests are placed longest first (ties by key) on the currently lightest shard
+    (ties by shard index). Returns a list of (total seconds, set of keys) per shard.
+    """
+    heap = [(0.0, index) for index in range(count)]
+    shards = [set() for _ in range(count)]
+    totals = [0.0] * count
+    for key in sorted(set(keys), key=lambda k: (-estimates[k], k)):
+        total, index = heapq.heappop(heap)
+        shards[index].add(key)
+        totals[index] = total + estimates[key]
+        heapq.heappush(heap, (totals[index], index))
+    return list(zip(totals, shards))
+
+
+def parse_shard(value):
+    """Parse 'i/n' into (i, n) with 1 <= i <= n"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard must look like i/n, got {value!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"--shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+class ShardPlugin:
+    """Deselect tests that belong to other shards"""
+
+    def __init__(self, index, count, archive_dir):
+        self.index = index
+        self.count = count
+        self.archive_dir = archive_dir
+        self.estimated = None
+
+    def pytest_collection_modifyitems(self, config, items):
+        keys = [test_key(item.nodeid) for item in items]
+        estimates = estimate(keys, load_durations(self.archive_dir))
+        shards = assign_shards(keys, estimates, self.count)
+        total, selected = shards[self.index - 1]
+        self.estimated = (total, sum(t for t, _ in shards), len(selected))
+        keep = [item for item, key in zip(items, keys) if key in selected]
+        deselected = [item for item, key in zip(items, keys) if key not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = keep
+
+    def pytest_report_collectionfinish(self, config, items):
+        if self.estimated:
+            total, overall, count = self.estimated
+            return f"shard {self.index}/{self.count}: {count} test(s), estimated {total:.0f}s of {overall:.0f}s"
+
+
+class DurationRecorder:
+    """Write this run's test durations as an archive-format output"""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.start_time = time.time()
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        test = self.tests.setdefault(report.nodeid, {"duration": 0.0, "status": "PASS", "message": ""})
+        test["duration"] += report.duration
+        if report.failed:
+            test["status"] = "FAIL" if report.when == "call" else "ERROR"
+            test["message"] = report.longreprtext[-2000:]
+        elif report.skipped and test["status"] == "PASS":
+            test["status"] = "SKIP"
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if not self.tests:
+            return
+        suites = defaultdict(dict)
+        for nodeid, test in self.tests.items():
+            suite_name = nodeid.split("::")[0]
+            suites[suite_name][str(len(suites[suite_name]))] = {
+                "status": test["status"],
+                "message": test["message"],
+                "test_name": nodeid.split("::")[-1],
+                "rerun": "0",
+                "duration": round(test["duration"], 3)
+            }
+        statuses = [t["status"] for t in self.tests.values()]
+        data = {
+            "content": {"suites": {
+                str(i): {"tests": tests, "suite_name": name} for i, (name, tests) in enumerate(sorted(suites.items()))
+            }},
+            "start_time": self.start_time,
+            "total_suite": len(suites),
+            "status": "FAIL" if "FAIL" in statuses or "ERROR" in statuses else "PASS",
+            "total_tests": str(len(statuses))
+        }
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"output_{self.start_time}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--shard", default=os.getenv("SHARD"),
+                     help="Run only shard i of n (e.g. 2/4), balanced by historical durations")
+    parser.addoption("--shard-archive", default=ARCHIVE_DIR,
+                     help="Directory of archive-format outputs with test durations")
+    parser.addoption("--record-durations", action="store_true",
+                     help="Write this run's durations to the archive directory")
+
+
+def pytest_configure(config):
+    archive_dir = config.getoption("--shard-archive")
+    if config.getoption("--shard"):
+        try:
+            index, count = parse_shard(config.getoption("--shard"))
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+        # Under xdist the workers collect, so each one deselects; the plan is
+        # deterministic, so they all keep the same items
+        config.pluginmanager.register(ShardPlugin(index, count, archive_dir), "shard_plugin")
+    # The controller writes one duration file for the whole run
+    if hasattr(config, "workerinput"):
+        return
+    if config.getoption("--record-durations"):
+        config.pluginmanager.register(DurationRecorder(archive_dir), "duration_recorder")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preview duration-balanced shards")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    plan_parser = subparsers.add_parser("plan", help="Show the split of the collected suite")
+    plan_parser.add_argument("count", type=int, help="Number of shards")
+    plan_parser.add_argument("--archive", default=ARCHIVE_DIR, help="Directory of archive-format outputs")
+    args = parser.parse_args(argv)
+
+    import subprocess
+    output = subprocess.run([sys.executable, "-m", "pytest", "--co", "-q", "-o", "addopts="],
+                            capture_output=True, text=True).stdout
+    nodeids = [line for line in output.splitlines() if "::" in line]
+    keys = [test_key(nodeid) for nodeid in nodeids]
+    durations = load_durations(args.archive)
+    estimates = estimate(keys, durations)
+    for index, (total, selected) in enumerate(assign_shards(keys, estimates, args.count), 1):
+        print(f"shard {index}/{args.count}: {len(selected)} test(s), estimated {total:.1f}s")
+        for key in sorted(selected, key=lambda k: -estimates[k]):
+            source = "" if key in durations else "  (no history)"
+            print(f"    {estimates[key]:7.1f}s  {key}{source}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Site Health Check and Circuit Breaker
+Pytest plugin that keeps a dead BASE_URL from turning into a long red run with a
+bug report per test:
+
+- Before the first test that uses base_url, the home and shop pages are probed
+  over HTTP (once per run; xdist workers share the result). If the site is down
+  or serving an error page, tests that need it are skipped (or the run is
+  stopped) before their browser starts. Runs without such tests never probe.
+- While tests run, infrastructure-type failures (connection errors, error pages,
+  a crashed browser) are counted. After CIRCUIT_BREAKER_THRESHOLD consecutive
+  ones the circuit opens and the rest of the run is skipped (or aborted); with
+  xdist, one worker opening the circuit opens it for all of them.
+
+Either way, one report is written to reports/site_health.json, and only the first
+infrastructure failure of a streak gets a full bug report.
+
+Usage:
+    pytest                              # probe, then run with the circuit breaker
+    pytest --site-down=abort            # stop instead of skipping
+    pytest --no-health-check            # neither
+    python -m utils.site_health         # probe BASE_URL and print the result
+"""
+import json
+import os
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+
+import pytest
+
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows: xdist workers may each probe the site
+    fcntl = None
+
+
+SITE_HEALTH_REPORT = os.path.join(config.REPORT_DIR, "site_health.json")
+CIRCUIT_OPEN_FILE = os.path.join(config.REPORT_DIR, ".circuit_open.json")
+# The probe result of the current xdist run, shared by its workers
+SITE_PROBE_FILE = os.path.join(config.REPORT_DIR, ".site_probe.json")
+PROBE_PAGES = ("index.html", "shop.html")
+
+# Failures that point at the site, network or browser rather than the app under test
+INFRASTRUCTURE_ERRORS = re.compile(
+    r"net::ERR_|ERR_CONNECTION|ERR_NAME_NOT_RESOLVED|ERR_INTERNET_DISCONNECTED|ERR_TIMED_OUT|"
+    r"ERR_HTTP_RESPONSE_CODE_FAILURE|chrome not reachable|session not created|invalid session id|"
+    r"Max retries exceeded|Connection refused|Timed out receiving message from renderer"
+)
+# Failures that are infrastructure-type only if the site fails a probe right now
+AMBIGUOUS_ERRORS = re.compile(r"NoSuchElementException|TimeoutException|Element not found")
+# Error pages served with a 200 status
+ERROR_PAGE_MARKERS = ("There isn't a GitHub Pages site here", "Site not found", "502 Bad Gateway",
+                      "503 Service Unavailable", "504 Gateway Time-out", "Application error")
+
+ProbeResult = namedtuple("ProbeResult", ["url", "ok", "status", "reason", "elapsed"])
+
+
+def probe_page(url, timeout=10):
+    """Fetch one page and check that it is a real page rather than an error"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers={"User-Agent": "stylezone-health"}),
+                                    timeout=timeout) as response:
+            status = response.status
+            body = response.read(200000).decode("utf-8", errors="replace")
+    except urllib.error.HTTPError as e:
+        return ProbeResult(url, False, e.code, f"HTTP {e.code}", round(time.perf_counter() - start, 3))
+    except (urllib.error.URLError, OSError) as e:
+        reason = getattr(e, "reason", e)
+        return ProbeResult(url, False, None, f"unreachable: {reason}", round(time.perf_counter() - start, 3))
+    elapsed = round(time.perf_counter() - start, 3)
+    if not body.strip():
+        return ProbeResult(url, False, status, "empty page", elapsed)
+    marker = next((m for m in ERROR_PAGE_MARKERS if m in body), None)
+    if marker:
+        return ProbeResult(url, False, status, f"error page ({marker})", elapsed)
+    return ProbeResult(url, True, status, "ok", elapsed)
+
+
+def probe_site(base_url, timeout=10):
+    """Probe the pages every test starts from; returns a list of ProbeResult"""
+    if not base_url.startswith(("http://", "https://")):
+        return []
+    return [probe_page(f"{base_url}/{page}", timeout) for page in PROBE_PAGES]
+
+
+class CircuitBreaker:
+    """Count consecutive infrastructure-type failures and open after threshold of them"""
+
+    def __init__(self, threshold, base_url, probe_timeout=10):
+        self.threshold = threshold
+        self.base_url = base_url
+        self.probe_timeout = probe_timeout
+        self.streak = []
+        self.open_reason = None
+        self._last_probe = (0, True)
+
+    def _site_is_up(self):
+        """Re-probe the site, at most every 10 seconds"""
+        checked, up = self._last_probe
+        if time.monotonic() - checked > 10:
+            up = all(result.ok for result in probe_site(self.base_url, self.probe_timeout))
+            self._last_probe = (time.monotonic(), up)
+        return up
+
+    def classify(self, text):
+        """Reason a failure is infrastructure-type, or None"""
+        match = INFRASTRUCTURE_ERRORS.search(text)
+        if match:
+            return match.group(0)
+        match = AMBIGUOUS_ERRORS.search(text)
+        if match and not self._site_is_up():
+            return f"site down ({match.group(0)})"
+        return None
+
+    def record(self, nodeid, failed, text=""):
+        """Record a test outcome; returns True when this outcome opened the circuit"""
+        reason = self.classify(text) if failed else None
+        if reason is None:
+            self.streak = []
+            return False
+        self.streak.append((nodeid, reason))
+        if self.threshold and len(self.streak) >= self.threshold and self.open_reason is None:
+            self.open_reason = (f"{len(self.streak)} consecutive infrastructure failures "
+                                f"(last: {reason} in {nodeid})")
+            return True
+        return False
+
+    def is_repeat_failure(self, nodeid):
+        """True for infrastructure failures after the first of the current streak"""
+        return any(failed == nodeid for failed, _ in self.streak[1:])
+
+
+def write_report(report, path=SITE_HEALTH_REPORT):
+    """Write the single site health report"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+class SiteHealthPlugin:
+    """Probe before the first test that needs the site, and runtime circuit breaker"""
+
+    def __init__(self, config_, action):
+        self.config = config_
+        self.action = action
+        self.is_worker = hasattr(config_, "workerinput")
+        self.run_id = config_.workerinput["testrunuid"] if self.is_worker else None
+        self.probe = None
+        self.session = None
+        self.started = None
+        self.open_reason = None
+        # conftest.py skips full bug reports for repeat infrastructure failures
+        self.breaker = CircuitBreaker(config.CIRCUIT_BREAKER_THRESHOLD, config.BASE_URL, config.HEALTH_CHECK_TIMEOUT)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionstart(self, session):
+        self.session = session
+        # Filesystem timestamps can be coarser than time.time()
+        self.started = time.time() - 1
+        if not self.is_worker and os.path.exists(CIRCUIT_OPEN_FILE):
+            os.remove(CIRCUIT_OPEN_FILE)
+
+    def _run_probe(self):
+        """Probe the site and write the report if it failed"""
+        results = probe_site(config.BASE_URL, config.HEALTH_CHECK_TIMEOUT)
+        probe = [result._asdict() for result in results]
+        failed = [result for result in results if not result.ok]
+        if failed:
+            reason = "; ".join(f"{result.url}: {result.reason}" for result in failed)
+            write_report({"base_url": config.BASE_URL, "probe": probe, "action": self.action,
+                          "reason": f"Site health check failed: {reason}"})
+        return probe
+
+    def _shared_probe(self):
+        """Probe once per xdist run: the first worker probes, the others read its result"""
+        os.makedirs(os.path.dirname(SITE_PROBE_FILE), exist_ok=True)
+        with open(f"{SITE_PROBE_FILE}.lock", 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(SITE_PROBE_FILE, 'r', encoding='utf-8') as f:
+                    shared = json.load(f)
+                if shared["run"] == self.run_id:
+                    return shared["probe"]
+            except (OSError, ValueError, KeyError):
+                pass
+            probe = self._run_probe()
+            with open(SITE_PROBE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({"run": self.run_id, "probe": probe}, f)
+            return probe
+
+    def _probe_failure(self):
+        """Why the site failed the probe (probing on first use), or an empty string"""
+        if self.probe is None:
+            self.probe = self._shared_probe() if self.is_worker else self._run_probe()
+        failed = [result for result in self.probe if not result["ok"]]
+        return "; ".join(f"{result['url']}: {result['reason']}" for result in failed)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        """
+        Skip tests that need BASE_URL when the probe failed, and the rest of the run
+        once the circuit is open (in any worker)
+        """
+        if "base_url" in item.fixturenames:
+            reason = self._probe_failure()
+            if reason:
+                if self.action == "abort":
+                    # Like -x: stop after this test (also under xdist)
+                    self.session.shouldstop = f"Site health check failed: {reason}"
+                pytest.skip(f"Site health check failed: {reason}")
+        if self.open_reason is None and os.path.exists(CIRCUIT_OPEN_FILE):
+            try:
+                with open(CIRCUIT_OPEN_FILE, 'r', encoding='utf-8') as f:
+                    self.open_reason = json.load(f)["reason"]
+            except (OSError, ValueError, KeyError):
+                return
+        if self.open_reason:
+            pytest.skip(f"Circuit breaker open: {self.open_reason}")
+
+    def pytest_runtest_logreport(self, report):
+        # Under xdist each worker counts its own tests; the controller only relays them
+        if getattr(report, "node", None) is not None:
+            return
+        if report.when not in ("setup", "call") or report.skipped:
+            return
+        if report.when == "setup" and report.passed:
+            return
+        if self.breaker.record(report.nodeid, report.failed, report.longreprtext if report.failed else ""):
+            self._open(self.breaker.open_reason)
+
+    def _open(self, reason):
+        self.open_reason = reason
+        os.makedirs(os.path.dirname(CIRCUIT_OPEN_FILE), exist_ok=True)
+        with open(CIRCUIT_OPEN_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"reason": reason}, f)
+        write_report({
+            "base_url": config.BASE_URL,
+            "probe": self.probe,
+            "recheck": [result._asdict() for result in probe_site(config.BASE_URL, config.HEALTH_CHECK_TIMEOUT)],
+            "action": self.action,
+            "reason": f"Circuit breaker opened: {reason}",
+            "failures": [{"test": nodeid, "reason": why} for nodeid, why in self.breaker.streak]
+        })
+        if self.action == "abort" and self.session is not None:
+            self.session.shouldstop = f"Circuit breaker open: {reason}"
+
+    def pytest_terminal_summary(self, terminalreporter):
+        # Only a report written by this run (a worker may have written it)
+        if self.is_worker or not os.path.exists(SITE_HEALTH_REPORT) \
+                or os.path.getmtime(SITE_HEALTH_REPORT) < self.started:
+            return
+        with open(SITE_HEALTH_REPORT, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        terminalreporter.write_sep("=", "site health", red=True)
+        terminalreporter.write_line(report["reason"])
+        for failure in report.get("failures", []):
+            terminalreporter.write_line(f"  {failure['reason']}: {failure['test']}")
+        terminalreporter.write_line(f"Details: {SITE_HEALTH_REPORT}")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--no-health-check", action="store_true", default=not config.HEALTH_CHECK,
+                     help="Do not probe BASE_URL before the session or open the circuit breaker")
+    parser.addoption("--site-down", choices=("skip", "abort"), default=config.SITE_DOWN_ACTION,
+                     help="What to do when the site is down or the circuit breaker opens")
+
+
+def pytest_configure(config):
+    if not config.getoption("--no-health-check") and not config.option.collectonly:
+        config.pluginmanager.register(SiteHealthPlugin(config, config.getoption("--site-down")), "site_health")
+
+
+def main(argv=None):
+    base_url = argv[0] if argv else config.BASE_URL
+    results = probe_site(base_url, config.HEALTH_CHECK_TIMEOUT)
+    for result in results:
+        print(f"{'OK  ' if result.ok else 'FAIL'} {result.elapsed:6.2f}s  {result.status or '-'}  "
+              f"{result.url}  {result.reason}")
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,104 @@
+// Local stand-in for checkout.html: same DOM contract as CheckoutPageLocators, cart from localStorage
+(function () {
+    var CART_KEY = 'cart';
+    var FIELDS = {fullName: 'Full name', address: 'Address', city: 'City', postalCode: 'Postal code', country: 'Country'};
+    var byId = {};
+
+    function $(selector) { return document.querySelector(selector); }
+
+    function readCart() {
+        try { return JSON.parse(localStorage.getItem(CART_KEY) || '[]'); } catch (e) { return []; }
+    }
+
+    // Cart entries carry at least {id, quantity}; catalog data fills in anything missing
+    function lines() {
+        return readCart().map(function (entry) {
+            var product = byId[entry.id] || {};
+            return {
+                id: entry.id,
+                name: entry.name || product.name || 'Product ' + entry.id,
+                price: typeof entry.price === 'number' ? entry.price : (product.price || 0),
+                image: entry.image || product.image || 'img/product.svg',
+                quantity: entry.quantity || 1
+            };
+        });
+    }
+
+    function render() {
+        var items = lines();
+        var total = 0, count = 0, cartHtml = '', summaryHtml = '';
+        items.forEach(function (item) {
+            total += item.price * item.quantity;
+            count += item.quantity;
+            cartHtml += '<div class="cart-item" data-product-id="' + item.id + '">' +
+                '<img class="cart-item-image" src="' + item.image + '" alt="' + item.name + '" loading="lazy">' +
+                '<div class="cart-item-details"><div class="cart-item-name">' + item.name + '</div>' +
+                '<div class="cart-item-price">$' + item.price.toFixed(2) + '</div></div>' +
+                '<input type="number" class="cart-item-quantity" min="1" value="' + item.quantity + '">' +
+                '</div>';
+            summaryHtml += '<div class="summary-item">' + item.name + ' x ' + item.quantity + '</div>';
+        });
+        $('#cartItems').innerHTML = cartHtml;
+        $('#summaryItems').innerHTML = summaryHtml;
+        $('#totalSummary').textContent = 'Total: $' + total.toFixed(2);
+        $('#emptyCartMessage').style.display = items.length ? 'none' : 'block';
+        $('.cart-count').textContent = count;
+    }
+
+    function showToast(message) {
+        var toast = document.createElement('div');
+        toast.className = 'toast';
+        toast.textContent = message;
+        document.body.appendChild(toast);
+        setTimeout(function () { toast.remove(); }, 3000);
+    }
+
+    function validate() {
+        var valid = true;
+        Object.keys(FIELDS).forEach(function (id) {
+            var empty = !$('#' + id).value.trim();
+            $('#' + id + 'Error').textContent = empty ? FIELDS[id] + ' is required' : '';
+            valid = valid && !empty;
+        });
+        var postal = $('#postalCode').value.trim();
+        if (postal && !/^[A-Za-z0-9 -]{3,10}$/.test(postal)) {
+            $('#postalCodeError').textContent = 'Enter a valid postal code';
+            valid = false;
+        }
+        var payment = $('input[name="paymentMethod"]:checked');
+        $('#paymentError').textContent = payment ? '' : 'Select a payment method';
+        return valid && !!payment;
+    }
+
+    function bind() {
+        $('#cartItems').addEventListener('change', function (e) {
+            if (!e.target.classList.contains('cart-item-quantity')) return;
+            var id = parseInt(e.target.closest('.cart-item').getAttribute('data-product-id'), 10);
+            var quantity = Math.max(1, parseInt(e.target.value, 10) || 1);
+            localStorage.setItem(CART_KEY, JSON.stringify(readCart().map(function (entry) {
+                if (entry.id === id) entry.quantity = quantity;
+                return entry;
+            })));
+            render();
+        });
+        $('#checkoutForm').addEventListener('submit', function (e) {
+            e.preventDefault();
+            if (!readCart().length) {
+                showToast('Your cart is empty');
+                return;
+            }
+            if (!validate()) return;
+            localStorage.removeItem(CART_KEY);
+            $('#checkoutForm').reset();
+            render();
+            showToast('Order placed successfully');
+        });
+    }
+
+    fetch('products.json').then(function (r) { return r.json(); }).then(function (data) {
+        data.products.forEach(function (p) { byId[p.id] = p; });
+    }).catch(function () {}).then(function () {
+        bind();
+        render();
+    });
+})();
@@ -0,0 +1,127 @@
+// Local stand-in for shop.html: same DOM contract as ShopPageLocators, data from products.json
+(function () {
+    var ITEMS_PER_PAGE = 12;
+    var MAX_QUERY_LENGTH = 100;
+    var products = [];
+    var state = {query: '', category: '', price: '', rating: '', shipping: '', sort: 'featured', page: 1};
+
+    function $(selector) { return document.querySelector(selector); }
+
+    function normalize(text) {
+        return text.slice(0, MAX_QUERY_LENGTH).replace(/[^a-z0-9\s-]/gi, '').trim().toLowerCase();
+    }
+
+    function inPriceRange(price, range) {
+        if (!range) return true;
+        if (range.slice(-1) === '+') return price >= parseFloat(range);
+        var bounds = range.split('-').map(parseFloat);
+        return price >= bounds[0] && price <= bounds[1];
+    }
+
+    function filtered() {
+        var query = normalize(state.query);
+        var minRating = state.rating ? parseFloat(state.rating) : 0;
+        var result = products.filter(function (p) {
+            return (!query || p.searchName.indexOf(query) !== -1) &&
+                (!state.category || p.category === state.category) &&
+                inPriceRange(p.price, state.price) &&
+                p.rating >= minRating &&
+                (!state.shipping || p.shipping === state.shipping || (state.shipping === 'free' && p.shipping === 'prime'));
+        });
+        if (state.sort === 'priceAsc') result.sort(function (a, b) { return a.price - b.price || a.id - b.id; });
+        else if (state.sort === 'priceDesc') result.sort(function (a, b) { return b.price - a.price || a.id - b.id; });
+        else if (state.sort === 'nameAsc') result.sort(function (a, b) { return a.searchName < b.searchName ? -1 : a.searchName > b.searchName ? 1 : a.id - b.id; });
+        return result;
+    }
+
+    function card(p) {
+        var shipping = p.shipping === 'prime' ? 'Prime - Free Shipping' : p.shipping === 'free' ? 'Free Shipping' : 'Standard Shipping';
+        return '<div class="product-card" data-product-id="' + p.id + '">' +
+            '<div class="product-image"><img src="' + p.image + '" alt="' + p.name + '" loading="lazy"></div>' +
+            '<h3 class="product-name">' + p.name + '</h3>' +
+            '<div class="product-rating">' + p.rating.toFixed(1) + ' stars (' + p.reviews + ')</div>' +
+            '<div class="product-price">$' + p.price.toFixed(2) + '</div>' +
+            '<div class="product-shipping">' + shipping + '</div>' +
+            '<button class="add-to-cart" data-product-id="' + p.id + '">Add to Cart</button>' +
+            '</div>';
+    }
+
+    function pageButton(label, page, disabled) {
+        return '<button class="pagination-button" data-page="' + page + '"' + (disabled ? ' disabled' : '') + '>' + label + '</button>';
+    }
+
+    function render() {
+        var results = filtered();
+        var pages = Math.max(1, Math.ceil(results.length / ITEMS_PER_PAGE));
+        state.page = Math.min(state.page, pages);
+        var start = (state.page - 1) * ITEMS_PER_PAGE;
+        var pageItems = results.slice(start, start + ITEMS_PER_PAGE);
+
+        $('#productResults').innerHTML = pageItems.length
+            ? pageItems.map(card).join('')
+            : '<p style="grid-column: 1 / -1; text-align: center;">No products match your search.</p>';
+        $('.results-count').textContent = results.length
+            ? 'Showing ' + (start + 1) + '-' + (start + pageItems.length) + ' of ' + results.length + ' products'
+            : '0 products found';
+
+        var pagination = $('#pagination');
+        if (results.length <= ITEMS_PER_PAGE) {
+            pagination.innerHTML = '';
+            pagination.style.display = 'none';
+            return;
+        }
+        var first = Math.max(1, state.page - 2), last = Math.min(pages, first + 4);
+        var html = pageButton('Previous', 'prev', state.page === 1);
+        for (var page = first; page <= last; page++) html += pageButton(String(page), page, page === state.page);
+        pagination.innerHTML = html + pageButton('Next', 'next', state.page === pages);
+        pagination.style.display = 'flex';
+    }
+
+    function update(changes) {
+        Object.keys(changes).forEach(function (key) { state[key] = changes[key]; });
+        if (!('page' in changes)) state.page = 1;
+        render();
+    }
+
+    function bind() {
+        $('.search-button').addEventListener('click', function () { update({query: $('.search-input').value}); });
+        $('.search-input').addEventListener('keydown', function (e) {
+            if (e.key === 'Enter') update({query: $('.search-input').value});
+        });
+        $('#categoryFilter').addEventListener('change', function (e) { update({category: e.target.value}); });
+        $('#priceFilter').addEventListener('change', function (e) { update({price: e.target.value}); });
+        $('#ratingFilter').addEventListener('change', function (e) { update({rating: e.target.value}); });
+        $('#shippingFilter').addEventListener('change', function (e) { update({shipping: e.target.value}); });
+        $('#sortOption').addEventListener('change', function (e) { update({sort: e.target.value}); });
+        $('#resetFilters').addEventListener('click', function () {
+            ['#categoryFilter', '#priceFilter', '#ratingFilter', '#shippingFilter'].forEach(function (s) { $(s).value = ''; });
+            $('#sortOption').value = 'featured';
+            $('.search-input').value = '';
+            update({query: '', category: '', price: '', rating: '', shipping: '', sort: 'featured'});
+        });
+        $('#pagination').addEventListener('click', function (e) {
+            var button = e.target.closest('.pagination-button');
+            if (!button || button.disabled) return;
+            var page = button.getAttribute('data-page');
+            update({page: page === 'prev' ? state.page - 1 : page === 'next' ? state.page + 1 : parseInt(page, 10)});
+        });
+        $('#productResults').addEventListener('click', function (e) {
+            if (!e.target.classList.contains('add-to-cart')) return;
+            var cart = JSON.parse(localStorage.getItem('cart') || '[]');
+            cart.push({id: parseInt(e.target.getAttribute('data-product-id'), 10), quantity: 1});
+            localStorage.setItem('cart', JSON.stringify(cart));
+            $('.cart-count').textContent = cart.length;
+        });
+    }
+
+    fetch('products.json').then(function (r) { return r.json(); }).then(function (data) {
+        products = data.products;
+        products.forEach(function (p) { p.searchName = p.name.toLowerCase(); });
+        $('#categoryFilter').innerHTML += data.categories.map(function (c) {
+            return '<option value="' + c + '">' + c + '</option>';
+        }).join('');
+        $('.cart-count').textContent = JSON.parse(localStorage.getItem('cart') || '[]').length;
+        bind();
+        render();
+    });
+})();
@@ -0,0 +1,236 @@
+"""
+Browser Storage-State Snapshots
+A named storage state is the cookies, localStorage and sessionStorage of the app's
+origin after some setup (e.g. "cart_3_items"). Each state is built through the UI
+once, saved to storage_states/<name>.json and shared by later tests and xdist
+workers, which restore it in one step instead of rebuilding it:
+
+    @pytest.mark.storage_state("cart_3_items")
+    def test_something(self, checkout_page):
+        ...
+
+The driver fixture marks the state as pending; BasePage.navigate_to applies it on
+the first navigation to the state's origin. On Chromium the cookies and storage
+are installed over CDP before the page loads (one page load); elsewhere the page
+is loaded, the state written and the page reloaded.
+"""
+import json
+import os
+import time
+import weakref
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import fcntl
+except ImportError:  # Windows: workers may build the same state concurrently
+    fcntl = None
+
+
+# Builders for named states: name -> function(driver, base_url)
+_builders = {}
+
+# Storage states waiting for the driver's first navigation to their origin
+_pending = weakref.WeakKeyDictionary()
+
+_CAPTURE_STORAGE_SCRIPT = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+return {url: location.href, localStorage: dump(localStorage), sessionStorage: dump(sessionStorage)};
+"""
+
+# Replaces web storage with the items in local and session
+_STORAGE_WRITES = """
+localStorage.clear();
+sessionStorage.clear();
+Object.keys(local).forEach(function (key) { localStorage.setItem(key, local[key]); });
+Object.keys(session).forEach(function (key) { sessionStorage.setItem(key, session[key]); });
+"""
+
+_WRITE_STORAGE_SCRIPT = "var local = arguments[0], session = arguments[1];" + _STORAGE_WRITES
+
+# Runs before the app's scripts on the first document of the state's origin
+_PRELOAD_STORAGE_SCRIPT = """
+(function (origin, local, session) {
+    if (window !== window.top || location.origin !== origin) return;
+%s
+})(%s, %s, %s);
+"""
+
+
+def origin_of(url):
+    """scheme://host[:port] of a URL"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def storage_state(name):
+    """Decorator registering a builder for a named storage state"""
+    def register(builder):
+        _builders[name] = builder
+        return builder
+    return register
+
+
+def capture_storage_state(driver, name=None):
+    """Capture cookies, localStorage and sessionStorage of the current page's origin"""
+    state = driver.execute_script(_CAPTURE_STORAGE_SCRIPT)
+    state["cookies"] = driver.get_cookies()
+    state["origin"] = origin_of(state["url"])
+    state["name"] = name
+    state["created"] = time.time()
+    return state
+
+
+def _cdp_cookie(cookie):
+    """Convert a WebDriver cookie to a CDP CookieParam"""
+    param = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly")
+             if key in cookie}
+    if "expiry" in cookie:
+        param["expires"] = cookie["expiry"]
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        param["sameSite"] = cookie["sameSite"]
+    return param
+
+
+def _restore_with_cdp(driver, state, url):
+    """Install cookies and storage before the page loads; returns False without CDP"""
+    source = _PRELOAD_STORAGE_SCRIPT % (_STORAGE_WRITES, json.dumps(state["origin"]),
+                                        json.dumps(state["localStorage"]), json.dumps(state["sessionStorage"]))
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        if state["cookies"]:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_cdp_cookie(c) for c in state["cookies"]]})
+        script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+    except (AttributeError, WebDriverException):
+        return False
+    try:
+        driver.get(url)
+    finally:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]})
+    return True
+
+
+def restore_storage_state(driver, state, url=None):
+    """
+    Load url (default: the URL the state was captured on) with the state restored
+
+    Cookies are replaced, and localStorage and sessionStorage of the state's origin are
+    cleared before the state's items are written.
+    """
+    url = url or state["url"]
+    if origin_of(url) != state["origin"]:
+        raise ValueError(f"Storage state '{state.get('name')}' is for {state['origin']}, not {url}")
+    if _restore_with_cdp(driver, state, url):
+        return
+    if origin_of(driver.current_url) != state["origin"]:
+        driver.get(url)
+    driver.delete_all_cookies()
+    for cookie in state["cookies"]:
+        driver.add_cookie(cookie)
+    driver.execute_script(_WRITE_STORAGE_SCRIPT, state["localStorage"], state["sessionStorage"])
+    # The app reads storage on load
+    driver.get(url)
+
+
+def set_pending_state(driver, state):
+    """Restore state on the driver's next navigation to the state's origin"""
+    _pending[driver] = state
+
+
+def navigate_with_pending_state(driver, url):
+    """Navigate to url, restoring a pending state for its origin; returns False if none was pending"""
+    state = _pending.get(driver)
+    if state is None or origin_of(url) != state["origin"]:
+        return False
+    del _pending[driver]
+    restore_storage_state(driver, state, url)
+    return True
+
+
+class StorageStateStore:
+    """
+    Named storage states of one base URL, built once per test run and persisted in state_dir
+
+    Args:
+        run_id: Identifies the test run (shared by its xdist workers)
+        max_age: Also reuse states saved by earlier runs up to this many seconds old
+    """
+
+    def __init__(self, state_dir, base_url, run_id, max_age=0):
+        self.state_dir = state_dir
+        self.base_url = base_url
+        self.run_id = run_id
+        self.max_age = max_age
+        self._states = {}
+
+    def path(self, name):
+        return os.path.join(self.state_dir, f"{name}.json")
+
+    def _load(self, name):
+        """Load a saved state if it belongs to this base URL and run (or is not older than max_age)"""
+        try:
+            with open(self.path(name), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("base_url") != self.base_url:
+            return None
+        if state.get("run_id") != self.run_id and time.time() - state.get("created", 0) > self.max_age:
+            return None
+        return state
+
+    def _build(self, driver, name):
+        """Build a state through its registered builder and save it"""
+        if name not in _builders:
+            raise KeyError(f"Unknown storage state '{name}' (registered: {', '.join(sorted(_builders))})")
+        _builders[name](driver, self.base_url)
+        state = capture_storage_state(driver, name)
+        state["base_url"] = self.base_url
+        state["run_id"] = self.run_id
+        tmp_path = f"{self.path(name)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path(name))
+        return state
+
+    def get(self, driver, name):
+        """
+        Get a named state, building it with driver when no fresh copy exists
+
+        Returns (state, built); when built is True the driver is already in the state.
+        """
+        if name in self._states:
+            return self._states[name], False
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(f"{self.path(name)}.lock", 'w') as lock:
+            # One worker builds a state while the others wait for its file
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            state = self._load(name)
+            built = state is None
+            if built:
+                state = self._build(driver, name)
+        self._states[name] = state
+        return state, built
+
+    def prepare(self, driver, name):
+        """Put driver in the named state, or have its first navigation restore it"""
+        state, built = self.get(driver, name)
+        if not built:
+            set_pending_state(driver, state)
+        return state
+
+
+@storage_state("cart_3_items")
+def _cart_3_items(driver, base_url):
+    """Three products added from their detail pages"""
+    from pages.product_page import ProductPage
+    ProductPage(driver).add_products_to_cart(base_url, (1, 2, 3))
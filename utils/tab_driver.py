@@ -0,0 +1,131 @@
+"""
+Shared-Browser Reuse
+Runs read-only tests in a fresh tab of one browser per worker (and engine) instead
+of launching a browser per test. Each test gets a TabDriver: a clone of the shared
+WebDriver session whose quit() closes the test's windows instead of the browser.
+
+This saves the browser launch per test, nothing more: a worker still runs its
+tests one at a time, so there is no added concurrency and no memory saving below
+one browser per worker; scale with -n as usual.
+
+Only tests marked read_only use it (with MULTI_TAB=true). Tabs of one browser
+share cookies and localStorage, so they are cleared when a test's tab is closed
+and, on Chromium, for every origin seen so far when the next tab is opened.
+"""
+import copy
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+
+class SharedBrowser:
+    """One real browser session reused by consecutive tests, each in a new tab"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        # The initial blank tab is kept open so the session survives closing test tabs
+        self.home_handle = driver.current_window_handle
+        self.tabs_opened = 0
+        # Origins tabs have visited, cleared again when the next tab opens
+        self.origins = set()
+
+    def open_tab(self):
+        """Open a new tab with cleared storage and return a TabDriver bound to it"""
+        self.clear_origins()
+        self.driver.switch_to.new_window("tab")
+        self.tabs_opened += 1
+        return _tab_driver(self, self.driver.current_window_handle)
+
+    def clear_origins(self):
+        """
+        Clear cookies and storage of every origin seen so far, in case a tab was not
+        cleared on close (needs CDP, so Chromium only)
+        """
+        if not self.origins or not hasattr(self.driver, "execute_cdp_cmd"):
+            return
+        for origin in sorted(self.origins):
+            try:
+                self.driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                            {"origin": origin, "storageTypes": "cookies,local_storage"})
+            except WebDriverException:
+                pass
+
+    def quit(self):
+        """Quit the real browser"""
+        self.driver.quit()
+
+
+class TabDriver:
+    """WebDriver overrides for a clone of the shared session used by one test"""
+
+    def clear_storage(self):
+        """Clear the cookies, localStorage and sessionStorage of the current origin"""
+        try:
+            origin = self.execute_script("localStorage.clear(); sessionStorage.clear(); return location.origin;")
+        except WebDriverException:  # about:blank, error pages: no storage to clear
+            return
+        if origin and origin != "null":
+            self.shared.origins.add(origin)
+        self.delete_all_cookies()
+
+    def close_tab(self):
+        """Clear storage and close every window the test opened; the browser keeps its home tab"""
+        for handle in self.window_handles:
+            if handle != self.shared.home_handle:
+                self.switch_to.window(handle)
+                self.clear_storage()
+                self.close()
+        self.switch_to.window(self.shared.home_handle)
+
+    def quit(self):
+        """Close this test's tab; the shared browser keeps running"""
+        try:
+            self.close_tab()
+        except WebDriverException:
+            pass
+
+
+_TAB_CLASSES = {}
+
+
+def _tab_driver(shared, handle):
+    """
+    Clone the shared driver into a TabDriver for the tab with the given handle
+
+    The clone has the same class and session as the shared driver, so WebElements,
+    execute_script, CDP commands etc. behave as usual; only quit() differs.
+    """
+    base = type(shared.driver)
+    tab_class = _TAB_CLASSES.get(base)
+    if tab_class is None:
+        tab_class = _TAB_CLASSES[base] = type(f"Tab{base.__name__}", (TabDriver, base), {})
+    tab = copy.copy(shared.driver)
+    tab.__class__ = tab_class
+    tab.shared = shared
+    tab.handle = handle
+    tab._switch_to = SwitchTo(tab)
+    return tab
+
+
+class SharedBrowsers:
+    """Per-process shared browsers, one per engine, created on first use"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.browsers = {}
+
+    def open_tab(self, engine):
+        """Open a tab in the shared browser for an engine"""
+        shared = self.browsers.get(engine)
+        if shared is None:
+            shared = self.browsers[engine] = SharedBrowser(self.factory(engine))
+        return shared.open_tab()
+
+    def quit(self):
+        """Quit every shared browser"""
+        for shared in self.browsers.values():
+            try:
+                shared.quit()
+            except Exception:
+                pass
+        self.browsers.clear()
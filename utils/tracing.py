@@ -0,0 +1,454 @@
+"""
+Run Tracing (OTLP/JSON)
+Pytest plugin that records OpenTelemetry-compatible spans for the session, each
+test and its phases, fixture setup, page object actions and WebDriver commands:
+
+    session > worker gw0 > test > setup/call/teardown > fixture / action > webdriver command
+
+Every process writes its spans to <trace-out>.parts/<worker>.json; the controller
+merges them into one OTLP/JSON file (ExportTraceServiceRequest) that any OTLP
+viewer can load, and optionally posts it to a collector. CI shards share a trace
+by passing the same --trace-id.
+
+Usage:
+    pytest -n 4 --trace-out reports/trace.json
+    pytest --trace-out reports/trace.json --trace-endpoint http://localhost:4318/v1/traces
+    python -m utils.tracing summary reports/trace.json     # critical path and idle gaps
+    python -m utils.tracing collector --port 4318          # local collector stand-in
+    python -m utils.tracing merge shard1.json shard2.json -o reports/trace.json
+"""
+import argparse
+import json
+import os
+import secrets
+import shutil
+import socket
+import sys
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from pages.base_page import ActionListener, add_action_listener, remove_action_listener
+
+
+SERVICE_NAME = "stylezone-tests"
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Span:
+    """An open span; finished spans are stored in OTLP/JSON form"""
+
+    def __init__(self, tracer, name, parent_id, kind, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start = time.time_ns()
+        self.error = None
+
+    def to_otlp(self, end):
+        span = {
+            "traceId": self.tracer.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(end),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error else {"code": STATUS_OK}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Tracer:
+    """Span stack of one process (tests run one at a time per worker)"""
+
+    def __init__(self, trace_id, root_parent_id=None):
+        self.trace_id = trace_id
+        self.root_parent_id = root_parent_id
+        self.spans = []
+        self._stack = []
+
+    @property
+    def current_id(self):
+        return self._stack[-1].span_id if self._stack else self.root_parent_id
+
+    def start(self, name, kind=KIND_INTERNAL, attributes=None):
+        """Open a span as a child of the current one"""
+        span = Span(self, name, self.current_id, kind, attributes)
+        self._stack.append(span)
+        return span
+
+    def end(self, span, error=None):
+        """Close a span (and any child left open by an exception)"""
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"[:500]
+        end = time.time_ns()
+        while self._stack:
+            top = self._stack.pop()
+            self.spans.append(top.to_otlp(end))
+            if top is span:
+                break
+
+    def export(self, resource_attributes):
+        """This process's spans as an OTLP/JSON ExportTraceServiceRequest"""
+        attributes = dict({"service.name": SERVICE_NAME}, **resource_attributes)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attribute(k, v) for k, v in attributes.items()]},
+            "scopeSpans": [{"scope": {"name": "utils.tracing"}, "spans": self.spans}]
+        }]}
+
+
+class ActionSpans(ActionListener):
+    """Open a span for every page object action"""
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def on_action_start(self, event):
+        event.span = self.tracer.start(f"{type(event.page).__name__}.{event.name}", attributes={
+            "page.action": event.name,
+            "page.object": type(event.page).__name__,
+            "page.args": json.dumps(list(event.args), default=str)[:200] if event.args else None
+        })
+
+    def on_action_end(self, event):
+        span = getattr(event, "span", None)
+        if span is not None:
+            self.tracer.end(span, event.error)
+
+
+def trace_webdriver_commands(tracer):
+    """Wrap WebDriver.execute so each command becomes a client span; returns an undo function"""
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    original = WebDriver.execute
+
+    def execute(self, driver_command, params=None):
+        span = tracer.start(f"webdriver {driver_command}", KIND_CLIENT, {"webdriver.command": driver_command})
+        try:
+            result = original(self, driver_command, params)
+        except Exception as e:
+            tracer.end(span, e)
+            raise
+        tracer.end(span)
+        return result
+
+    WebDriver.execute = execute
+
+    def undo():
+        WebDriver.execute = original
+    return undo
+
+
+def merge(exports):
+    """Merge OTLP/JSON exports into one"""
+    return {"resourceSpans": [rs for export in exports for rs in export.get("resourceSpans", [])]}
+
+
+def post(endpoint, export, timeout=10):
+    """Send an OTLP/JSON export to a collector (OTLP/HTTP)"""
+    request = urllib.request.Request(endpoint, data=json.dumps(export).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status
+
+
+class TracePlugin:
+    """Record spans for this process and, on the controller, merge the run's trace"""
+
+    def __init__(self, config, output, trace_id, endpoint=None):
+        self.config = config
+        self.output = Path(output)
+        self.parts_dir = Path(f"{output}.parts")
+        self.endpoint = endpoint
+        workerinput = getattr(config, "workerinput", None)
+        self.worker_id = workerinput["workerid"] if workerinput else "main"
+        if workerinput:
+            # The controller's session span is the parent of each worker's span
+            self.tracer = Tracer(workerinput["trace_id"], workerinput["trace_session_span"])
+        else:
+            self.tracer = Tracer(trace_id)
+            shutil.rmtree(self.parts_dir, ignore_errors=True)
+        self.actions = ActionSpans(self.tracer)
+        self._undo_webdriver = None
+        self._session_span = None
+        self._test_span = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        """Hand the trace id and session span to xdist workers"""
+        node.workerinput["trace_id"] = self.tracer.trace_id
+        node.workerinput["trace_session_span"] = self._session_span.span_id
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionstart(self, session):
+        name = "session" if self.worker_id == "main" else f"worker {self.worker_id}"
+        self._session_span = self.tracer.start(name, attributes={
+            "host.name": socket.gethostname(),
+            "pytest.args": " ".join(session.config.invocation_params.args)
+        })
+        add_action_listener(self.actions)
+        self._undo_webdriver = trace_webdriver_commands(self.tracer)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._test_span = self.tracer.start(item.nodeid, attributes={
+            "test.name": item.name,
+            "test.file": item.location[0],
+            "test.worker": self.worker_id
+        })
+        yield
+        self.tracer.end(self._test_span)
+        self._test_span = None
+
+    def _phase(self, when):
+        span = self.tracer.start(when)
+        outcome = yield
+        self.tracer.end(span, outcome.excinfo[1] if outcome.excinfo else None)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._phase("setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase("call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        yield from self._phase("teardown")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        span = self.tracer.start(f"fixture {fixturedef.argname}", attributes={"fixture.scope": fixturedef.scope})
+        outcome = yield
+        self.tracer.end(span, outcome.excinfo[1] if outcome.excinfo else None)
+
+    def pytest_runtest_logreport(self, report):
+        if self._test_span is not None and report.when == "call":
+            self._test_span.attributes["test.outcome"] = report.outcome
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        remove_action_listener(self.actions)
+        if self._undo_webdriver:
+            self._undo_webdriver()
+        self._session_span.attributes["exitstatus"] = int(exitstatus)
+        self.tracer.end(self._session_span)
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.parts_dir / f"{self.worker_id}.json", 'w', encoding='utf-8') as f:
+            json.dump(self.tracer.export({"worker": self.worker_id}), f)
+        if self.worker_id == "main":
+            self._write_trace()
+
+    def _write_trace(self):
+        """Merge every process's spans into the trace file (controller only)"""
+        exports = []
+        for path in sorted(self.parts_dir.glob("*.json")):
+            with open(path, 'r', encoding='utf-8') as f:
+                exports.append(json.load(f))
+        trace = merge(exports)
+        with open(self.output, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
+        if self.endpoint:
+            try:
+                post(self.endpoint, trace)
+            except OSError as e:
+                print(f"Warning: Could not send trace to {self.endpoint}: {e}")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.worker_id == "main" and self.output.exists():
+            terminalreporter.write_line(f"Trace ({self.tracer.trace_id}) saved to {self.output}")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--trace-out", default=os.getenv("TRACE_OUT"),
+                     help="Write OTLP/JSON spans of the run (tests, fixtures, actions, WebDriver commands) here")
+    parser.addoption("--trace-endpoint", default=os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"),
+                     help="Also post the trace to this OTLP/HTTP endpoint (e.g. http://localhost:4318/v1/traces)")
+    parser.addoption("--trace-id", default=os.getenv("TRACE_ID"),
+                     help="Trace id (32 hex digits) to share one trace between CI shards")
+
+
+def pytest_configure(config):
+    output = config.getoption("--trace-out")
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        trace_id = config.getoption("--trace-id") or secrets.token_hex(16)
+        config.pluginmanager.register(TracePlugin(config, output, trace_id, config.getoption("--trace-endpoint")),
+                                      "trace_plugin")
+
+
+def load_spans(path):
+    """Read (worker, span) pairs from an OTLP/JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        trace = json.load(f)
+    for resource_spans in trace.get("resourceSpans", []):
+        attributes = {a["key"]: list(a["value"].values())[0] for a in resource_spans["resource"]["attributes"]}
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                yield attributes.get("worker", "main"), span
+
+
+def summarize(spans, gap_threshold=1.0):
+    """
+    Wall time, per-worker busy time and idle gaps between tests, the critical path
+    (the tests of the worker that finished last) and the time spent per span kind
+    """
+    tests = {}
+    by_name = {}
+    for worker, span in spans:
+        start, end = int(span["startTimeUnixNano"]) / 1e9, int(span["endTimeUnixNano"]) / 1e9
+        attributes = {a["key"]: list(a["value"].values())[0] for a in span.get("attributes", [])}
+        if "test.name" in attributes:
+            tests.setdefault(worker, []).append((start, end, span["name"]))
+        else:
+            entry = by_name.setdefault(span["name"], [0, 0.0])
+            entry[0] += 1
+            entry[1] += end - start
+    if not tests:
+        return None
+    run_start = min(t[0] for runs in tests.values() for t in runs)
+    run_end = max(t[1] for runs in tests.values() for t in runs)
+    workers = {}
+    for worker, runs in tests.items():
+        runs.sort()
+        gaps = [(runs[i][1], runs[i + 1][0] - runs[i][1]) for i in range(len(runs) - 1)
+                if runs[i + 1][0] - runs[i][1] >= gap_threshold]
+        workers[worker] = {
+            "tests": len(runs),
+            "busy": sum(end - start for start, end, _ in runs),
+            "finished": runs[-1][1] - run_start,
+            "gaps": [(round(at - run_start, 2), round(length, 2)) for at, length in gaps]
+        }
+    critical = max(tests, key=lambda w: tests[w][-1][1])
+    return {
+        "wall": run_end - run_start,
+        "workers": workers,
+        "critical_worker": critical,
+        "critical_path": [(name, end - start) for start, end, name in tests[critical]],
+        "spans": sorted(by_name.items(), key=lambda item: -item[1][1])
+    }
+
+
+def format_summary(summary, top=10):
+    """Format a summary for the terminal"""
+    lines = [f"wall time {summary['wall']:.1f}s"]
+    for worker, info in sorted(summary["workers"].items()):
+        idle = sum(length for _, length in info["gaps"])
+        lines.append(f"  {worker:>6}: {info['tests']:4} test(s)  busy {info['busy']:7.1f}s  "
+                     f"finished at {info['finished']:7.1f}s  idle gaps {idle:6.1f}s")
+        for at, length in info["gaps"][:top]:
+            lines.append(f"          gap of {length:.1f}s at +{at:.1f}s")
+    lines.append(f"critical path ({summary['critical_worker']}):")
+    for name, seconds in sorted(summary["critical_path"], key=lambda item: -item[1])[:top]:
+        lines.append(f"  {seconds:7.2f}s  {name}")
+    lines.append("time by span:")
+    for name, (count, total) in summary["spans"][:top]:
+        lines.append(f"  {total:7.2f}s  {count:6}x  {name}")
+    return "\n".join(lines)
+
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    """Accept OTLP/JSON posts and append their resource spans to the output file"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            export = json.loads(body)
+        except ValueError:
+            self.send_response(400)
+            self.end_headers()
+            return
+        with self.server.lock:
+            trace = {"resourceSpans": []}
+            if self.server.output.exists():
+                with open(self.server.output, 'r', encoding='utf-8') as f:
+                    trace = json.load(f)
+            trace = merge([trace, export])
+            with open(self.server.output, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def collector(port, output):
+    """Run a local OTLP/HTTP collector stand-in that stores everything it receives in output"""
+    import threading
+    server = ThreadingHTTPServer(("127.0.0.1", port), _CollectorHandler)
+    server.output = Path(output)
+    server.output.parent.mkdir(parents=True, exist_ok=True)
+    server.lock = threading.Lock()
+    print(f"Collecting OTLP/JSON traces at http://127.0.0.1:{port}/v1/traces into {output} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OTLP/JSON traces of test runs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subparsers.add_parser("summary", help="Critical path, idle gaps and time per span")
+    summary_parser.add_argument("path", help="OTLP/JSON trace file")
+    summary_parser.add_argument("--gap", type=float, default=1.0, help="Report idle gaps of at least this many seconds")
+    merge_parser = subparsers.add_parser("merge", help="Merge trace files (e.g. from CI shards)")
+    merge_parser.add_argument("paths", nargs="+")
+    merge_parser.add_argument("-o", "--output", required=True)
+    collector_parser = subparsers.add_parser("collector", help="Run a local OTLP/HTTP collector stand-in")
+    collector_parser.add_argument("--port", type=int, default=4318)
+    collector_parser.add_argument("--output", default=os.path.join("reports", "collector_trace.json"))
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        summary = summarize(load_spans(args.path), args.gap)
+        if summary is None:
+            print("No test spans in the trace")
+            return 1
+        print(format_summary(summary))
+    elif args.command == "merge":
+        exports = []
+        for path in args.paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                exports.append(json.load(f))
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(merge(exports), f)
+        print(f"Merged {len(exports)} trace(s) into {args.output}")
+    else:
+        collector(args.port, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Visual Regression
+Compares screenshots of key page states against baseline images.
+
+Each image is split into tiles. Baselines are stored with a sidecar of per-tile
+hashes, so a capture whose tiles all hash the same as the baseline is a match
+without decoding the baseline at all. Only tiles whose hash changed are diffed,
+using a vectorized perceptual (YIQ) color distance, and a heatmap of the changed
+pixels is written for the bug report.
+
+Usage:
+    def test_home_sections(self, home_page, visual):
+        visual.assert_matches("home_sections")
+
+    VISUAL_UPDATE_BASELINES=true pytest -m visual   # (re)record baselines
+
+A state without a baseline fails (its capture is kept in the diff directory):
+baselines are only recorded with VISUAL_UPDATE_BASELINES=true, so a checkout
+without them cannot pass unnoticed.
+"""
+import hashlib
+import io
+import json
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+
+# baseline_size/actual_size ("<width>x<height>") are only set for "size_mismatch"
+VisualResult = namedtuple(
+    "VisualResult",
+    ["name", "status", "changed_tiles", "total_tiles", "diff_ratio", "heatmap", "baseline", "actual",
+     "baseline_size", "actual_size"],
+    defaults=(None, None)
+)
+
+# Largest possible YIQ distance between two colors (see pixelmatch)
+_MAX_YIQ_DELTA = 35215.0
+
+
+def _size(shape):
+    """Image size as "<width>x<height>" from an array shape"""
+    return f"{shape[1]}x{shape[0]}"
+
+
+def _decode(png_bytes):
+    """Decode PNG bytes to an RGB uint8 array"""
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def _tiles(array, tile):
+    """View an image as (rows, cols, tile, tile, 3), padding the edges with zeros"""
+    height, width = array.shape[:2]
+    rows, cols = -(-height // tile), -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile, 3), dtype=np.uint8)
+    padded[:height, :width] = array
+    return padded.reshape(rows, tile, cols, tile, 3).swapaxes(1, 2)
+
+
+def tile_hashes(array, tile):
+    """Hash every tile of an image; returns a (rows, cols) list of hex digests"""
+    tiles = np.ascontiguousarray(_tiles(array, tile))
+    return [[hashlib.blake2b(tiles[r, c].tobytes(), digest_size=8).hexdigest()
+             for c in range(tiles.shape[1])] for r in range(tiles.shape[0])]
+
+
+def _yiq_delta(a, b):
+    """Perceptual color distance per pixel (0..1), vectorized over any leading axes"""
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    d = a - b
+    y = d[..., 0] * 0.29889531 + d[..., 1] * 0.58662247 + d[..., 2] * 0.11448223
+    i = d[..., 0] * 0.59597799 - d[..., 1] * 0.27417610 - d[..., 2] * 0.32180189
+    q = d[..., 0] * 0.21147017 - d[..., 1] * 0.52261711 + d[..., 2] * 0.31114694
+    return (0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q) / _MAX_YIQ_DELTA
+
+
+class VisualComparator:
+    """Compare named captures against baselines on disk"""
+
+    def __init__(self, baseline_dir="visual_baselines", diff_dir="visual_diffs", tile=64,
+                 threshold=0.1, tolerance=0.001, update=False):
+        """
+        Args:
+            baseline_dir: Directory of baseline PNGs and tile hash sidecars
+            diff_dir: Directory for actual captures and heatmaps of mismatches
+            tile: Tile size in pixels
+            threshold: Per-pixel perceptual distance (0..1) above which a pixel differs
+            tolerance: Fraction of differing pixels allowed before a capture is a mismatch
+            update: Overwrite baselines with new captures instead of comparing
+        """
+        self.baseline_dir = Path(baseline_dir)
+        self.diff_dir = Path(diff_dir)
+        self.tile = tile
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.update = update
+
+    def _paths(self, name):
+        return self.baseline_dir / f"{name}.png", self.baseline_dir / f"{name}.tiles.json"
+
+    def save_baseline(self, name, png_bytes, array=None):
+        """Store a capture as the baseline, with its tile hashes"""
+        array = _decode(png_bytes) if array is None else array
+        image_path, hashes_path = self._paths(name)
+        image_path.parent.mkdir(parents=True, exist_ok=True)
+        image_path.write_bytes(png_bytes)
+        sidecar = {"tile": self.tile, "shape": list(array.shape), "hashes": tile_hashes(array, self.tile)}
+        hashes_path.write_text(json.dumps(sidecar), encoding="utf-8")
+        return str(image_path)
+
+    def _load_hashes(self, name):
+        image_path, hashes_path = self._paths(name)
+        try:
+            sidecar = json.loads(hashes_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            sidecar = None
+        if sidecar is None or sidecar.get("tile") != self.tile:
+            # Sidecar missing or recorded with another tile size; rebuild it from the image
+            self.save_baseline(name, image_path.read_bytes())
+            sidecar = json.loads(hashes_path.read_text(encoding="utf-8"))
+        return sidecar
+
+    def compare(self, name, png_bytes):
+        """
+        Compare a capture with its baseline
+
+        Returns a VisualResult with status "new" (baseline recorded in update mode),
+        "missing" (no baseline), "match", "mismatch" or "size_mismatch".
+        """
+        image_path, _ = self._paths(name)
+        actual = _decode(png_bytes)
+        if self.update:
+            baseline = self.save_baseline(name, png_bytes, actual)
+            return VisualResult(name, "new", 0, 0, 0.0, None, baseline, None)
+        if not image_path.exists():
+            actual_path = self._save_actual(name, png_bytes)
+            return VisualResult(name, "missing", None, None, 1.0, None, str(image_path), actual_path)
+
+        sidecar = self._load_hashes(name)
+        if list(actual.shape) != sidecar["shape"]:
+            actual_path = self._save_actual(name, png_bytes)
+            return VisualResult(name, "size_mismatch", None, None, 1.0, None, str(image_path), actual_path,
+                                _size(sidecar["shape"]), _size(actual.shape))
+
+        # Fast path: compare tile hashes; the baseline image is only decoded if a tile changed
+        hashes = np.array(tile_hashes(actual, self.tile))
+        changed = np.argwhere(hashes != np.array(sidecar["hashes"]))
+        total_tiles = hashes.size
+        if not len(changed):
+            return VisualResult(name, "match", 0, total_tiles, 0.0, None, str(image_path), None)
+
+        baseline = _decode(image_path.read_bytes())
+        base_tiles = _tiles(baseline, self.tile)
+        actual_tiles = _tiles(actual, self.tile)
+        rows, cols = changed[:, 0], changed[:, 1]
+        # One vectorized diff over all changed tiles: (n, tile, tile)
+        delta = _yiq_delta(base_tiles[rows, cols], actual_tiles[rows, cols])
+        differing = delta > self.threshold * self.threshold
+        diff_ratio = float(differing.sum()) / (actual.shape[0] * actual.shape[1])
+        changed_tiles = int(differing.any(axis=(1, 2)).sum())
+        if diff_ratio <= self.tolerance:
+            return VisualResult(name, "match", changed_tiles, total_tiles, diff_ratio, None, str(image_path), None)
+
+        heatmap = self._write_heatmap(name, baseline, delta, differing, rows, cols)
+        actual_path = self._save_actual(name, png_bytes)
+        return VisualResult(name, "mismatch", changed_tiles, total_tiles, diff_ratio, heatmap,
+                            str(image_path), actual_path)
+
+    def _save_actual(self, name, png_bytes):
+        path = self.diff_dir / f"{name}.actual.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png_bytes)
+        return str(path)
+
+    def _write_heatmap(self, name, baseline, delta, differing, rows, cols):
+        """Write the baseline (faded to gray) with differing pixels colored by distance"""
+        gray = baseline.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        faded = (255 - (255 - gray) * 0.25).astype(np.uint8)
+        heat = _tiles(np.repeat(faded[..., None], 3, axis=2), self.tile).copy()
+        intensity = np.clip(np.sqrt(delta) * 4, 0.35, 1.0)
+        tiles = heat[rows, cols]
+        tiles[differing] = np.stack(
+            [np.full_like(intensity, 255), (1 - intensity) * 200, (1 - intensity) * 60], axis=-1
+        )[differing].astype(np.uint8)
+        heat[rows, cols] = tiles
+        # Back from tiles to an image, cropped to the original size
+        image = heat.swapaxes(1, 2).reshape(heat.shape[0] * self.tile, heat.shape[1] * self.tile, 3)
+        image = image[:baseline.shape[0], :baseline.shape[1]]
+        path = self.diff_dir / f"{name}.heatmap.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(image).save(path, optimize=False, compress_level=1)
+        return str(path)
+
+
+def state_name(*parts):
+    """Build a file-safe state name, e.g. state_name("shop", "Price: Low to High", "chrome")"""
+    name = "_".join(str(p) for p in parts if p)
+    return "".join(c.lower() if c.isalnum() or c in "-_." else "_" for c in name).strip("_")
+
+
+class VisualCheck:
+    """Per-test helper bound to a driver; collects results for the bug report"""
+
+    def __init__(self, driver, comparator, engine=None):
+        self.driver = driver
+        self.comparator = comparator
+        self.engine = engine
+        self.results = []
+
+    def check(self, name, element=None):
+        """Capture the viewport (or an element) and compare it with the baseline"""
+        png = element.screenshot_as_png if element is not None else self.driver.get_screenshot_as_png()
+        # Engines render differently, so each one has its own baselines
+        result = self.comparator.compare(state_name(name, self.engine), png)
+        self.results.append(result)
+        return result
+
+    def assert_matches(self, name, element=None):
+        """Check a state and fail the test when it differs from the baseline"""
+        result = self.check(name, element)
+        if result.status == "missing":
+            raise AssertionError(f"No baseline for visual state '{name}' ({result.baseline}); record it with "
+                                 f"VISUAL_UPDATE_BASELINES=true (capture: {result.actual})")
+        if result.status == "size_mismatch":
+            raise AssertionError(f"Visual state '{name}' changed size from {result.baseline_size} to "
+                                 f"{result.actual_size} (baseline {result.baseline})")
+        assert result.status != "mismatch", (
+            f"Visual state '{name}' differs from baseline: {result.diff_ratio:.2%} of pixels in "
+            f"{result.changed_tiles}/{result.total_tiles} tiles (heatmap: {result.heatmap})"
+        )
+        return result
+
+    def mismatches(self):
+        """Results that did not match, as JSON-friendly dicts"""
+        return [dict(r._asdict()) for r in self.results if r.status in ("mismatch", "size_mismatch")]
@@ -0,0 +1,214 @@
+"""
+Adaptive Wait Budgets
+Records how long each BasePage wait took, keyed on (page, operation, locator), and
+derives per-wait timeouts from the history: a high percentile of the recorded
+durations times a margin, plus padding. A missing element then fails after a few
+seconds instead of the full EXPLICIT_WAIT.
+
+Stats and overrides are kept in wait_budgets.json (review it, or commit it to share
+budgets with CI). Budgets never exceed EXPLICIT_WAIT, need a minimum number of
+samples before they apply, and an override always wins.
+
+Usage:
+    ADAPTIVE_WAITS=true pytest
+    python -m utils.wait_budgets show
+    python -m utils.wait_budgets set "ShopPage|find_element|.product-card" 8
+    python -m utils.wait_budgets unset "ShopPage|find_element|.product-card"
+"""
+import argparse
+import json
+import math
+import os
+import sys
+
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent workers may drop each other's new samples
+    fcntl = None
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    values = sorted(values)
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+class WaitBudgets:
+    """Per-wait timeouts learned from recorded wait durations"""
+
+    def __init__(self, path, enabled=False, default=10, fraction=0.95, margin=1.5, padding=0.5,
+                 minimum=1.0, min_samples=5, history=50):
+        self.path = path
+        self.enabled = enabled
+        self.default = default
+        self.fraction = fraction
+        self.margin = margin
+        self.padding = padding
+        self.minimum = minimum
+        self.min_samples = min_samples
+        self.history = history
+        self._data = None
+        self._new = {}
+
+    @staticmethod
+    def key(page, operation, locator=""):
+        return f"{type(page).__name__}|{operation}|{locator or ''}"
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("waits", {})
+        data.setdefault("overrides", {})
+        return data
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    def learned(self, key):
+        """Budget derived from the recorded samples, or None with too little history"""
+        samples = self.data["waits"].get(key, {}).get("samples", [])
+        if len(samples) < self.min_samples:
+            return None
+        budget = percentile(samples, self.fraction) * self.margin + self.padding
+        return round(min(self.default, max(self.minimum, budget)), 2)
+
+    def timeout(self, key, explicit=None, learn=True):
+        """
+        Timeout for a wait: override, then an explicit timeout, then the learned budget
+        (unless learn is False), then the default
+        """
+        if not self.enabled:
+            return explicit if explicit is not None else self.default
+        override = self.data["overrides"].get(key)
+        if override is not None:
+            return override
+        if explicit is not None:
+            return explicit
+        if not learn:
+            return self.default
+        learned = self.learned(key)
+        return learned if learned is not None else self.default
+
+    def record(self, key, seconds, timed_out=False):
+        """
+        Record a wait; a timed-out wait is recorded at its budget, so budgets that
+        turn out too tight grow back
+        """
+        if not self.enabled:
+            return
+        entry = self.data["waits"].setdefault(key, {"samples": [], "timeouts": 0})
+        entry["samples"] = (entry["samples"] + [round(seconds, 3)])[-self.history:]
+        new = self._new.setdefault(key, {"samples": [], "timeouts": 0})
+        new["samples"].append(round(seconds, 3))
+        if timed_out:
+            entry["timeouts"] = entry.get("timeouts", 0) + 1
+            new["timeouts"] += 1
+
+    def save(self):
+        """Merge this process's new samples into the file (safe with concurrent xdist workers)"""
+        if not self._new:
+            return
+        with open(f"{self.path}.lock", 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._read()
+            for key, new in self._new.items():
+                entry = data["waits"].setdefault(key, {"samples": [], "timeouts": 0})
+                entry["samples"] = (entry["samples"] + new["samples"])[-self.history:]
+                entry["timeouts"] = entry.get("timeouts", 0) + new["timeouts"]
+            self._data = data
+            for key, entry in data["waits"].items():
+                entry["budget"] = self.learned(key)
+            self._write(data)
+        self._new = {}
+
+    def _write(self, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def set_override(self, key, seconds):
+        """Pin a wait's timeout (None removes the override)"""
+        data = self._read()
+        if seconds is None:
+            data["overrides"].pop(key, None)
+        else:
+            data["overrides"][key] = seconds
+        self._write(data)
+        self._data = data
+
+    def rows(self):
+        """(key, samples, p95, learned budget, override, timeouts) for every recorded wait"""
+        rows = []
+        for key in sorted(set(self.data["waits"]) | set(self.data["overrides"])):
+            entry = self.data["waits"].get(key, {"samples": [], "timeouts": 0})
+            samples = entry["samples"]
+            rows.append((key, len(samples), percentile(samples, self.fraction) if samples else None,
+                         self.learned(key), self.data["overrides"].get(key), entry.get("timeouts", 0)))
+        return rows
+
+
+# Budgets used by BasePage
+wait_budgets = WaitBudgets(
+    config.WAIT_BUDGETS_FILE,
+    enabled=config.ADAPTIVE_WAITS,
+    default=config.EXPLICIT_WAIT,
+    fraction=config.WAIT_BUDGET_PERCENTILE,
+    margin=config.WAIT_BUDGET_MARGIN,
+    min_samples=config.WAIT_BUDGET_MIN_SAMPLES
+)
+
+
+def format_rows(rows):
+    """Format budget rows as a table"""
+    def seconds(value):
+        return f"{value:.2f}s" if value is not None else "-"
+    lines = [f"{'samples':>8}{'p95':>9}{'budget':>9}{'override':>10}{'timeouts':>10}  wait"]
+    for key, count, p95, learned, override, timeouts in rows:
+        lines.append(f"{count:>8}{seconds(p95):>9}{seconds(learned):>9}{seconds(override):>10}{timeouts:>10}  {key}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Review and override adaptive wait budgets")
+    parser.add_argument("--path", default=config.WAIT_BUDGETS_FILE, help="Budget file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("show", help="List recorded waits with their budgets")
+    set_parser = subparsers.add_parser("set", help="Override the timeout of a wait")
+    set_parser.add_argument("key", help="page|operation|locator, as listed by show")
+    set_parser.add_argument("seconds", type=float)
+    unset_parser = subparsers.add_parser("unset", help="Remove an override")
+    unset_parser.add_argument("key")
+    subparsers.add_parser("reset", help="Forget all recorded samples (overrides are kept)")
+    args = parser.parse_args(argv)
+
+    budgets = WaitBudgets(args.path, default=config.EXPLICIT_WAIT, fraction=config.WAIT_BUDGET_PERCENTILE,
+                          margin=config.WAIT_BUDGET_MARGIN, min_samples=config.WAIT_BUDGET_MIN_SAMPLES)
+    if args.command == "show":
+        rows = budgets.rows()
+        print(format_rows(rows) if rows else f"No waits recorded in {args.path}")
+    elif args.command == "set":
+        budgets.set_override(args.key, args.seconds)
+        print(f"{args.key}: {args.seconds:.2f}s")
+    elif args.command == "unset":
+        budgets.set_override(args.key, None)
+        print(f"{args.key}: override removed")
+    else:
+        data = budgets.data
+        data["waits"] = {}
+        budgets._write(data)
+        print(f"Recorded waits cleared in {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
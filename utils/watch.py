@@ -0,0 +1,291 @@
+"""
+Watch Mode
+Monitors pages/, locators/, tests/, conftest.py, config.py and pytest.ini and, on
+each save, reruns only the tests affected by the change. pytest runs in this
+long-lived process (changed project modules are purged from sys.modules before
+each run) and the driver fixture leases warm browsers from the browser pool
+daemon, which watch mode starts if needed.
+
+Usage:
+    ./run_tests.sh --watch
+    python -m utils.watch [--no-pool] [--pool-size 2] [-- extra pytest args]
+"""
+import argparse
+import ast
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import config
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Changes to these files can affect every test
+GLOBAL_FILES = ("conftest.py", "config.py", "pytest.ini")
+# Directories are watched recursively for .py files; root files with one watch on the root
+WATCH_PATHS = ("pages", "locators", "tests") + GLOBAL_FILES
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """
+    Directory watcher built on Linux inotify through ctypes
+
+    Directories in paths are watched recursively for .py files. A file in paths is
+    watched through a single, non-recursive watch on its directory that only
+    reports that file name, so watching conftest.py does not watch the whole
+    project (.git, venv/, reports/, ...).
+    """
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        # wd -> file names reported for that directory (None: any .py file)
+        self._names = {}
+        for path in paths:
+            if path.is_dir():
+                for d in [path] + [p for p in path.rglob("*") if p.is_dir() and p.name != "__pycache__"]:
+                    self._add_watch(d, None)
+            else:
+                self._add_watch(path.parent, path.name)
+
+    def _add_watch(self, directory, name):
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        wd = self._libc.inotify_add_watch(self._fd, str(directory).encode(), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+        names = self._names.get(wd, set())
+        self._names[wd] = None if name is None or names is None else names | {name}
+
+    def _wanted(self, wd, name):
+        names = self._names.get(wd, set())
+        return name.endswith(".py") if names is None else name in names
+
+    def poll(self, timeout):
+        """Wait up to timeout seconds; returns the set of changed file paths"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if wd in self._dirs and name and self._wanted(wd, name):
+                changed.add(self._dirs[wd] / name)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Fallback watcher comparing file modification times"""
+
+    def __init__(self, paths, interval=0.5):
+        self.paths = paths
+        self.interval = interval
+        self._mtimes = self._scan()
+
+    def _scan(self):
+        mtimes = {}
+        for path in self.paths:
+            files = [path] if path.is_file() else path.rglob("*.py")
+            for f in files:
+                try:
+                    mtimes[f] = f.stat().st_mtime_ns
+                except OSError:
+                    pass
+        return mtimes
+
+    def poll(self, timeout):
+        """Wait up to timeout seconds; returns the set of changed file paths"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {f for f in current.keys() | self._mtimes.keys() if current.get(f) != self._mtimes.get(f)}
+            self._mtimes = current
+            if changed or time.monotonic() >= deadline:
+                return changed
+            time.sleep(min(self.interval, max(0.0, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def create_watcher(paths):
+    """Use inotify where available, otherwise poll"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths)
+
+
+def _module_path(name, root=PROJECT_ROOT):
+    """Resolve a dotted module name to a project file, or None for third-party modules"""
+    base = root.joinpath(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _imports(path, root=PROJECT_ROOT):
+    """Project files imported directly by a Python file"""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError):
+        return set()
+    found = set()
+    for node in ast.walk(tree):
+        names = []
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            # "from pages import shop_page" imports a module, "from pages.shop_page import X" a name
+            names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        for name in names:
+            module = _module_path(name, root)
+            if module is not None:
+                found.add(module)
+    return found
+
+
+def build_dependency_map(root=PROJECT_ROOT):
+    """Map every test file to the set of project files it depends on (transitively)"""
+    graph = {}
+    pending = list((root / "tests").rglob("test_*.py"))
+    while pending:
+        path = pending.pop()
+        if path in graph:
+            continue
+        graph[path] = _imports(path, root)
+        pending.extend(graph[path] - graph.keys())
+
+    def closure(path, seen):
+        for dep in graph.get(path, ()):
+            if dep not in seen:
+                seen.add(dep)
+                closure(dep, seen)
+        return seen
+
+    return {test: closure(test, {test}) for test in graph if test.name.startswith("test_")}
+
+
+def affected_tests(changed, dependency_map, root=PROJECT_ROOT):
+    """
+    Work out which test files to rerun for a set of changed files
+
+    Returns None when every test is affected (conftest.py, config.py, ...).
+    """
+    changed = {Path(p).resolve() for p in changed if str(p).endswith((".py", ".ini"))}
+    if any(p == root / name for p in changed for name in GLOBAL_FILES):
+        return None
+    return sorted(test for test, deps in dependency_map.items() if deps & changed)
+
+
+def purge_project_modules(root=PROJECT_ROOT):
+    """Drop project modules from sys.modules so the next pytest run imports fresh code"""
+    keep = {"__main__", __name__}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name in keep or not path:
+            continue
+        if Path(path).resolve().is_relative_to(root) and "site-packages" not in path:
+            del sys.modules[name]
+
+
+def run_pytest(targets, extra_args):
+    """Run pytest in this process and return its exit code"""
+    import pytest
+
+    purge_project_modules()
+    return pytest.main(list(extra_args) + [str(t) for t in targets])
+
+
+def start_pool(size, headless):
+    """Start the browser pool daemon unless one is already running"""
+    if os.path.exists(config.WARM_POOL_SOCKET):
+        return None
+    args = [sys.executable, "-m", "utils.browser_pool", "start", "--size", str(size),
+            "--headless" if headless else "--headed"]
+    return subprocess.Popen(args, cwd=PROJECT_ROOT)
+
+
+def watch(extra_args=(), use_pool=True, pool_size=None, debounce=0.3):
+    """Watch for changes and rerun affected tests until interrupted"""
+    paths = [PROJECT_ROOT / p for p in WATCH_PATHS if (PROJECT_ROOT / p).exists()]
+    pool = start_pool(pool_size or config.WARM_POOL_SIZE, config.HEADLESS) if use_pool else None
+    watcher = create_watcher(paths)
+    print(f"Watching {', '.join(p.name for p in paths)} ({type(watcher).__name__}). Ctrl+C to stop.")
+    try:
+        while True:
+            changed = watcher.poll(1.0)
+            if not changed:
+                continue
+            # Editors often write a file in several steps; collect them into one run
+            while True:
+                more = watcher.poll(debounce)
+                if not more:
+                    break
+                changed |= more
+            targets = affected_tests(changed, build_dependency_map())
+            names = ", ".join(sorted(str(Path(p).relative_to(PROJECT_ROOT)) for p in changed))
+            if targets == []:
+                print(f"\nChanged: {names} - no affected tests")
+                continue
+            print(f"\nChanged: {names}")
+            print("Rerunning: " + ("all tests" if targets is None else
+                                   ", ".join(str(t.relative_to(PROJECT_ROOT)) for t in targets)))
+            start = time.perf_counter()
+            exit_code = run_pytest(targets or [], extra_args)
+            print(f"\n[watch] pytest exited with {int(exit_code)} in {time.perf_counter() - start:.1f}s; "
+                  f"waiting for changes...")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
+        if pool is not None:
+            pool.terminate()
+            pool.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rerun affected tests on save")
+    parser.add_argument("--no-pool", action="store_true", help="Do not start the warm browser pool")
+    parser.add_argument("--pool-size", type=int, help="Warm browsers to keep ready")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER, help="Extra pytest arguments (after --)")
+    args = parser.parse_args(argv)
+    extra = [a for a in args.pytest_args if a != "--"]
+    watch(extra, use_pool=not args.no_pool, pool_size=args.pool_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())